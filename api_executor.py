@@ -0,0 +1,194 @@
+import os
+import time
+import random
+import socket
+import threading
+from typing import Callable, Dict, Optional
+from googleapiclient.errors import HttpError
+
+# Per-user quotas, expressed as (tokens per second, burst capacity).
+# Gmail is metered in quota units (250 units/user/second); Docs allows
+# 300 reads and 60 writes per user per minute; Drive allows 12,000 queries
+# per user per minute, which we keep well below to leave headroom.
+API_QUOTAS = {
+    'gmail': (250.0, 250.0),
+    'docs_read': (5.0, 10.0),
+    'docs_write': (1.0, 5.0),
+    'drive': (50.0, 100.0),
+}
+
+# Gmail quota units per method (https://developers.google.com/gmail/api/reference/quota)
+GMAIL_UNITS = {
+    'messages.list': 5,
+    'messages.get': 5,
+    'labels.list': 1,
+}
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+RETRYABLE_REASONS = RATE_LIMIT_REASONS | {'backendError'}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve tokens and sleep off any deficit"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Take tokens and return how long the caller must wait before proceeding"""
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= cost
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def try_reserve(self, cost: float = 1.0) -> bool:
+        """Take tokens only if they are available now; never leaves the bucket in deficit"""
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self.tokens < cost:
+                return False
+            self.tokens -= cost
+            return True
+
+
+class ApiExecutor:
+    """
+    Executes googleapiclient requests with per-API rate limiting and retries.
+
+    Retryable failures (429, 5xx, rate-limit 403s and transient socket errors)
+    are retried with exponential backoff and full jitter, honoring Retry-After
+    when the server sends it. Non-idempotent writes are only retried when
+    they can't have taken effect (rate limited, or never sent). Counters for calls, retries, throttled time and
+    failures are kept per API.
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, tuple]] = None,
+        max_retries: Optional[int] = None,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        quotas = quotas or API_QUOTAS
+        self.buckets = {api: TokenBucket(rate, capacity, clock) for api, (rate, capacity) in quotas.items()}
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('GOOGLE_API_MAX_RETRIES', '5'))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, api: str, field: str, amount: float = 1):
+        """Add to one of an API's counters"""
+        with self._lock:
+            api_stats = self.stats.setdefault(api, {
+                'calls': 0, 'retries': 0, 'failures': 0,
+                'throttled_seconds': 0.0, 'backoff_seconds': 0.0
+            })
+            api_stats[field] += amount
+
+    def reserve(self, api: str, cost: float = 1.0) -> float:
+        """Take tokens from the API's bucket and return the time to wait before calling"""
+        bucket = self.buckets.get(api)
+        if not bucket:
+            return 0.0
+        wait = bucket.reserve(cost)
+        if wait > 0:
+            self.record(api, 'throttled_seconds', wait)
+        return wait
+
+    @staticmethod
+    def is_retryable(error: Exception, idempotent: bool = True) -> bool:
+        """
+        Return True for rate-limit, server and transient network errors
+
+        A non-idempotent request (e.g. documents.create) may have succeeded on
+        the server despite a 5xx or a timeout, so sending it again could
+        duplicate its effect. It is only retried on rate limiting and on a
+        refused connection.
+        """
+        if isinstance(error, HttpError):
+            status = error.resp.status
+            if status == 429:
+                return True
+            if status in RETRYABLE_STATUS:
+                return idempotent
+            if status == 403:
+                reasons = {detail.get('reason') for detail in (error.error_details or []) if isinstance(detail, dict)}
+                return bool(reasons & (RETRYABLE_REASONS if idempotent else RATE_LIMIT_REASONS))
+            return False
+        if isinstance(error, ConnectionRefusedError):
+            return True
+        return idempotent and isinstance(error, (ConnectionError, TimeoutError, socket.timeout))
+
+    def backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Return the delay before retry number attempt + 1 (Retry-After or jittered exponential)"""
+        if isinstance(error, HttpError):
+            retry_after = error.resp.get('retry-after')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def execute(self, request, api: str, cost: float = 1.0, idempotent: bool = True):
+        """
+        Execute a googleapiclient request under the API's rate limit, retrying transient errors
+
+        Args:
+            request: An HttpRequest (anything with an execute() method)
+            api: Quota bucket name ('gmail', 'docs_read', 'docs_write' or 'drive')
+            cost: Tokens this call consumes (Gmail quota units, otherwise 1)
+            idempotent: False for writes that mustn't be sent twice (see is_retryable)
+
+        Returns:
+            The response of request.execute()
+        """
+        attempt = 0
+        while True:
+            wait = self.reserve(api, cost)
+            if wait > 0:
+                self._sleep(wait)
+            self.record(api, 'calls')
+            try:
+                return request.execute()
+            except Exception as error:
+                if attempt >= self.max_retries or not self.is_retryable(error, idempotent):
+                    self.record(api, 'failures')
+                    raise
+                delay = self.backoff_delay(attempt, error)
+                self.record(api, 'retries')
+                self.record(api, 'backoff_seconds', delay)
+                self._sleep(delay)
+                attempt += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return a snapshot of per-API counters"""
+        with self._lock:
+            return {api: dict(values) for api, values in self.stats.items()}
+
+
+# Default executor shared by every client in the process
+executor = ApiExecutor()
+
+
+def execute(request, api: str, cost: float = 1.0, idempotent: bool = True):
+    """Execute a request through the default executor"""
+    return executor.execute(request, api, cost, idempotent)
+
+
+def get_stats() -> Dict[str, Dict[str, float]]:
+    """Return retry and throttling counters from the default executor"""
+    return executor.get_stats()
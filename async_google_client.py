@@ -0,0 +1,377 @@
+import asyncio
+from typing import Dict, List, Optional
+import httpx
+import httplib2
+from googleapiclient.errors import HttpError
+from google.auth.transport.requests import Request
+from gmail_client import GmailClient
+from google_docs_client import GoogleDocsClient
+from google_drive_client import GoogleDriveClient
+from google_services import get_credentials
+from api_executor import executor as default_executor, GMAIL_UNITS
+
+# REST roots for the endpoints this project uses; override to point at a local stub server
+BASE_URLS = {
+    'gmail': 'https://gmail.googleapis.com/gmail/v1',
+    'docs': 'https://docs.googleapis.com/v1',
+    'drive': 'https://www.googleapis.com/drive/v3',
+}
+
+
+class AsyncGoogleClient:
+    """
+    Asyncio access to the Gmail, Docs and Drive endpoints used by this project.
+
+    Requests share one pooled httpx.AsyncClient and the same credentials,
+    quota buckets and retry policy as the synchronous clients. Failed calls
+    raise googleapiclient's HttpError, so callers handle errors the same way
+    for both layers.
+
+    The CLI doesn't use this layer yet; it still fetches through the
+    synchronous clients.
+
+    Usage:
+        async with AsyncGoogleClient() as client:
+            transcripts = await client.get_transcripts()
+    """
+
+    def __init__(
+        self,
+        credentials=None,
+        credentials_path: str = 'token.pickle',
+        base_urls: Optional[Dict[str, str]] = None,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        timeout: float = 60.0,
+        executor=None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        start_date: Optional[str] = None,
+        label: Optional[str] = None,
+        folder_id: Optional[str] = None
+    ):
+        """
+        Args:
+            credentials: OAuth credentials (default: shared credentials for credentials_path)
+            credentials_path: Path to the credentials pickle file
+            base_urls: Overrides for BASE_URLS (e.g. a local stub server)
+            max_connections: Size of the HTTP connection pool
+            max_concurrency: Maximum in-flight requests per fan-out
+            timeout: Per-request timeout in seconds
+            executor: ApiExecutor whose quota buckets and counters are shared
+            transport: Optional httpx transport (e.g. httpx.MockTransport)
+            start_date, label: Gmail filters, as for GmailClient
+            folder_id: Drive folder, as for GoogleDriveClient
+        """
+        self.credentials = credentials or get_credentials(credentials_path)
+        self.base_urls = {**BASE_URLS, **(base_urls or {})}
+        self.executor = executor or default_executor
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+            transport=transport
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._refresh_lock = asyncio.Lock()
+
+        # Offline helpers reuse the sync clients' query building and parsing
+        self.gmail = GmailClient(start_date=start_date, label=label, connect=False)
+        self.docs = GoogleDocsClient(credentials_path, connect=False)
+        self.drive = GoogleDriveClient(folder_id=folder_id, credentials_path=credentials_path, connect=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close pooled connections"""
+        await self._http.aclose()
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        """Return the Authorization header, refreshing the shared credentials if needed"""
+        if not self.credentials.valid and getattr(self.credentials, 'refresh_token', None):
+            async with self._refresh_lock:
+                if not self.credentials.valid:
+                    await asyncio.to_thread(self.credentials.refresh, Request())
+        headers = {}
+        self.credentials.apply(headers)
+        return headers
+
+    async def _request(
+        self,
+        method: str,
+        service: str,
+        path: str,
+        api: str,
+        cost: float = 1.0,
+        params: Optional[Dict] = None,
+        body: Optional[Dict] = None,
+        raw: bool = False
+    ):
+        """Send one request under the API's rate limit, retrying transient failures"""
+        url = f"{self.base_urls[service]}/{path}"
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+
+        attempt = 0
+        async with self._semaphore:
+            while True:
+                wait = self.executor.reserve(api, cost)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.executor.record(api, 'calls')
+
+                try:
+                    response = await self._http.request(
+                        method, url,
+                        params=params,
+                        json=body,
+                        headers=await self._auth_headers()
+                    )
+                    if response.status_code >= 400:
+                        resp = httplib2.Response({'status': response.status_code, **response.headers})
+                        raise HttpError(resp, response.content, uri=str(response.url))
+                    if raw:
+                        return response.text
+                    return response.json() if response.content else {}
+
+                except (HttpError, httpx.TransportError) as error:
+                    # Writes are only resent when they can't have reached the server (see is_retryable)
+                    idempotent = method == 'GET'
+                    if isinstance(error, httpx.TransportError):
+                        retryable = idempotent or isinstance(error, httpx.ConnectError)
+                    else:
+                        retryable = self.executor.is_retryable(error, idempotent)
+                    if attempt >= self.executor.max_retries or not retryable:
+                        self.executor.record(api, 'failures')
+                        raise
+                    delay = self.executor.backoff_delay(attempt, error)
+                    self.executor.record(api, 'retries')
+                    self.executor.record(api, 'backoff_seconds', delay)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+    # ----- Gmail -----
+
+    async def list_messages(self, query: str, max_results: int = 50) -> Dict:
+        """users.messages.list"""
+        return await self._request(
+            'GET', 'gmail', 'users/me/messages', 'gmail', GMAIL_UNITS['messages.list'],
+            params={'q': query, 'maxResults': max_results}
+        )
+
+    async def get_message(self, message_id: str, format: str = 'full') -> Dict:
+        """users.messages.get"""
+        return await self._request(
+            'GET', 'gmail', f'users/me/messages/{message_id}', 'gmail', GMAIL_UNITS['messages.get'],
+            params={'format': format}
+        )
+
+    # ----- Docs -----
+
+    async def get_document(self, document_id: str, include_tabs: bool = True, fields: Optional[str] = None) -> Dict:
+        """documents.get"""
+        params = {'includeTabsContent': 'true' if include_tabs else None, 'fields': fields}
+        return await self._request('GET', 'docs', f'documents/{document_id}', 'docs_read', params=params)
+
+    async def create_document(self, title: str) -> Dict:
+        """documents.create"""
+        return await self._request('POST', 'docs', 'documents', 'docs_write', body={'title': title})
+
+    async def batch_update_document(self, document_id: str, requests: List[Dict]) -> Dict:
+        """documents.batchUpdate"""
+        return await self._request(
+            'POST', 'docs', f'documents/{document_id}:batchUpdate', 'docs_write',
+            body={'requests': requests}
+        )
+
+    # ----- Drive -----
+
+    async def list_files(self, query: str, fields: str, page_size: int = 100, page_token: Optional[str] = None) -> Dict:
+        """files.list"""
+        return await self._request(
+            'GET', 'drive', 'files', 'drive',
+            params={'q': query, 'fields': fields, 'pageSize': page_size, 'pageToken': page_token}
+        )
+
+    async def get_file(self, file_id: str, fields: Optional[str] = None) -> Dict:
+        """files.get"""
+        return await self._request('GET', 'drive', f'files/{file_id}', 'drive', params={'fields': fields})
+
+    async def update_file(self, file_id: str, metadata: Optional[Dict] = None, **params) -> Dict:
+        """files.update (metadata only), e.g. addParents/removeParents/fields"""
+        return await self._request('PATCH', 'drive', f'files/{file_id}', 'drive', params=params, body=metadata or {})
+
+    async def export_file(self, file_id: str, mime_type: str = 'text/plain') -> str:
+        """files.export"""
+        return await self._request(
+            'GET', 'drive', f'files/{file_id}/export', 'drive',
+            params={'mimeType': mime_type}, raw=True
+        )
+
+    # ----- Async variants of the sync client workflows -----
+
+    async def get_document_content(self, document_id: str, prefer_transcript: bool = True) -> str:
+        """Async GoogleDocsClient.get_document_content"""
+        try:
+            document = await self.get_document(document_id)
+            return self.docs.extract_document_text(document, prefer_transcript)
+        except HttpError as error:
+            print(f'An error occurred fetching document {document_id}: {error}')
+            return ''
+
+    async def get_plain_document_content(self, document_id: str) -> str:
+        """Async GoogleDocsClient.get_plain_document_content"""
+        try:
+            document = await self.get_document(document_id, include_tabs=False)
+            doc_content = document.get('body', {}).get('content', [])
+            return ''.join(self.docs._extract_content_from_elements(doc_content))
+        except HttpError as error:
+            print(f'An error occurred fetching document {document_id}: {error}')
+            return ''
+
+    async def _transcript_from_message(self, message: Dict) -> Optional[Dict]:
+        """Fetch one message and its linked transcript doc, mirroring GmailClient.get_transcripts"""
+        msg_data = await self.get_message(message['id'])
+
+        headers = msg_data['payload']['headers']
+        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
+
+        parsed = self.gmail.parse_subject_line(subject)
+        if not parsed:
+            return None
+
+        email_body = self.gmail._get_message_body(msg_data)
+        doc_id = self.gmail._extract_google_doc_id(email_body)
+
+        transcript = {
+            'id': message['id'],
+            'subject': subject,
+            'topic': parsed['topic'],
+            'date': parsed['date'],
+        }
+
+        if doc_id:
+            transcript_content = await self.get_document_content(doc_id)
+            if not transcript_content:
+                return None
+            transcript['body'] = transcript_content
+            transcript['doc_id'] = doc_id
+        elif email_body:
+            transcript['body'] = email_body
+        else:
+            return None
+
+        return transcript
+
+    async def get_transcripts(self, max_results: int = 50) -> List[Dict]:
+        """Async GmailClient.get_transcripts: messages and docs are fetched concurrently, order preserved"""
+        try:
+            results = await self.list_messages(self.gmail._build_date_query(), max_results)
+            messages = results.get('messages', [])
+            transcripts = await asyncio.gather(*(self._transcript_from_message(m) for m in messages))
+            return [t for t in transcripts if t]
+
+        except HttpError as error:
+            print(f'An error occurred: {error}')
+            return []
+
+    async def get_documents_in_folder(
+        self,
+        folder_id: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        modified_after: Optional[str] = None
+    ) -> List[Dict]:
+        """Async GoogleDriveClient.get_documents_in_folder"""
+        folder_id = folder_id or self.drive.folder_id
+        if not folder_id:
+            raise ValueError(
+                "No folder_id provided. Set DRIVE_FOLDER_ID in .env or pass folder_id parameter"
+            )
+
+        try:
+            documents = []
+            query = self.drive._build_documents_query(folder_id, modified_after)
+
+            page_token = None
+            while True:
+                results = await self.list_files(
+                    query,
+                    "nextPageToken, files(id, name, modifiedTime, createdTime)",
+                    page_token=page_token
+                )
+
+                for item in results.get('files', []):
+                    if name_pattern and name_pattern.lower() not in item['name'].lower():
+                        continue
+                    documents.append({
+                        'id': item['id'],
+                        'name': item['name'],
+                        'modified': item.get('modifiedTime', ''),
+                        'created': item.get('createdTime', '')
+                    })
+
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+
+            documents.sort(key=lambda x: x['modified'], reverse=True)
+            return documents
+
+        except HttpError as error:
+            print(f'An error occurred accessing Drive folder: {error}')
+            return []
+
+    async def _list_subfolders(self, folder_id: str) -> List[Dict]:
+        query = f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
+        try:
+            results = await self.list_files(query, "files(id, name)")
+            return results.get('files', [])
+        except HttpError as error:
+            print(f'Error scanning subfolders: {error}')
+            return []
+
+    async def get_documents_recursive(
+        self,
+        folder_id: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        modified_after: Optional[str] = None
+    ) -> List[Dict]:
+        """Async GoogleDriveClient.get_documents_recursive; each folder level is scanned concurrently"""
+        folder_id = folder_id or self.drive.folder_id
+        if not folder_id:
+            raise ValueError(
+                "No folder_id provided. Set DRIVE_FOLDER_ID in .env or pass folder_id parameter"
+            )
+
+        all_documents = []
+        level = [(folder_id, '')]
+
+        while level:
+            docs_per_folder = await asyncio.gather(*(
+                self.get_documents_in_folder(fid, name_pattern, modified_after) for fid, _ in level
+            ))
+            subfolders_per_folder = await asyncio.gather(*(self._list_subfolders(fid) for fid, _ in level))
+
+            next_level = []
+            for (_, path), docs, subfolders in zip(level, docs_per_folder, subfolders_per_folder):
+                for doc in docs:
+                    doc['folder_path'] = path
+                    all_documents.append(doc)
+                for folder in subfolders:
+                    subfolder_path = f"{path}/{folder['name']}" if path else folder['name']
+                    next_level.append((folder['id'], subfolder_path))
+            level = next_level
+
+        all_documents.sort(key=lambda x: x['modified'], reverse=True)
+        return all_documents
+
+    async def list_documents(
+        self,
+        name_pattern: Optional[str] = None,
+        modified_after: Optional[str] = None
+    ) -> List[Dict]:
+        """Async GoogleDriveClient.list_documents"""
+        if self.drive.recursive:
+            return await self.get_documents_recursive(name_pattern=name_pattern, modified_after=modified_after)
+        return await self.get_documents_in_folder(name_pattern=name_pattern, modified_after=modified_after)
@@ -0,0 +1,251 @@
+import os
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Completed/failed states reported by status()
+COMPLETED = 'completed'
+IN_PROGRESS = 'in_progress'
+FAILED = 'failed'
+
+
+def _write_jsonl(path: str, rows: List[Dict]):
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+
+
+def _read_jsonl(path: str) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class LocalBatchProvider:
+    """
+    File-based stand-in for a provider batch API.
+
+    submit() writes the requests to <directory>/<job_id>/input.jsonl; the job
+    is completed by run(), which answers each request with a generate()
+    callable (e.g. the local Qwen client) and writes output.jsonl - the same
+    file exchange the hosted batch APIs use.
+    """
+
+    name = 'local'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.directory, job_id)
+
+    def submit(self, requests: List[Dict], model: str) -> str:
+        job_id = f"local-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        os.makedirs(self._job_dir(job_id), exist_ok=True)
+        _write_jsonl(os.path.join(self._job_dir(job_id), 'input.jsonl'), [
+            {'custom_id': r['custom_id'], 'model': model, 'prompt': r['prompt'],
+             'max_tokens': r['max_tokens'], 'temperature': r['temperature']}
+            for r in requests
+        ])
+        return job_id
+
+    def status(self, job_id: str) -> str:
+        return COMPLETED if os.path.exists(os.path.join(self._job_dir(job_id), 'output.jsonl')) else IN_PROGRESS
+
+    def run(self, job_id: str, generate: Callable[..., str]):
+        """Process a submitted job, writing output.jsonl"""
+        rows = []
+        for request in _read_jsonl(os.path.join(self._job_dir(job_id), 'input.jsonl')):
+            try:
+                text = generate(prompt=request['prompt'], max_tokens=request['max_tokens'],
+                                temperature=request['temperature'])
+                rows.append({'custom_id': request['custom_id'], 'text': text})
+            except Exception as e:
+                rows.append({'custom_id': request['custom_id'], 'error': str(e)})
+        _write_jsonl(os.path.join(self._job_dir(job_id), 'output.jsonl'), rows)
+
+    def results(self, job_id: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        return {
+            row['custom_id']: (row.get('text'), row.get('error'))
+            for row in _read_jsonl(os.path.join(self._job_dir(job_id), 'output.jsonl'))
+        }
+
+
+class OpenAIBatchProvider:
+    """OpenAI Batch API (/v1/chat/completions requests, 24h completion window)"""
+
+    name = 'openai'
+
+    def __init__(self, directory: str):
+        from openai import OpenAI
+        self.client = OpenAI()
+        self.directory = directory
+
+    def submit(self, requests: List[Dict], model: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"openai-input-{uuid.uuid4().hex[:8]}.jsonl")
+        _write_jsonl(path, [
+            {
+                'custom_id': r['custom_id'],
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': model,
+                    'messages': [{'role': 'user', 'content': r['prompt']}],
+                    'max_tokens': r['max_tokens'],
+                    'temperature': r['temperature']
+                }
+            }
+            for r in requests
+        ])
+        with open(path, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=input_file.id, endpoint='/v1/chat/completions', completion_window='24h'
+        )
+        return batch.id
+
+    def status(self, job_id: str) -> str:
+        status = self.client.batches.retrieve(job_id).status
+        if status == 'completed':
+            return COMPLETED
+        if status in ('failed', 'expired', 'cancelled'):
+            return FAILED
+        return IN_PROGRESS
+
+    def results(self, job_id: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        batch = self.client.batches.retrieve(job_id)
+        results = {}
+        for file_id in (batch.error_file_id, batch.output_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                response = row.get('response') or {}
+                if response.get('status_code') == 200:
+                    results[row['custom_id']] = (response['body']['choices'][0]['message']['content'], None)
+                else:
+                    error = row.get('error') or response.get('body', {}).get('error') or 'request failed'
+                    results[row['custom_id']] = (None, str(error))
+        return results
+
+
+class AnthropicBatchProvider:
+    """Anthropic Message Batches API"""
+
+    name = 'anthropic'
+
+    def __init__(self, directory: str):
+        from anthropic import Anthropic
+        self.client = Anthropic()
+
+    def submit(self, requests: List[Dict], model: str) -> str:
+        batch = self.client.messages.batches.create(requests=[
+            {
+                'custom_id': r['custom_id'],
+                'params': {
+                    'model': model,
+                    'max_tokens': r['max_tokens'],
+                    'temperature': r['temperature'],
+                    'messages': [{'role': 'user', 'content': r['prompt']}]
+                }
+            }
+            for r in requests
+        ])
+        return batch.id
+
+    def status(self, job_id: str) -> str:
+        return COMPLETED if self.client.messages.batches.retrieve(job_id).processing_status == 'ended' else IN_PROGRESS
+
+    def results(self, job_id: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        results = {}
+        for entry in self.client.messages.batches.results(job_id):
+            if entry.result.type == 'succeeded':
+                text = ''.join(block.text for block in entry.result.message.content if block.type == 'text')
+                results[entry.custom_id] = (text, None)
+            else:
+                results[entry.custom_id] = (None, f"request {entry.result.type}")
+        return results
+
+
+BATCH_PROVIDERS = {
+    'local': LocalBatchProvider,
+    'qwen': LocalBatchProvider,
+    'openai': OpenAIBatchProvider,
+    'anthropic': AnthropicBatchProvider,
+    'claude': AnthropicBatchProvider,
+}
+
+
+def batch_provider_name(provider: str) -> str:
+    """Batch API to submit to for an LLM provider; BATCH_PROVIDER=local forces the file-based stand-in"""
+    return os.getenv('BATCH_PROVIDER', '').strip().lower() or provider
+
+
+def get_batch_provider(name: str, directory: str):
+    """
+    Create the batch API client for a batch provider name
+
+    Raises:
+        ValueError: If there is no supported batch API for the name
+    """
+    if name not in BATCH_PROVIDERS:
+        raise ValueError(f"No batch API support for provider '{name}' (supported: openai, anthropic, local)")
+    return BATCH_PROVIDERS[name](directory)
+
+
+class BatchJobStore:
+    """
+    Submitted batch jobs, one JSON record per job in BATCH_JOBS_DIR.
+
+    A record keeps the provider job id, the model, and per request its
+    custom_id, prompt and the transcript metadata needed to save the result.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.getenv('BATCH_JOBS_DIR', 'batch_jobs')
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def save(self, job: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(job['job_id']) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, indent=2)
+        os.replace(tmp_path, self._path(job['job_id']))
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        if not os.path.exists(self._path(job_id)):
+            return None
+        with open(self._path(job_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def pending(self) -> List[Dict]:
+        """Jobs not yet collected (or failed), oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        jobs = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith('.json'):
+                job = self.load(name[:-len('.json')])
+                if job and job.get('status') not in ('collected', 'failed'):
+                    jobs.append(job)
+        return sorted(jobs, key=lambda job: job['submitted_at'])
+
+    def create(self, provider_name: str, job_id: str, llm_provider: str, model: str, requests: List[Dict], **settings) -> Dict:
+        job = {
+            'job_id': job_id,
+            'batch_provider': provider_name,
+            'provider': llm_provider,
+            'model': model,
+            'submitted_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'status': 'submitted',
+            'settings': settings,
+            'requests': requests
+        }
+        self.save(job)
+        return job
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark transcript exclusion filters: per-name substring scans vs the PhraseMatcher automaton.
+
+Generates synthetic transcripts and EXCLUDE_PEOPLE lists of increasing size and
+times the previous should_exclude_transcript logic (lowercase the body, then one
+`in` scan per name) against a PhraseMatcher built once. Worst case is measured:
+no name matches, so every name has to be checked.
+
+Usage:
+  python benchmark_exclusion_filters.py
+  python benchmark_exclusion_filters.py --runs 20 --words 50000
+"""
+import argparse
+import random
+import statistics
+import time
+from phrase_matcher import PhraseMatcher
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Priya', 'Wei', 'Fatima', 'Diego', 'Olga', 'Kwame', 'Sofia', 'Hiro',
+               'Amara', 'Lukas', 'Maya', 'Tomas', 'Nia', 'Ravi', 'Elena', 'Omar', 'Chloe', 'Ivan']
+WORDS = ('the we should ship agent pipeline customer strategy data model quarter revenue team '
+         'think really launch plan metrics roadmap risk cost latency deploy review').split()
+
+
+def make_transcript(word_count, rng):
+    speakers = ['Stephen Sklarew', 'Jane Doe', 'Sam Lee']
+    lines, written = [], 0
+    while written < word_count:
+        n = rng.randint(8, 40)
+        lines.append(f"{rng.choice(speakers)}: {' '.join(rng.choice(WORDS) for _ in range(n))}.")
+        written += n
+    return '\n'.join(lines)
+
+
+def make_people(count, rng):
+    # Surnames that never appear in the transcript, so nothing matches
+    return [f"{rng.choice(FIRST_NAMES)} Zq{index:04d}" for index in range(count)]
+
+
+def legacy_exclude(body, people):
+    """Previous should_exclude_transcript people check"""
+    body = body.lower()
+    for person in people:
+        if person.lower() in body:
+            return True
+    return False
+
+
+def median_ms(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcript exclusion filters")
+    parser.add_argument('--runs', type=int, default=10, help='Runs per case (default: 10)')
+    parser.add_argument('--words', type=int, default=20000, help='Transcript length in words (default: 20000)')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    body = make_transcript(args.words, rng)
+
+    print(f"Transcript: {args.words:,} words, {len(body):,} characters\n")
+    print(f"{'Names':>6} {'Substring (ms)':>15} {'Matcher (ms)':>13} {'Build (ms)':>11} {'Speedup':>8}")
+    print("-" * 58)
+
+    for count in (10, 100, 500, 1000, 5000):
+        people = make_people(count, rng)
+
+        build_ms = median_ms(lambda: PhraseMatcher(people), max(1, args.runs // 2))
+        matcher = PhraseMatcher(people)
+        assert legacy_exclude(body, people) == bool(matcher.search(body))
+
+        legacy = median_ms(lambda: legacy_exclude(body, people), args.runs)
+        compiled = median_ms(lambda: matcher.search(body), args.runs)
+        print(f"{count:>6} {legacy:>15.2f} {compiled:>13.2f} {build_ms:>11.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
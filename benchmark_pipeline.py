@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark the analysis pipeline end to end against the deterministic fake LLM provider.
+
+Generates synthetic transcripts of several sizes (long ones go through the
+map-reduce path) and runs ContentAnalyzer.batch_analyze - and with --cli the
+`cli.py --batch` flow, with Gmail/Docs replaced by in-memory stand-ins and
+results saved locally to a temp directory - at each concurrency level.
+Reports throughput, p50/p95 transcript and LLM call latency, and peak
+Python memory (tracemalloc). No network, credentials or API costs involved.
+
+Usage:
+  python benchmark_pipeline.py
+  python benchmark_pipeline.py --transcripts 60 --concurrency 1 4 8 --latency 0.5 --tps 60
+  python benchmark_pipeline.py --cli --error-rate 0.05
+"""
+import io
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from contextlib import contextmanager
+
+SIZES = {'short': 400, 'medium': 4000, 'long': 20000}
+SPEAKERS = ['Stephen Sklarew', 'Jane Doe', 'Sam Lee', 'Priya Patel']
+WORDS = ('the we should ship agent pipeline customer strategy data model quarter revenue team '
+         'think really launch plan metrics roadmap risk cost latency deploy review um 40% 3x').split()
+
+
+def make_transcript(index, size, rng):
+    lines, written = [], 0
+    while written < SIZES[size]:
+        n = rng.randint(8, 40)
+        lines.append(f"{rng.choice(SPEAKERS)}: {' '.join(rng.choice(WORDS) for _ in range(n))}.")
+        written += n
+    return {
+        'id': f"synthetic-{index}",
+        'subject': f"Notes: Synthetic {size} meeting {index}",
+        'topic': f"Synthetic {size} meeting {index}",
+        'date': 'Jan 05, 2026',
+        'body': '\n'.join(lines)
+    }
+
+
+def make_transcripts(count, sizes, seed=42):
+    rng = random.Random(seed)
+    return [make_transcript(index, sizes[index % len(sizes)], rng) for index in range(count)]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+@contextmanager
+def measured():
+    """Collect wall time and peak traced memory of the block"""
+    stats = {}
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats['seconds'] = time.perf_counter() - started
+        stats['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+
+def new_analyzer(concurrency, pack):
+    import fake_llm
+    from content_analyzer import ContentAnalyzer
+    fake_llm.reset_clients()
+    analyzer = ContentAnalyzer(model_override='fake-llm', provider_override='fake', concurrency=concurrency,
+                               cache_mode='off', pack=pack, routing=False)
+    # Time each transcript as the worker threads run it
+    latencies = []
+    analyze = analyzer.analyze_transcript
+
+    def timed(transcript):
+        started = time.perf_counter()
+        try:
+            return analyze(transcript)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    analyzer.analyze_transcript = timed
+    return analyzer, latencies
+
+
+def run_batch_analyze(transcripts, concurrency, pack):
+    analyzer, latencies = new_analyzer(concurrency, pack)
+    with measured() as stats:
+        results = analyzer.batch_analyze(transcripts)
+    stats.update(latencies=latencies, calls=analyzer.client.calls,
+                 errors=sum('error' in result for result in results))
+    return stats
+
+
+def run_cli_batch(transcripts, concurrency, pack):
+    import cli
+    import fake_llm
+    from rich.console import Console
+
+    class FakeGmail:
+        def __init__(self, **kwargs):
+            pass
+
+        def get_transcripts(self):
+            return [dict(t) for t in transcripts]
+
+    fake_llm.reset_clients()
+    cli.GmailClient = FakeGmail
+    cli.GoogleDocsClient = lambda: None
+    cli.console = Console(file=io.StringIO())
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as output_dir:
+        os.chdir(output_dir)
+        try:
+            with measured() as stats:
+                cli.batch_process_all(model_override='fake-llm', provider_override='fake', concurrency=concurrency,
+                                      cache_mode='off', save_local=True, pack=pack, routing=False)
+            saved = len([name for name in os.listdir(output_dir) if name.endswith('.md')])
+        finally:
+            os.chdir(cwd)
+
+    stats.update(latencies=[], calls=fake_llm.get_client('fake').calls, errors=None, saved=saved)
+    return stats
+
+
+def report(name, concurrency, count, stats):
+    call_seconds = [call['seconds'] for call in stats['calls']]
+    throughput = count * 60 / stats['seconds']
+    latencies = stats['latencies']
+    latency = (f"{percentile(latencies, 50):>7.2f} {percentile(latencies, 95):>7.2f}"
+               if latencies else f"{'-':>7} {'-':>7}")
+    errors = stats['errors'] if stats['errors'] is not None else f"{stats['saved']} docs"
+    print(f"{name:<14} {concurrency:>4} {stats['seconds']:>8.2f} {throughput:>9.1f} {latency} "
+          f"{percentile(call_seconds, 50):>7.2f} {percentile(call_seconds, 95):>7.2f} "
+          f"{len(call_seconds):>6} {stats['peak_mb']:>8.1f} {errors!s:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline with the fake LLM provider")
+    parser.add_argument('--transcripts', type=int, default=24, help='Synthetic transcripts per run (default: 24)')
+    parser.add_argument('--sizes', nargs='+', choices=sorted(SIZES), default=['short', 'medium', 'long'],
+                        help='Transcript sizes to cycle through (default: all)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8], help='Concurrency levels (default: 1 4 8)')
+    parser.add_argument('--latency', type=float, default=0.2, help='Median time to first token in seconds (default: 0.2)')
+    parser.add_argument('--sigma', type=float, default=0.5, help='Lognormal latency spread (default: 0.5)')
+    parser.add_argument('--tps', type=float, default=400, help='Output tokens per second (default: 400)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Injected provider error rate (default: 0)')
+    parser.add_argument('--pack', action='store_true', help='Pack short transcripts into shared requests')
+    parser.add_argument('--cli', action='store_true', help='Also benchmark the cli.py --batch flow')
+    args = parser.parse_args()
+
+    os.environ.update({
+        'FAKE_LLM_LATENCY_MEDIAN': str(args.latency),
+        'FAKE_LLM_LATENCY_SIGMA': str(args.sigma),
+        'FAKE_LLM_TOKENS_PER_SECOND': str(args.tps),
+        'FAKE_LLM_ERROR_RATE': str(args.error_rate),
+        'LLM_LATENCY_HISTORY': os.path.join(tempfile.gettempdir(), 'benchmark_llm_latency.jsonl'),
+        'ROUTING_LOG': os.path.join(tempfile.gettempdir(), 'benchmark_routing_log.jsonl'),
+    })
+
+    transcripts = make_transcripts(args.transcripts, args.sizes)
+    words = sum(len(t['body'].split()) for t in transcripts)
+    print(f"{len(transcripts)} transcripts ({', '.join(args.sizes)}), {words:,} words; fake LLM: "
+          f"{args.latency}s median first token, {args.tps:g} tok/s, {args.error_rate:.0%} errors\n")
+    print(f"{'Flow':<14} {'Conc':>4} {'Wall (s)':>8} {'Per min':>9} {'T p50':>7} {'T p95':>7} "
+          f"{'Call p50':>7} {'Call p95':>7} {'Calls':>6} {'Peak MB':>8} {'Errors':>8}")
+    print("-" * 104)
+
+    for concurrency in args.concurrency:
+        report('batch_analyze', concurrency, len(transcripts), run_batch_analyze(transcripts, concurrency, args.pack))
+        if args.cli:
+            report('cli --batch', concurrency, len(transcripts), run_cli_batch(transcripts, concurrency, args.pack))
+
+    print("\nT = per-transcript latency, Call = per-LLM-call latency (seconds)")
+
+
+if __name__ == '__main__':
+    main()
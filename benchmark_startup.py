@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark Google API client startup: per-client build() vs the shared service registry.
+
+Replays the service construction done by `cli.py --list` (Gmail client plus its
+embedded Docs client) and by the batch/interactive flows (which add a second
+Docs client). Uses anonymous credentials, so no token.pickle or network is needed.
+
+`--list` builds three different services, so nothing is shared there: any gain
+comes from building from the parsed bundled documents. The batch flows build
+Docs and Drive twice and are where the registry saves most. Each approach is
+run once untimed first and timed runs alternate between the two, so one-time
+import and file-cache costs don't land on whichever runs first.
+
+Usage:
+  python benchmark_startup.py
+  python benchmark_startup.py --runs 20
+"""
+import argparse
+import statistics
+import time
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.discovery import build
+from google_services import ServiceRegistry
+
+# Services built by each CLI flow before this change
+SCENARIOS = {
+    'cli.py --list': [('gmail', 'v1'), ('docs', 'v1'), ('drive', 'v3')],
+    'cli.py --batch': [('gmail', 'v1'), ('docs', 'v1'), ('drive', 'v3'), ('docs', 'v1'), ('drive', 'v3')],
+}
+
+
+def legacy_startup(services):
+    """Build every service separately, as each client used to"""
+    creds = AnonymousCredentials()
+    for api, version in services:
+        build(api, version, credentials=creds)
+
+
+def registry_startup(services):
+    """Hand out shared services from a fresh registry"""
+    registry = ServiceRegistry(credentials=AnonymousCredentials())
+    for api, version in services:
+        registry.get_service(api, version)
+
+
+def time_runs(funcs, services, runs):
+    """Median seconds per function, warmed up once and timed in alternating runs"""
+    for func in funcs:
+        func(services)
+    timings = {func: [] for func in funcs}
+    for _ in range(runs):
+        for func in funcs:
+            start = time.perf_counter()
+            func(services)
+            timings[func].append(time.perf_counter() - start)
+    return [statistics.median(timings[func]) for func in funcs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Google API client startup")
+    parser.add_argument('--runs', type=int, default=10, help='Runs per scenario (default: 10)')
+    args = parser.parse_args()
+
+    print(f"{'Scenario':<18} {'Legacy (ms)':>12} {'Registry (ms)':>14} {'Speedup':>8}")
+    print("-" * 56)
+
+    for name, services in SCENARIOS.items():
+        legacy, shared = (seconds * 1000 for seconds in time_runs([legacy_startup, registry_startup], services, args.runs))
+        print(f"{name:<18} {legacy:>12.1f} {shared:>14.1f} {legacy / shared:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
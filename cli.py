@@ -26,6 +26,8 @@ Usage:
 import sys
 import os
 import argparse
+import time
+import threading
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
@@ -36,47 +38,25 @@ from gmail_client import GmailClient
 from google_drive_client import GoogleDriveClient
 from google_docs_client import GoogleDocsClient
 from content_analyzer import ContentAnalyzer
+from transcript_filter import ExclusionFilter
+from output_manifest import OutputManifest
+from api_executor import get_stats as get_api_stats
+from run_estimator import RunEstimator, LatencyHistory, summarize_calls
+from topic_stream import parse_topics
+from batch_jobs import BatchJobStore, LocalBatchProvider, batch_provider_name, get_batch_provider, IN_PROGRESS, FAILED
 from dotenv import load_dotenv
 
 load_dotenv()
 
 console = Console()
 
+# Output manifest is loaded lazily on the first Google Docs save
+_output_manifest = None
+_output_manifest_lock = threading.Lock()
+
 def parse_topics_from_analysis(analysis_text: str) -> list:
     """Parse individual topics from analysis markdown text"""
-    import re
-
-    # Split on topic headers (## TOPIC N:)
-    topic_pattern = r'## TOPIC \d+:'
-    splits = re.split(topic_pattern, analysis_text)
-
-    # First split is before any topics (usually empty or intro text)
-    # Remaining splits are topic content
-    topics = []
-    topic_headers = re.findall(topic_pattern, analysis_text)
-
-    for i, (header, content) in enumerate(zip(topic_headers, splits[1:]), 1):
-        # Extract topic title from header
-        title_match = re.search(r'## TOPIC \d+: (.+)', header + content.split('\n')[0])
-        if title_match:
-            title = title_match.group(1).strip()
-        else:
-            title = f"Topic {i}"
-
-        # Clean content (remove the title line if it was captured)
-        lines = content.strip().split('\n')
-        if lines and lines[0].strip():
-            topic_content = header + ' ' + content
-        else:
-            topic_content = header + '\n' + content
-
-        topics.append({
-            'number': i,
-            'title': title,
-            'content': topic_content.strip()
-        })
-
-    return topics
+    return parse_topics(analysis_text)
 
 def display_banner():
     """Display the application banner with ASCII logo"""
@@ -123,19 +103,39 @@ def display_transcripts(transcripts):
     console.print(table)
     console.print(f"\n[bold]Total transcripts found: {len(transcripts)}[/bold]\n")
 
+def focus_slug(focus: str) -> str:
+    """Short tag for a content focus used in output file names, doc titles and the output manifest"""
+    words = "".join(c if c.isalnum() else ' ' for c in focus.lower()).split()
+    return '-'.join(words)[:30].strip('-')
+
+def next_results(analyzer, analyses):
+    """Take the next transcript's results from iter_analyze: one per content focus"""
+    return [next(analyses) for _ in analyzer.focuses]
+
 def display_analysis(result):
     """Display the analysis results"""
     console.print("\n" + "="*80 + "\n")
+    focus = f" [{result['focus']}]" if result.get('focus') else ""
+
+    if result.get('skipped'):
+        console.print(Panel(
+            f"[yellow]{result['error']}[/yellow]",
+            title=f"{result['topic']} - {result['date']}{focus}",
+            border_style="yellow"
+        ))
+        return
 
     if 'error' in result:
         console.print(Panel(
             f"[bold red]Error:[/bold red] {result['error']}",
-            title=f"{result['topic']} - {result['date']}",
+            title=f"{result['topic']} - {result['date']}{focus}",
             border_style="red"
         ))
         return
 
     header = f"[bold cyan]{result['topic']}[/bold cyan] - [green]{result['date']}[/green]"
+    if result.get('focus'):
+        header += f" - [magenta]Focus: {result['focus']}[/magenta]"
     console.print(Panel(header, style="bold"))
 
     console.print("\n")
@@ -143,21 +143,93 @@ def display_analysis(result):
     console.print(md)
     console.print("\n" + "="*80 + "\n")
 
+def get_output_manifest(docs_client, output_folder_id):
+    """Load the output manifest, rebuilding it from the output folder on first use"""
+    global _output_manifest
+
+    # Concurrent save workers wait for the first one to finish loading
+    with _output_manifest_lock:
+        if _output_manifest is None:
+            manifest = OutputManifest()
+            if not manifest.loaded_from_disk:
+                console.print("[cyan]Building output manifest from existing documents...[/cyan]")
+                recovered = manifest.rebuild_from_folder(docs_client, output_folder_id)
+                console.print(f"[cyan]Found {recovered} previously generated document(s)[/cyan]")
+            _output_manifest = manifest
+
+    return _output_manifest
+
+def save_google_doc(docs_client, doc_title, content, output_folder_id, transcript_id=None, manifest_topic=None, hashed_content=None):
+    """
+    Save content as a Google Doc, reusing any document previously generated for the same topic
+
+    Args:
+        hashed_content: Part of content that decides whether a saved doc is unchanged (default: all of it)
+
+    Returns:
+        tuple: (doc_info, status) where status is 'created', 'updated' or 'unchanged'
+    """
+    if not transcript_id or manifest_topic is None:
+        doc_info = docs_client.create_document(
+            title=doc_title,
+            content=content,
+            folder_id=output_folder_id
+        )
+        return doc_info, 'created'
+
+    manifest = get_output_manifest(docs_client, output_folder_id)
+    content_hash = OutputManifest.content_hash(content if hashed_content is None else hashed_content)
+    app_properties = manifest.app_properties(transcript_id, manifest_topic, content_hash)
+    entry = manifest.lookup(transcript_id, manifest_topic)
+
+    if entry and entry['content_hash'] == content_hash:
+        return {'id': entry['doc_id'], 'url': entry['url'], 'title': entry['title']}, 'unchanged'
+
+    doc_info = None
+    status = 'created'
+    if entry:
+        # Keep the original title so the doc stays where users expect it
+        doc_info = docs_client.update_document(
+            entry['doc_id'],
+            content,
+            app_properties=app_properties
+        )
+        if doc_info:
+            doc_info['title'] = entry['title']
+            status = 'updated'
+
+    if not doc_info:
+        doc_info = docs_client.create_document(
+            title=doc_title,
+            content=content,
+            folder_id=output_folder_id,
+            app_properties=app_properties
+        )
+
+    if doc_info:
+        manifest.record(transcript_id, manifest_topic, content_hash, doc_info['id'], doc_info['title'], doc_info['url'])
+
+    return doc_info, status
+
 def save_topic(result, topic, topic_num, total_topics, save_local=False, docs_client=None):
     """Save individual topic to Google Docs (default) or local file"""
     # Prepare content for single topic
-    content = f"# {result['topic']}\n"
-    content += f"**Date:** {result['date']}\n"
-    content += f"**Topic {topic_num} of {total_topics}**\n\n"
-    content += "---\n\n"
-    content += topic['content']
+    header = f"# {result['topic']}\n"
+    header += f"**Date:** {result['date']}\n"
+    if result.get('focus'):
+        header += f"**Focus:** {result['focus']}\n"
+    body = "---\n\n" + topic['content']
+    # Total is unknown while topics are still streaming in
+    position = f"**Topic {topic_num} of {total_topics}**\n\n" if total_topics else f"**Topic {topic_num}**\n\n"
+    content = header + position + body
 
     if save_local:
         # Save as local markdown file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         safe_title = "".join(c for c in topic['title'] if c.isalnum() or c in (' ', '-', '_')).strip()
         safe_title = safe_title.replace(' ', '_')[:50]
-        filename = f"topic_{topic_num}_{safe_title}_{timestamp}.md"
+        tag = f"{focus_slug(result['focus'])}_" if result.get('focus') else ""
+        filename = f"topic_{tag}{topic_num}_{safe_title}_{timestamp}.md"
 
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(content)
@@ -177,15 +249,30 @@ def save_topic(result, topic, topic_num, total_topics, save_local=False, docs_cl
         date_str = datetime.now().strftime("%m%d%Y")
         safe_title = "".join(c for c in topic['title'] if c.isalnum() or c in (' ', '-', '_')).strip()[:40]
         doc_title = f"{date_str}_Topic_{topic_num}_{safe_title}"
-
-        doc_info = docs_client.create_document(
-            title=doc_title,
-            content=content,
-            folder_id=output_folder_id
+        manifest_topic = topic_num
+        if result.get('focus'):
+            # One doc per focus: tag the title and keep each focus's docs apart in the manifest
+            doc_title = f"{date_str}_{focus_slug(result['focus'])}_Topic_{topic_num}_{safe_title}"
+            manifest_topic = f"{focus_slug(result['focus'])}/{topic_num}"
+
+        doc_info, status = save_google_doc(
+            docs_client,
+            doc_title,
+            content,
+            output_folder_id,
+            transcript_id=result.get('id'),
+            manifest_topic=manifest_topic,
+            # Streamed and batch saves differ only in the "of M" position line: same topic, same hash
+            hashed_content=header + body
         )
 
         if doc_info:
-            console.print(f"[green]✓ Topic {topic_num} saved to Google Doc: {doc_title}[/green]")
+            if status == 'unchanged':
+                console.print(f"[dim]Topic {topic_num} unchanged, skipping: {doc_info['title']}[/dim]")
+            elif status == 'updated':
+                console.print(f"[green]✓ Topic {topic_num} updated in existing Google Doc: {doc_info['title']}[/green]")
+            else:
+                console.print(f"[green]✓ Topic {topic_num} saved to Google Doc: {doc_title}[/green]")
             console.print(f"[cyan]View at: {doc_info['url']}[/cyan]")
             return doc_info['url']
         else:
@@ -218,16 +305,19 @@ def save_analysis(result, save_local=False, docs_client=None, combined_topics=Fa
         # LEGACY: Save all topics combined in one file
         # Prepare content
         content = f"# {result['topic']}\n"
-        content += f"**Date:** {result['date']}\n\n"
-        content += "---\n\n"
+        content += f"**Date:** {result['date']}\n"
+        if result.get('focus'):
+            content += f"**Focus:** {result['focus']}\n"
+        content += "\n---\n\n"
         content += result['analysis']
+        tag = focus_slug(result['focus']) if result.get('focus') else None
 
         if save_local:
             # Save as local markdown file
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             safe_topic = "".join(c for c in result['topic'] if c.isalnum() or c in (' ', '-', '_')).strip()
             safe_topic = safe_topic.replace(' ', '_')[:50]
-            filename = f"analysis_{safe_topic}_{timestamp}.md"
+            filename = f"analysis_{tag + '_' if tag else ''}{safe_topic}_{timestamp}.md"
 
             with open(filename, 'w', encoding='utf-8') as f:
                 f.write(content)
@@ -242,17 +332,25 @@ def save_analysis(result, save_local=False, docs_client=None, combined_topics=Fa
             if not output_folder_id:
                 console.print("[yellow]Warning: OUTPUT_FOLDER_ID not set in .env. Document will be created in root Drive folder.[/yellow]")
 
-            # Document title is just MMDDYYYY
-            doc_title = datetime.now().strftime("%m%d%Y")
+            # Document title is just MMDDYYYY (plus the focus tag when analyzing several focuses)
+            doc_title = datetime.now().strftime("%m%d%Y") + (f"_{tag}" if tag else "")
 
-            doc_info = docs_client.create_document(
-                title=doc_title,
-                content=content,
-                folder_id=output_folder_id
+            doc_info, status = save_google_doc(
+                docs_client,
+                doc_title,
+                content,
+                output_folder_id,
+                transcript_id=result.get('id'),
+                manifest_topic=f"{tag}/combined" if tag else 'combined'
             )
 
             if doc_info:
-                console.print(f"[green]✓ Combined analysis saved to Google Doc: {doc_title}[/green]")
+                if status == 'unchanged':
+                    console.print(f"[dim]Combined analysis unchanged, skipping: {doc_info['title']}[/dim]")
+                elif status == 'updated':
+                    console.print(f"[green]✓ Combined analysis updated in existing Google Doc: {doc_info['title']}[/green]")
+                else:
+                    console.print(f"[green]✓ Combined analysis saved to Google Doc: {doc_title}[/green]")
                 console.print(f"[cyan]View at: {doc_info['url']}[/cyan]")
             else:
                 console.print("[red]Failed to create Google Doc. Use --save-local flag to save as markdown instead.[/red]")
@@ -275,7 +373,10 @@ def save_combined_analysis(results, save_local=False, docs_client=None):
     for idx, result in enumerate(valid_results, 1):
         # Add section header for each transcript
         content += f"# {idx}. {result['topic']}\n"
-        content += f"**Date:** {result['date']}\n\n"
+        content += f"**Date:** {result['date']}\n"
+        if result.get('focus'):
+            content += f"**Focus:** {result['focus']}\n"
+        content += "\n"
         content += "---\n\n"
         content += result['analysis']
         content += "\n\n"
@@ -319,6 +420,497 @@ def save_combined_analysis(results, save_local=False, docs_client=None):
         else:
             console.print("[red]Failed to create Google Doc. Use --save-local flag to save as markdown instead.[/red]")
 
+def stream_analysis(analyzer, transcript, save_local=False, docs_client=None, save_topics=True):
+    """
+    Analyze one transcript with streamed generation, displaying (and optionally saving)
+    each topic as soon as it is complete instead of after the whole analysis.
+    Several content focuses are streamed one after another.
+
+    Returns:
+        List of results, one per content focus (tagged with 'focus' when there are several)
+    """
+    header = f"[bold cyan]{transcript['topic']}[/bold cyan] - [green]{transcript['date']}[/green]"
+    console.print(Panel(header, style="bold"))
+
+    tagged = len(analyzer.focuses) > 1
+    results = []
+    for focus in analyzer.focuses:
+        focus_analyzer = analyzer.for_focus(focus) if tagged else analyzer
+        # Same fields save_topic reads from a full result, so docs and manifest entries are kept per focus
+        source = {'id': transcript.get('id'), 'topic': transcript['topic'], 'date': transcript['date']}
+        if tagged:
+            source['focus'] = focus
+            console.print(f"[bold]Focus: {focus}[/bold]\n")
+
+        def on_topic(topic, source=source):
+            console.print(Markdown(topic['content']))
+            console.print()
+            if save_topics:
+                save_topic(source, topic, topic['number'], None, save_local=save_local, docs_client=docs_client)
+
+        result = focus_analyzer.analyze_transcript_stream(transcript, on_topic=on_topic)
+        if tagged:
+            result['focus'] = focus
+        if 'error' in result:
+            display_analysis(result)
+        results.append(result)
+    return results
+
+def display_api_stats():
+    """Show Google API retry and throttling counters when any occurred"""
+    stats = get_api_stats()
+    if not any(s['retries'] or s['throttled_seconds'] or s['failures'] for s in stats.values()):
+        return
+
+    table = Table(title="Google API Usage")
+    table.add_column("API", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Retries", justify="right", style="yellow")
+    table.add_column("Failures", justify="right", style="red")
+    table.add_column("Throttled", justify="right")
+    table.add_column("Backoff", justify="right")
+
+    for api, values in sorted(stats.items()):
+        table.add_row(
+            api,
+            str(int(values['calls'])),
+            str(int(values['retries'])),
+            str(int(values['failures'])),
+            f"{values['throttled_seconds']:.1f}s",
+            f"{values['backoff_seconds']:.1f}s"
+        )
+
+    console.print(table)
+
+def display_compaction_stats(analyzer):
+    """Show how much transcript compaction shrank the prompts"""
+    stats = analyzer.compaction_stats
+    if stats['original_tokens']:
+        ratio = stats['compacted_tokens'] / stats['original_tokens']
+        console.print(
+            f"[dim]Transcript compaction: {stats['original_tokens']:,} → {stats['compacted_tokens']:,} tokens "
+            f"over {stats['transcripts']} transcript(s) ({1 - ratio:.0%} smaller)[/dim]"
+        )
+
+def display_salience_stats(analyzer):
+    """Show how much salience selection shrank long transcripts, against its quality proxies"""
+    stats = analyzer.salience_stats
+    if stats['transcripts']:
+        count = stats['transcripts']
+        console.print(
+            f"[dim]Salience selection: {stats['original_tokens']:,} → {stats['selected_tokens']:,} tokens "
+            f"over {count} long transcript(s) ({1 - stats['selected_tokens'] / stats['original_tokens']:.0%} smaller), "
+            f"keeping {stats['focus_recall'] / count:.0%} of focus-term mentions and "
+            f"{stats['salience_kept'] / count:.0%} of the salience score on average[/dim]"
+        )
+
+def display_digest_stats(analyzer):
+    """Show how many transcript digests were reused and how much smaller they are than the transcripts"""
+    stats = analyzer.digest_stats
+    if stats['transcripts']:
+        dropped = f", {stats['dropped_quotes']} unverifiable quote(s) dropped" if stats['dropped_quotes'] else ""
+        console.print(
+            f"[dim]Transcript digests: {stats['reused']} of {stats['transcripts']} reused from cache; "
+            f"{stats['transcript_tokens']:,} transcript tokens → {stats['digest_tokens']:,} digest tokens{dropped}[/dim]"
+        )
+
+def display_packing_stats(analyzer):
+    """Show how many transcripts shared packed LLM requests"""
+    stats = analyzer.pack_stats
+    if stats['requests']:
+        console.print(
+            f"[dim]Packing: {stats['transcripts']} short transcript(s) in {stats['requests']} request(s), "
+            f"{stats['fallbacks']} re-run individually[/dim]"
+        )
+
+def display_routing_stats(analyzer):
+    """Show how triage routed transcripts between models and the estimated savings"""
+    stats = analyzer.routing_stats
+    if stats['main'] or stats['mid'] or stats['skip']:
+        mid_model = analyzer.mid_analyzer.model if analyzer.mid_analyzer else 'none'
+        console.print(
+            f"[dim]Routing: {stats['main']} to {analyzer.model}, {stats['mid']} to {mid_model}, "
+            f"{stats['skip']} skipped - saved ~{stats['saved_tokens']:,} tokens (~${stats['saved_cost']:.2f}); "
+            f"decisions logged to {analyzer.routing_log_path}[/dim]"
+        )
+
+def display_failover_stats(analyzer):
+    """Show hedged, failed-over and timed-out LLM calls for this run"""
+    if not analyzer.caller:
+        return
+    stats = analyzer.caller.get_stats()
+    if stats['hedged'] or stats['failovers'] or stats['timeouts']:
+        console.print(
+            f"[dim]LLM calls: {stats['hedged']} hedged ({stats['hedge_wins']} won by the backup), "
+            f"{stats['failovers']} failed over, {stats['timeouts']} timed out of {stats['calls']}[/dim]"
+        )
+
+def display_concurrency_stats(analyzer):
+    """Show where adaptive concurrency settled, throughput and time spent throttled"""
+    if not analyzer.limiter:
+        return
+    stats = analyzer.limiter.get_stats()
+    if stats['calls']:
+        console.print(
+            f"[dim]Adaptive concurrency: {stats['limit']} call(s) in flight (peak {stats['peak_limit']}, "
+            f"{stats['decreases']} back-off(s)), {stats['calls_per_minute']:.1f} calls/min, "
+            f"{stats['tokens_per_minute']:,.0f} output tokens/min, {stats['throttled_seconds']:.1f}s throttled by LLM_TPM[/dim]"
+        )
+
+def display_structured_stats(analyzer):
+    """Show how many structured (JSON) responses failed validation and fell back to markdown"""
+    stats = analyzer.structured_stats
+    if stats['responses']:
+        console.print(
+            f"[dim]Structured output: {stats['responses'] - stats['invalid']} of {stats['responses']} "
+            f"JSON response(s) valid[/dim]"
+        )
+
+def display_repair_stats(analyzer):
+    """Show how many analyses needed local fixes or targeted repair requests"""
+    stats = analyzer.repair_stats
+    if not (stats['local_fixes'] or stats['repair_calls'] or stats['dropped'] or stats['unrepaired']):
+        return
+    parts = [f"{stats['local_fixes']} fixed locally"]
+    if stats['repair_calls']:
+        parts.append(f"{stats['repaired']} topic(s) repaired with {stats['repair_calls']} request(s)")
+    if stats['errors']:
+        parts.append(f"[yellow]{stats['errors']} repair request(s) failed (see {analyzer.latency_history.path})[/yellow]")
+    if stats['dropped']:
+        parts.append(f"{stats['dropped']} cut-off topic(s) dropped")
+    if stats['unrepaired']:
+        parts.append(f"{stats['unrepaired']} topic(s) still incomplete")
+    console.print(f"[dim]Output repair: {stats['checked']} analyses checked, {', '.join(parts)}[/dim]")
+
+def display_llm_cache_stats(analyzer):
+    """Show LLM response cache hits and misses, and provider prompt-cache hits, for this run"""
+    prompt_cache = analyzer.prompt_cache_stats
+    if prompt_cache['prompt_tokens']:
+        console.print(
+            f"[dim]Provider prompt cache: {prompt_cache['cached_tokens']:,} of {prompt_cache['prompt_tokens']:,} "
+            f"prompt tokens served from cache over {prompt_cache['calls']} call(s)[/dim]"
+        )
+
+    if not analyzer.cache:
+        return
+
+    stats = analyzer.cache.stats()
+    if stats['hits'] or stats['misses']:
+        console.print(
+            f"[dim]LLM cache: {stats['hits']} hit(s), {stats['misses']} miss(es) "
+            f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries, "
+            f"{stats['bytes'] / (1024 * 1024):.1f} MB[/dim]"
+        )
+
+def display_run_stats(analyzer):
+    """Show every end-of-run counter that was touched: Google API, transcript preparation, LLM calls and cache"""
+    display_api_stats()
+    display_compaction_stats(analyzer)
+    display_salience_stats(analyzer)
+    display_digest_stats(analyzer)
+    display_packing_stats(analyzer)
+    display_routing_stats(analyzer)
+    display_failover_stats(analyzer)
+    display_concurrency_stats(analyzer)
+    display_structured_stats(analyzer)
+    display_repair_stats(analyzer)
+    display_llm_cache_stats(analyzer)
+
+def load_drive_transcripts(docs_client, documents):
+    """Load Drive documents' text and convert them to transcript format for compatibility"""
+    transcripts = []
+    console.print(f"[bold]Loading content from {len(documents)} documents...[/bold]")
+
+    for doc in documents:
+        console.print(f"  → Loading: {doc['name']}")
+        content = docs_client.get_plain_document_content(doc['id'])
+
+        if content:
+            # Parse date from modified time
+            try:
+                dt = datetime.fromisoformat(doc['modified'].replace('Z', '+00:00'))
+                date_str = dt.strftime('%b %d, %Y')
+            except:
+                date_str = doc.get('modified', 'Unknown date')
+
+            transcripts.append({
+                'id': doc['id'],
+                'subject': doc['name'],  # Use document name as subject
+                'topic': doc['name'],
+                'date': date_str,
+                'body': content,
+                'source': 'drive',
+                'folder_path': doc.get('folder_path', '')
+            })
+
+    console.print(f"[green]✓ Loaded {len(transcripts)} documents[/green]\n")
+    return exclude_transcripts(transcripts)
+
+def exclude_transcripts(transcripts):
+    """Drop transcripts matching EXCLUDE_SUBJECTS or EXCLUDE_PEOPLE, reporting how many"""
+    kept = ExclusionFilter().apply(transcripts)
+    if len(kept) < len(transcripts):
+        console.print(f"[dim]Excluded {len(transcripts) - len(kept)} transcript(s) matching EXCLUDE_SUBJECTS / EXCLUDE_PEOPLE[/dim]\n")
+    return kept
+
+def format_duration(seconds):
+    """Format seconds as e.g. '45s', '12m 05s' or '2h 03m'"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {(seconds % 3600) // 60:02d}m"
+
+def display_dry_run(transcripts, analyzer, concurrency=1):
+    """Print projected tokens, cost and ETA for analyzing transcripts (no LLM calls)"""
+    estimate = RunEstimator(analyzer).estimate(transcripts, concurrency=concurrency)
+
+    table = Table(title=f"Dry Run: {analyzer.provider}/{analyzer.model}")
+    table.add_column("#", style="cyan", width=4)
+    table.add_column("Date", style="magenta")
+    table.add_column("Topic", style="green")
+    table.add_column("Calls", justify="right")
+    table.add_column("Input tokens", justify="right")
+    table.add_column("Output tokens", justify="right")
+    table.add_column("Time", justify="right")
+
+    for idx, row in enumerate(estimate['rows'], 1):
+        calls = str(row['calls'])
+        if row['cached_calls']:
+            calls += f" ({row['cached_calls']} cached)"
+        table.add_row(
+            str(idx),
+            row['date'],
+            row['topic'][:60],
+            calls,
+            f"{row['input_tokens']:,}",
+            f"{row['output_tokens']:,}",
+            format_duration(row['seconds'])
+        )
+
+    table.add_section()
+    table.add_row(
+        "", "", "[bold]Total[/bold]",
+        str(estimate['calls']),
+        f"[bold]{estimate['input_tokens']:,}[/bold]",
+        f"[bold]{estimate['output_tokens']:,}[/bold]",
+        ""
+    )
+    console.print(table)
+
+    cost_table = Table(title="Projected Cost by Provider")
+    cost_table.add_column("Provider/Model", style="cyan")
+    cost_table.add_column("Cost (USD)", justify="right")
+    for name, cost in sorted(estimate['costs_by_model'].items(), key=lambda item: item[1]):
+        marker = " ←" if name == f"{analyzer.provider}/{analyzer.model}" else ""
+        cost_table.add_row(name + marker, f"${cost:,.4f}")
+    console.print(cost_table)
+
+    if estimate['selected_cost'] is not None:
+        console.print(f"[bold]Expected cost ({analyzer.model}):[/bold] ${estimate['selected_cost']:,.4f}")
+    else:
+        console.print(f"[yellow]No price known for {analyzer.model}; see the table above for comparable models.[/yellow]")
+
+    source = (f"from {estimate['history_samples']} measured call(s)" if estimate['history_samples'] >= 3
+              else "from default throughput, no latency history yet")
+    console.print(
+        f"[bold]ETA:[/bold] {format_duration(estimate['eta_seconds'])} at concurrency {concurrency} "
+        f"[dim]({source})[/dim]"
+    )
+    console.print("[dim]Token counts are local approximations; no LLM calls were made.[/dim]\n")
+
+def fetch_transcripts(source_mode='gmail', start_date=None, label=None, email_subject=None, folder_id=None):
+    """Fetch and filter transcripts from Gmail or Drive as a batch run would"""
+    if source_mode == 'drive':
+        console.print("[bold]Connecting to Google Drive...[/bold]")
+        drive_client = GoogleDriveClient(folder_id=folder_id)
+        docs_client = GoogleDocsClient()
+        console.print("[green]✓ Connected successfully![/green]\n")
+
+        console.print("[bold]Fetching documents...[/bold]")
+        documents = drive_client.list_documents(modified_after=start_date)
+        transcripts = load_drive_transcripts(docs_client, documents) if documents else []
+    else:
+        console.print("[bold]Connecting to Gmail...[/bold]")
+        gmail = GmailClient(start_date=start_date, label=label)
+        console.print("[green]✓ Connected successfully![/green]\n")
+
+        console.print("[bold]Fetching transcripts...[/bold]")
+        transcripts = exclude_transcripts(gmail.get_transcripts())
+
+        if email_subject:
+            email_subject_lower = email_subject.lower()
+            transcripts = [t for t in transcripts if email_subject_lower in t['subject'].lower() or email_subject_lower in t['topic'].lower()]
+
+    return transcripts
+
+def dry_run(source_mode='gmail', start_date=None, label=None, email_subject=None, folder_id=None, content_focus=None, mode='test', model_override=None, provider_override=None, concurrency=1, cache_mode='use', output_format=None):
+    """Fetch and filter transcripts as a real run would, then estimate the LLM work without calling the model"""
+    display_banner()
+
+    transcripts = fetch_transcripts(source_mode, start_date, label, email_subject, folder_id)
+    if not transcripts:
+        console.print("[yellow]No transcripts found.[/yellow]")
+        return
+
+    analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, connect=False)
+    display_dry_run(transcripts, analyzer, concurrency=concurrency)
+    display_compaction_stats(analyzer)
+    display_salience_stats(analyzer)
+    display_digest_stats(analyzer)
+
+def submit_batch(source_mode='gmail', start_date=None, label=None, email_subject=None, folder_id=None, content_focus=None, mode='test', model_override=None, provider_override=None, cache_mode='use', output_format=None, routing=None):
+    """Submit every transcript's analysis prompt as one provider batch job, to be collected later with --collect"""
+    display_banner()
+
+    transcripts = fetch_transcripts(source_mode, start_date, label, email_subject, folder_id)
+    if not transcripts:
+        console.print("[yellow]No transcripts found.[/yellow]")
+        return
+
+    analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, cache_mode=cache_mode, output_format=output_format, routing=routing, connect=False)
+    store = BatchJobStore()
+
+    requests = analyzer.batch_requests(transcripts)
+    to_submit = [request for request in requests if not request['cached']]
+    mapped = sum(1 for request in requests if request['mapped'])
+    if mapped:
+        console.print(f"[cyan]Extracted {mapped} long transcript(s) in parts now; only their final analysis call is batched.[/cyan]")
+    for result in analyzer.batch_errors:
+        console.print(f"[red]{result['topic']}: {result['error']}[/red]")
+    if not requests:
+        console.print("[yellow]No transcripts left to analyze.[/yellow]")
+        return
+
+    if to_submit:
+        try:
+            provider = get_batch_provider(batch_provider_name(analyzer.provider), store.directory)
+        except (ValueError, ImportError) as e:
+            console.print(f"[red]Cannot submit a batch job for {analyzer.provider}/{analyzer.model}: {str(e)}[/red]")
+            console.print("[yellow]Set BATCH_PROVIDER=local to use the local stand-in, or choose an OpenAI or Anthropic model.[/yellow]")
+            return
+        console.print(f"[bold]Submitting {len(to_submit)} request(s) to the {provider.name} batch API...[/bold]")
+        job_id = provider.submit(to_submit, analyzer.model)
+        provider_name = provider.name
+    else:
+        # Every response is already cached; --collect saves them without a provider job
+        job_id = f"cached-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        provider_name = 'cache'
+
+    store.create(provider_name, job_id, analyzer.provider, analyzer.model, requests,
+                 content_focus=analyzer.content_focus, output_format=analyzer.output_format)
+
+    console.print(f"[green]✓ Batch job {job_id} submitted: {len(to_submit)} request(s), "
+                  f"{len(requests) - len(to_submit)} already cached[/green]")
+    console.print(f"[cyan]Run 'python cli.py --collect {job_id}' (or just --collect) once the job has completed.[/cyan]")
+    display_routing_stats(analyzer)
+    display_compaction_stats(analyzer)
+    display_salience_stats(analyzer)
+    display_digest_stats(analyzer)
+
+def collect_batches(job_id=None, combined_topics=False, save_local=False, cache_mode='use'):
+    """Fetch finished batch jobs and save their analyses like a normal run"""
+    display_banner()
+
+    store = BatchJobStore()
+    if job_id:
+        job = store.load(job_id)
+        if not job:
+            console.print(f"[red]Unknown batch job: {job_id}[/red]")
+            return
+        jobs = [job]
+    else:
+        jobs = store.pending()
+    if not jobs:
+        console.print("[yellow]No batch jobs waiting to be collected.[/yellow]")
+        return
+
+    docs_client = None if save_local else GoogleDocsClient()
+
+    for job in jobs:
+        settings = job['settings']
+        analyzer = ContentAnalyzer(content_focus=settings['content_focus'], model_override=job['model'], provider_override=job['provider'], cache_mode=cache_mode, output_format=settings['output_format'], compact=False, routing=False, connect=False)
+
+        if job['batch_provider'] == 'cache':
+            responses = {}
+        else:
+            provider = get_batch_provider(job['batch_provider'], store.directory)
+            status = provider.status(job['job_id'])
+            if status == IN_PROGRESS and isinstance(provider, LocalBatchProvider):
+                # The local stand-in has no backend of its own: run the job now
+                console.print(f"[cyan]Running local batch job {job['job_id']}...[/cyan]")
+                analyzer._init_client()
+                provider.run(job['job_id'], analyzer.client.generate)
+                status = provider.status(job['job_id'])
+            if status == IN_PROGRESS:
+                console.print(f"[yellow]Batch job {job['job_id']} is still processing (submitted {job['submitted_at']}).[/yellow]")
+                continue
+            if status == FAILED:
+                console.print(f"[red]Batch job {job['job_id']} failed or expired; submit it again.[/red]")
+                job['status'] = 'failed'
+                store.save(job)
+                continue
+            responses = provider.results(job['job_id'])
+
+        console.print(f"\n[bold]Collecting batch job {job['job_id']} ({len(job['requests'])} transcript(s))...[/bold]")
+        saved = 0
+        for request in job['requests']:
+            missing = None if request['cached'] else 'missing from batch output'
+            response, error = responses.get(request['custom_id'], (None, missing))
+            result = analyzer.batch_result(request, response, error)
+            if 'error' in result:
+                console.print(f"[red]{result['topic']}: {result['error']}[/red]")
+                continue
+            save_analysis(result, save_local=save_local, docs_client=docs_client, combined_topics=combined_topics)
+            saved += 1
+
+        job['status'] = 'collected'
+        job['collected_at'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        store.save(job)
+        console.print(f"[green]✓ Saved {saved} of {len(job['requests'])} analyses from batch job {job['job_id']}[/green]")
+        display_structured_stats(analyzer)
+        display_repair_stats(analyzer)
+
+def display_call_ledger(days=30):
+    """Report LLM calls from the ledger aggregated by day, model, content focus and transcript"""
+    history = LatencyHistory()
+    since = time.time() - days * 86400 if days else None
+    entries = history.entries(since=since)
+    if not entries:
+        console.print(f"[yellow]No LLM calls recorded in {history.path}{f' in the last {days} days' if days else ''}.[/yellow]")
+        return
+
+    period = f"last {days} days" if days else "all time"
+    console.print(f"\n[bold]LLM calls ({period}, {len(entries):,} entries in {history.path})[/bold]")
+
+    groupings = [
+        ('By day', lambda e: datetime.fromtimestamp(e['ts']).strftime('%Y-%m-%d'), None),
+        ('By model', lambda e: f"{e['provider']}/{e['model']}", None),
+        ('By content focus', lambda e: e.get('focus'), None),
+        ('Top transcripts by cost', lambda e: e.get('topic') or e.get('transcript'), 10),
+    ]
+    for title, key, limit in groupings:
+        rows = summarize_calls(entries, key)
+        if title == 'By day':
+            rows.sort(key=lambda row: row['key'])
+        table = Table(title=title, show_header=True, header_style="bold magenta", title_justify="left")
+        table.add_column(title.split()[-1].capitalize() if title.startswith('By') else "Transcript",
+                         min_width=16, max_width=32, no_wrap=True, overflow="ellipsis")
+        for column in ("Calls", "Cached", "Errors", "Retries", "In tok", "Out tok", "Cost", "p50 s", "p95 s"):
+            table.add_column(column, justify="right", no_wrap=True)
+        for row in rows[:limit]:
+            table.add_row(
+                str(row['key']), str(row['calls']), str(row['cache_hits']), str(row['errors']), str(row['retries']),
+                f"{row['prompt_tokens']:,}", f"{row['completion_tokens']:,}", f"${row['cost']:.2f}",
+                f"{row['p50']:.1f}" if row['p50'] is not None else "-",
+                f"{row['p95']:.1f}" if row['p95'] is not None else "-"
+            )
+        console.print()
+        console.print(table)
+
+    console.print("\n[dim]Costs are estimates at list prices; cached = served from the LLM response cache.[/dim]\n")
+
 def get_start_date() -> str:
     """Prompt for start date if not in environment"""
     start_date = os.getenv('START_DATE', '').strip()
@@ -343,7 +935,7 @@ def get_start_date() -> str:
 
     return start_date
 
-def batch_process_drive(folder_id=None, name_pattern=None, modified_after=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None):
+def batch_process_drive(folder_id=None, name_pattern=None, modified_after=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None, concurrency=1, cache_mode='use', stream=False, pack=None, output_format=None, routing=None, adaptive=None):
     """Batch process all Google Drive documents (non-interactive mode)"""
     display_banner()
 
@@ -375,57 +967,42 @@ def batch_process_drive(folder_id=None, name_pattern=None, modified_after=None,
             console.print("[yellow]No documents found.[/yellow]")
             return
 
-        # Convert Drive documents to transcript format for compatibility
-        transcripts = []
-        console.print(f"[bold]Loading content from {len(documents)} documents...[/bold]")
-
-        for doc in documents:
-            console.print(f"  → Loading: {doc['name']}")
-            content = docs_client.get_plain_document_content(doc['id'])
-
-            if content:
-                # Parse date from modified time
-                try:
-                    dt = datetime.fromisoformat(doc['modified'].replace('Z', '+00:00'))
-                    date_str = dt.strftime('%b %d, %Y')
-                except:
-                    date_str = doc.get('modified', 'Unknown date')
-
-                transcripts.append({
-                    'id': doc['id'],
-                    'subject': doc['name'],
-                    'topic': doc['name'],
-                    'date': date_str,
-                    'body': content,
-                    'source': 'drive',
-                    'folder_path': doc.get('folder_path', '')
-                })
-
-        console.print(f"[green]✓ Loaded {len(transcripts)} documents[/green]\n")
+        transcripts = load_drive_transcripts(docs_client, documents)
 
         console.print(f"[bold cyan]Batch Mode:[/bold cyan] Processing {len(transcripts)} documents...\n")
 
-        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override)
+        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive, pack=pack)
         results = []
 
-        for idx, transcript in enumerate(transcripts, 1):
-            console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
-            result = analyzer.analyze_transcript(transcript)
-            results.append(result)
+        # Streaming saves each topic as it completes; it runs one transcript at a time
+        streamed = stream and analyzer.concurrency == 1 and not analyzer.limiter
+        if streamed:
+            for idx, transcript in enumerate(transcripts, 1):
+                console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
+                results.extend(stream_analysis(analyzer, transcript, save_local=save_local, docs_client=docs_client, save_topics=not combined_topics))
+        else:
+            analyses = analyzer.iter_analyze(transcripts)
+            for idx, transcript in enumerate(transcripts, 1):
+                console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
+                results.extend(next_results(analyzer, analyses))
 
         # Auto-save results
         if results:
-            console.print("\n[cyan]Saving results...[/cyan]")
-            for result in results:
-                save_analysis(result, save_local=save_local, docs_client=docs_client, combined_topics=combined_topics)
-            console.print(f"\n[green]✓ Successfully processed and saved {len(results)} documents![/green]")
+            if not streamed or combined_topics:
+                console.print("\n[cyan]Saving results...[/cyan]")
+                for result in results:
+                    save_analysis(result, save_local=save_local, docs_client=docs_client, combined_topics=combined_topics)
+            focuses = f" for {len(analyzer.focuses)} focuses" if len(analyzer.focuses) > 1 else ""
+            console.print(f"\n[green]✓ Successfully processed and saved {len(transcripts)} documents{focuses}![/green]")
+
+        display_run_stats(analyzer)
 
     except Exception as e:
         console.print(f"[red]Error during batch processing: {str(e)}[/red]")
         import traceback
         console.print(traceback.format_exc())
 
-def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None):
+def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None, concurrency=1, cache_mode='use', output_format=None, routing=None, adaptive=None):
     """Display the main menu and handle user interaction for Drive mode"""
     display_banner()
 
@@ -459,35 +1036,9 @@ def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, sepa
             console.print("[yellow]No documents found in the folder. Exiting.[/yellow]")
             return
 
-        # Convert Drive documents to transcript format for compatibility
-        transcripts = []
-        console.print(f"[bold]Loading content from {len(documents)} documents...[/bold]")
-
-        for doc in documents:
-            console.print(f"  → Loading: {doc['name']}")
-            content = docs_client.get_plain_document_content(doc['id'])
+        transcripts = load_drive_transcripts(docs_client, documents)
 
-            if content:
-                # Parse date from modified time
-                try:
-                    dt = datetime.fromisoformat(doc['modified'].replace('Z', '+00:00'))
-                    date_str = dt.strftime('%b %d, %Y')
-                except:
-                    date_str = doc.get('modified', 'Unknown date')
-
-                transcripts.append({
-                    'id': doc['id'],
-                    'subject': doc['name'],  # Use document name as subject
-                    'topic': doc['name'],
-                    'date': date_str,
-                    'body': content,
-                    'source': 'drive',
-                    'folder_path': doc.get('folder_path', '')
-                })
-
-        console.print(f"[green]✓ Loaded {len(transcripts)} documents[/green]\n")
-
-        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override)
+        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive)
 
         while True:
             display_transcripts(transcripts)
@@ -509,14 +1060,16 @@ def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, sepa
                 console.print(f"\n[bold]Analyzing {len(transcripts)} documents...[/bold]\n")
 
                 results = []
+                analyses = analyzer.iter_analyze(transcripts)
                 for idx, transcript in enumerate(transcripts, 1):
                     console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
-                    result = analyzer.analyze_transcript(transcript)
-                    display_analysis(result)
-                    results.append(result)
+                    for result in next_results(analyzer, analyses):
+                        display_analysis(result)
+                        results.append(result)
 
                     if idx < len(transcripts):
                         if not Confirm.ask("Continue to next document?", default=True):
+                            analyses.close()
                             break
 
                 # Save results - either combined or separate files
@@ -532,10 +1085,10 @@ def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, sepa
                 console.print(f"\n[bold cyan]Batch Mode:[/bold cyan] Processing {len(transcripts)} documents...\n")
 
                 results = []
+                analyses = analyzer.iter_analyze(transcripts)
                 for idx, transcript in enumerate(transcripts, 1):
                     console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
-                    result = analyzer.analyze_transcript(transcript)
-                    results.append(result)
+                    results.extend(next_results(analyzer, analyses))
 
                 # Auto-save results
                 if results:
@@ -552,14 +1105,16 @@ def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, sepa
                     start, end = map(int, range_input.split('-'))
                     if 1 <= start <= end <= len(transcripts):
                         results = []
+                        analyses = analyzer.iter_analyze(transcripts[start - 1:end])
                         for idx in range(start - 1, end):
                             console.print(f"\n[cyan]Analyzing: {transcripts[idx]['topic']}[/cyan]")
-                            result = analyzer.analyze_transcript(transcripts[idx])
-                            display_analysis(result)
-                            results.append(result)
+                            for result in next_results(analyzer, analyses):
+                                display_analysis(result)
+                                results.append(result)
 
                             if idx < end - 1:
                                 if not Confirm.ask("Continue to next document?", default=True):
+                                    analyses.close()
                                     break
 
                         # Save results - either combined or separate files
@@ -581,11 +1136,14 @@ def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, sepa
                     transcript = transcripts[idx]
                     console.print(f"\n[bold cyan]Analyzing: {transcript['topic']}[/bold cyan]\n")
 
-                    result = analyzer.analyze_transcript(transcript)
-                    display_analysis(result)
+                    # One result per content focus
+                    results = analyzer.batch_analyze([transcript])
+                    for result in results:
+                        display_analysis(result)
 
                     if Confirm.ask("Save this analysis?", default=True):
-                        save_analysis(result, combined_topics=combined_topics)
+                        for result in results:
+                            save_analysis(result, combined_topics=combined_topics)
                 else:
                     console.print("[red]Invalid number. Please try again.[/red]")
 
@@ -605,7 +1163,7 @@ def main_menu_drive(folder_id=None, name_pattern=None, modified_after=None, sepa
         import traceback
         console.print(traceback.format_exc())
 
-def batch_process_all(start_date=None, label=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None):
+def batch_process_all(start_date=None, label=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None, concurrency=1, cache_mode='use', stream=False, pack=None, output_format=None, routing=None, adaptive=None):
     """Batch process all emails matching criteria (non-interactive mode)"""
     display_banner()
 
@@ -631,7 +1189,7 @@ def batch_process_all(start_date=None, label=None, separate_files=False, combine
         console.print(f"[cyan]AI Mode: {mode_display}[/cyan]\n")
 
         console.print("[bold]Fetching transcripts...[/bold]")
-        transcripts = gmail.get_transcripts()
+        transcripts = exclude_transcripts(gmail.get_transcripts())
 
         if not transcripts:
             console.print("[yellow]No transcripts found.[/yellow]")
@@ -639,27 +1197,38 @@ def batch_process_all(start_date=None, label=None, separate_files=False, combine
 
         console.print(f"[bold cyan]Batch Mode:[/bold cyan] Processing {len(transcripts)} transcripts...\n")
 
-        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override)
+        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive, pack=pack)
         results = []
 
-        for idx, transcript in enumerate(transcripts, 1):
-            console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
-            result = analyzer.analyze_transcript(transcript)
-            results.append(result)
+        # Streaming saves each topic as it completes; it runs one transcript at a time
+        streamed = stream and analyzer.concurrency == 1 and not analyzer.limiter
+        if streamed:
+            for idx, transcript in enumerate(transcripts, 1):
+                console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
+                results.extend(stream_analysis(analyzer, transcript, save_local=save_local, docs_client=docs_client, save_topics=not combined_topics))
+        else:
+            analyses = analyzer.iter_analyze(transcripts)
+            for idx, transcript in enumerate(transcripts, 1):
+                console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
+                results.extend(next_results(analyzer, analyses))
 
         # Auto-save results
         if results:
-            console.print("\n[cyan]Saving results...[/cyan]")
-            for result in results:
-                save_analysis(result, save_local=save_local, docs_client=docs_client, combined_topics=combined_topics)
-            console.print(f"\n[green]✓ Successfully processed and saved {len(results)} transcripts![/green]")
+            if not streamed or combined_topics:
+                console.print("\n[cyan]Saving results...[/cyan]")
+                for result in results:
+                    save_analysis(result, save_local=save_local, docs_client=docs_client, combined_topics=combined_topics)
+            focuses = f" for {len(analyzer.focuses)} focuses" if len(analyzer.focuses) > 1 else ""
+            console.print(f"\n[green]✓ Successfully processed and saved {len(transcripts)} transcripts{focuses}![/green]")
+
+        display_run_stats(analyzer)
 
     except Exception as e:
         console.print(f"[red]Error during batch processing: {str(e)}[/red]")
         import traceback
         console.print(traceback.format_exc())
 
-def main_menu(label=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None):
+def main_menu(label=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None, concurrency=1, cache_mode='use', output_format=None, routing=None, adaptive=None):
     """Display the main menu and handle user interaction"""
     display_banner()
 
@@ -688,13 +1257,13 @@ def main_menu(label=None, separate_files=False, combined_topics=False, content_f
         console.print(f"[cyan]AI Mode: {mode_display}[/cyan]\n")
 
         console.print("[bold]Fetching transcripts...[/bold]")
-        transcripts = gmail.get_transcripts()
+        transcripts = exclude_transcripts(gmail.get_transcripts())
 
         if not transcripts:
             console.print("[yellow]No transcripts found. Exiting.[/yellow]")
             return
 
-        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override)
+        analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive)
 
         while True:
             display_transcripts(transcripts)
@@ -716,14 +1285,16 @@ def main_menu(label=None, separate_files=False, combined_topics=False, content_f
                 console.print(f"\n[bold]Analyzing {len(transcripts)} transcripts...[/bold]\n")
 
                 results = []
+                analyses = analyzer.iter_analyze(transcripts)
                 for idx, transcript in enumerate(transcripts, 1):
                     console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
-                    result = analyzer.analyze_transcript(transcript)
-                    display_analysis(result)
-                    results.append(result)
+                    for result in next_results(analyzer, analyses):
+                        display_analysis(result)
+                        results.append(result)
 
                     if idx < len(transcripts):
                         if not Confirm.ask("Continue to next transcript?", default=True):
+                            analyses.close()
                             break
 
                 # Save results - either combined or separate files
@@ -739,10 +1310,10 @@ def main_menu(label=None, separate_files=False, combined_topics=False, content_f
                 console.print(f"\n[bold cyan]Batch Mode:[/bold cyan] Processing {len(transcripts)} transcripts...\n")
 
                 results = []
+                analyses = analyzer.iter_analyze(transcripts)
                 for idx, transcript in enumerate(transcripts, 1):
                     console.print(f"[cyan]Analyzing {idx}/{len(transcripts)}: {transcript['topic']}[/cyan]")
-                    result = analyzer.analyze_transcript(transcript)
-                    results.append(result)
+                    results.extend(next_results(analyzer, analyses))
 
                 # Auto-save results
                 if results:
@@ -759,14 +1330,16 @@ def main_menu(label=None, separate_files=False, combined_topics=False, content_f
                     start, end = map(int, range_input.split('-'))
                     if 1 <= start <= end <= len(transcripts):
                         results = []
+                        analyses = analyzer.iter_analyze(transcripts[start - 1:end])
                         for idx in range(start - 1, end):
                             console.print(f"\n[cyan]Analyzing: {transcripts[idx]['topic']}[/cyan]")
-                            result = analyzer.analyze_transcript(transcripts[idx])
-                            display_analysis(result)
-                            results.append(result)
+                            for result in next_results(analyzer, analyses):
+                                display_analysis(result)
+                                results.append(result)
 
                             if idx < end - 1:
                                 if not Confirm.ask("Continue to next transcript?", default=True):
+                                    analyses.close()
                                     break
 
                         # Save results - either combined or separate files
@@ -788,11 +1361,14 @@ def main_menu(label=None, separate_files=False, combined_topics=False, content_f
                     transcript = transcripts[idx]
                     console.print(f"\n[bold cyan]Analyzing: {transcript['topic']}[/bold cyan]\n")
 
-                    result = analyzer.analyze_transcript(transcript)
-                    display_analysis(result)
+                    # One result per content focus
+                    results = analyzer.batch_analyze([transcript])
+                    for result in results:
+                        display_analysis(result)
 
                     if Confirm.ask("Save this analysis?", default=True):
-                        save_analysis(result, combined_topics=combined_topics)
+                        for result in results:
+                            save_analysis(result, combined_topics=combined_topics)
                 else:
                     console.print("[red]Invalid number. Please try again.[/red]")
 
@@ -831,7 +1407,7 @@ def list_emails_only(start_date=None, label=None):
     display_transcripts(transcripts)
 
 
-def analyze_specific_email(email_subject, start_date=None, label=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None, auto_confirm=False):
+def analyze_specific_email(email_subject, start_date=None, label=None, separate_files=False, combined_topics=False, content_focus=None, save_local=False, mode='test', model_override=None, provider_override=None, auto_confirm=False, concurrency=1, cache_mode='use', stream=False, output_format=None, routing=None, adaptive=None):
     """Analyze a specific email by subject line (supports partial matching)"""
     console.print("[bold]Connecting to Gmail...[/bold]")
     gmail = GmailClient(start_date=start_date, label=label)
@@ -851,7 +1427,7 @@ def analyze_specific_email(email_subject, start_date=None, label=None, separate_
     console.print(f"[cyan]AI Mode: {mode_display}[/cyan]\n")
 
     console.print("[bold]Fetching transcripts...[/bold]")
-    transcripts = gmail.get_transcripts()
+    transcripts = exclude_transcripts(gmail.get_transcripts())
 
     if not transcripts:
         console.print("[yellow]No transcripts found.[/yellow]")
@@ -876,17 +1452,19 @@ def analyze_specific_email(email_subject, start_date=None, label=None, separate_
         if choice.lower() == 'all':
             console.print(f"\n[bold]Analyzing all {len(matches)} matching transcripts...[/bold]\n")
 
-            analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override)
+            analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive)
 
             results = []
+            analyses = analyzer.iter_analyze(matches)
             for idx, transcript in enumerate(matches, 1):
                 console.print(f"[cyan]Analyzing {idx}/{len(matches)}: {transcript['topic']}[/cyan]")
-                result = analyzer.analyze_transcript(transcript)
-                display_analysis(result)
-                results.append(result)
+                for result in next_results(analyzer, analyses):
+                    display_analysis(result)
+                    results.append(result)
 
                 if idx < len(matches):
                     if not Confirm.ask("Continue to next transcript?", default=True):
+                        analyses.close()
                         break
 
             # Save results - either combined or separate files
@@ -915,13 +1493,25 @@ def analyze_specific_email(email_subject, start_date=None, label=None, separate_
     # Analyze the selected transcript
     console.print(f"\n[bold cyan]Analyzing: {transcript['topic']}[/bold cyan]\n")
 
-    analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override)
-    result = analyzer.analyze_transcript(transcript)
-    display_analysis(result)
+    analyzer = ContentAnalyzer(content_focus=content_focus, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive)
+
+    if stream:
+        # With --yes each topic is saved as soon as it is generated
+        save_topics = auto_confirm and not combined_topics
+        results = [result for result in stream_analysis(analyzer, transcript, save_local=save_local, save_topics=save_topics)
+                   if 'error' not in result]
+        if save_topics or not results:
+            return
+    else:
+        # One result per content focus
+        results = analyzer.batch_analyze([transcript])
+        for result in results:
+            display_analysis(result)
 
     # Auto-confirm in non-interactive mode, otherwise prompt
     if auto_confirm or Confirm.ask("Save this analysis?", default=True):
-        save_analysis(result, save_local=save_local, combined_topics=combined_topics)
+        for result in results:
+            save_analysis(result, save_local=save_local, combined_topics=combined_topics)
 
 
 if __name__ == "__main__":
@@ -946,10 +1536,22 @@ Examples:
   python cli.py --list --label "AIQ"      # List emails with label "AIQ"
   python cli.py --email "Meeting" --label "Priority"  # Analyze with label filter
   python cli.py --focus "DevOps best practices" --combined-topics  # Combine flags
+  python cli.py --batch --focus "AI strategy" "product management" "DevOps"  # Several focuses in one run
   python cli.py --source drive --mode production  # Drive mode with Qwen 2.5 32B
   python cli.py --source drive --fast     # Drive mode with fast Gemini 2.5 Flash
   python cli.py --source drive --model claude-3-opus-20240229  # Drive mode with custom model
   python cli.py --source drive --combined-topics  # Drive mode, combined topics per transcript
+  python cli.py --batch --concurrency 4   # Analyze 4 transcripts in parallel
+  python cli.py --batch --refresh         # Regenerate instead of using cached LLM responses
+  python cli.py --batch --structured      # Compact JSON output rendered locally to markdown
+  python cli.py --stats                   # LLM cost/latency report from the call ledger
+  python cli.py --submit-batch            # Overnight backfill via the provider's batch API
+  python cli.py --collect                 # Save results of finished batch jobs
+  python cli.py --batch --adaptive        # Find the fastest sustainable number of parallel LLM calls
+  python cli.py --batch --route           # Triage first: skip off-topic, borderline to ROUTE_MID_MODEL
+  python cli.py --batch --pack            # Share LLM requests between short transcripts
+  python cli.py --batch --stream          # Save each topic as soon as it is generated
+  python cli.py --batch --dry-run         # Estimate tokens, cost and time without calling the LLM
         """
     )
     parser.add_argument(
@@ -996,7 +1598,9 @@ Examples:
     )
     parser.add_argument(
         '--focus',
-        help='Content focus for article generation (default: AI strategy and innovation for business leaders)'
+        nargs='+',
+        help='Content focus for article generation (default: AI strategy and innovation for business leaders). '
+             'Give several to analyze each transcript for every focus in one run, with output tagged per focus'
     )
     parser.add_argument(
         '--source',
@@ -1020,14 +1624,80 @@ Examples:
     )
     parser.add_argument(
         '--provider',
-        choices=['qwen', 'anthropic', 'openai', 'google'],
-        help='AI provider to use with --model (qwen, anthropic, openai, or google). Auto-detected if not specified.'
+        choices=['qwen', 'anthropic', 'openai', 'google', 'fake'],
+        help='AI provider to use with --model (qwen, anthropic, openai, google, or fake for the offline stand-in). Auto-detected if not specified.'
     )
     parser.add_argument(
         '--fast',
         action='store_true',
         help='Use fast mode with Gemini 2.5 Flash for interactive sessions (300+ tok/s). Default uses Qwen 2.5 32B (free, local, ~11 tok/s).'
     )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=None,
+        help='Number of transcripts to analyze in parallel in batch/all/range runs (default: LLM_CONCURRENCY env or 1)'
+    )
+    parser.add_argument(
+        '--stats',
+        nargs='?',
+        const=30,
+        type=int,
+        metavar='DAYS',
+        help='Report LLM calls, tokens, latency and estimated cost by day, model, focus and transcript for the last DAYS days (default: 30; 0 for all) and exit'
+    )
+    parser.add_argument(
+        '--submit-batch',
+        action='store_true',
+        help='Submit all matching transcripts as one provider batch job (cheaper, no rate limits) and exit; save results later with --collect'
+    )
+    parser.add_argument(
+        '--collect',
+        nargs='?',
+        const='all',
+        metavar='JOB_ID',
+        help='Fetch finished batch jobs (all pending, or JOB_ID) and save their analyses'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Adapt parallel LLM calls to provider feedback, starting at --concurrency: grow while healthy, back off on 429s, timeouts and latency spikes (default: LLM_ADAPTIVE_CONCURRENCY env)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the LLM response cache (always call the model, store nothing)'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached LLM responses and regenerate, updating the cache'
+    )
+    parser.add_argument(
+        '--structured',
+        action='store_true',
+        help='Ask the model for compact JSON, validated and rendered to the usual markdown locally (default: OUTPUT_FORMAT env)'
+    )
+    parser.add_argument(
+        '--route',
+        action='store_true',
+        help='Score transcripts locally first: skip off-topic ones, send borderline ones to ROUTE_MID_MODEL (default: ROUTING env)'
+    )
+    parser.add_argument(
+        '--pack',
+        action='store_true',
+        help='Batch mode: analyze several short transcripts per LLM request (default: PACK_TRANSCRIPTS env)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream LLM output and show/save each topic as soon as it is generated (--batch and --email runs, concurrency 1)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Fetch and filter transcripts, then print projected tokens, cost and ETA without making any LLM calls'
+    )
     parser.add_argument(
         '--select-all',
         action='store_true',
@@ -1045,13 +1715,20 @@ Examples:
         label = args.label
         separate_files = args.separate_files
         combined_topics = args.combined_topics  # Combine topics in one file
-        content_focus = args.focus
+        # One focus as a string; several as a list, analyzed together (see ContentAnalyzer._iter_focuses)
+        content_focus = (args.focus if len(args.focus) > 1 else args.focus[0]) if args.focus else None
         folder_id = args.folder_id  # For Drive mode
         save_local = args.save_local  # Save as markdown instead of Google Doc
         auto_confirm = args.yes  # Auto-confirm all prompts (non-interactive mode)
         mode = args.mode  # AI mode: test or production
         model_override = args.model  # Specific model override
         provider_override = args.provider  # Specific provider override
+        concurrency = args.concurrency or int(os.getenv('LLM_CONCURRENCY', '1') or 1)  # Parallel LLM calls
+        cache_mode = 'off' if args.no_cache else ('refresh' if args.refresh else 'use')  # LLM response cache
+        pack = True if args.pack else None  # Pack short transcripts (None: PACK_TRANSCRIPTS env)
+        output_format = 'json' if args.structured else None  # Structured output (None: OUTPUT_FORMAT env)
+        routing = True if args.route else None  # Triage routing (None: ROUTING env)
+        adaptive = True if args.adaptive else None  # Adaptive LLM concurrency (None: LLM_ADAPTIVE_CONCURRENCY env)
 
         # Handle fast mode - override model if --fast is specified and no explicit model given
         if args.fast and not model_override:
@@ -1063,8 +1740,54 @@ Examples:
             args.batch = True
             auto_confirm = True  # Also auto-confirm to avoid any prompts
 
+        if isinstance(content_focus, list) and (args.dry_run or args.submit_batch):
+            console.print(f"[yellow]--dry-run and --submit-batch use one focus: '{content_focus[0]}'[/yellow]")
+            content_focus = content_focus[0]
+
         # Route to appropriate mode
-        if source_mode == 'drive':
+        if args.stats is not None:
+            display_call_ledger(days=args.stats)
+        elif args.dry_run:
+            dry_run(
+                source_mode=source_mode,
+                start_date=start_date,
+                label=label,
+                email_subject=args.email,
+                folder_id=folder_id,
+                content_focus=content_focus,
+                mode=mode,
+                model_override=model_override,
+                provider_override=provider_override,
+                concurrency=concurrency,
+                cache_mode=cache_mode,
+                output_format=output_format
+            )
+
+        elif args.submit_batch:
+            submit_batch(
+                source_mode=source_mode,
+                start_date=start_date,
+                label=label,
+                email_subject=args.email,
+                folder_id=folder_id,
+                content_focus=content_focus,
+                mode=mode,
+                model_override=model_override,
+                provider_override=provider_override,
+                cache_mode=cache_mode,
+                output_format=output_format,
+                routing=routing
+            )
+
+        elif args.collect:
+            collect_batches(
+                job_id=None if args.collect == 'all' else args.collect,
+                combined_topics=combined_topics,
+                save_local=save_local,
+                cache_mode=cache_mode
+            )
+
+        elif source_mode == 'drive':
             # Drive mode - Gmail-specific flags are ignored
             if args.list or args.email or label:
                 console.print("[yellow]Warning: --list, --email, and --label flags are only for Gmail mode and will be ignored in Drive mode[/yellow]\n")
@@ -1081,7 +1804,14 @@ Examples:
                     save_local=save_local,
                     mode=mode,
                     model_override=model_override,
-                    provider_override=provider_override
+                    provider_override=provider_override,
+                    concurrency=concurrency,
+                    cache_mode=cache_mode,
+                    output_format=output_format,
+                    routing=routing,
+                    adaptive=adaptive,
+                    stream=args.stream,
+                    pack=pack
                 )
             else:
                 # Interactive Drive mode
@@ -1094,7 +1824,12 @@ Examples:
                     save_local=save_local,
                     mode=mode,
                     model_override=model_override,
-                    provider_override=provider_override
+                    provider_override=provider_override,
+                    concurrency=concurrency,
+                    cache_mode=cache_mode,
+                    output_format=output_format,
+                    routing=routing,
+                    adaptive=adaptive
                 )
 
         else:
@@ -1110,15 +1845,15 @@ Examples:
             elif args.email:
                 # Direct email analysis mode
                 display_banner()
-                analyze_specific_email(args.email, start_date, label, separate_files, combined_topics, content_focus, save_local, mode, model_override, provider_override, auto_confirm)
+                analyze_specific_email(args.email, start_date, label, separate_files, combined_topics, content_focus, save_local, mode, model_override, provider_override, auto_confirm, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive, stream=args.stream)
 
             elif args.batch:
                 # Batch mode - process all emails matching criteria
-                batch_process_all(start_date=start_date, label=label, separate_files=separate_files, combined_topics=combined_topics, content_focus=content_focus, save_local=save_local, mode=mode, model_override=model_override, provider_override=provider_override)
+                batch_process_all(start_date=start_date, label=label, separate_files=separate_files, combined_topics=combined_topics, content_focus=content_focus, save_local=save_local, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive, stream=args.stream, pack=pack)
 
             else:
                 # Interactive mode (default)
-                main_menu(label=label, separate_files=separate_files, combined_topics=combined_topics, content_focus=content_focus, save_local=save_local, mode=mode, model_override=model_override, provider_override=provider_override)
+                main_menu(label=label, separate_files=separate_files, combined_topics=combined_topics, content_focus=content_focus, save_local=save_local, mode=mode, model_override=model_override, provider_override=provider_override, concurrency=concurrency, cache_mode=cache_mode, output_format=output_format, routing=routing, adaptive=adaptive)
 
     except KeyboardInterrupt:
         console.print("\n\n[bold blue]Thanks for using Qwilo. If you have improvement ideas, please email them to stephen@synaptiq.ai :)[/bold blue]\n")
@@ -0,0 +1,178 @@
+import os
+import time
+import random
+import threading
+from typing import Callable, Dict, Optional
+from api_executor import TokenBucket
+
+# Latency (seconds per completion token) this many times the healthy baseline counts as a spike
+LATENCY_SPIKE_FACTOR = 2.0
+# Successful calls needed before latency spikes are judged against the baseline
+MIN_BASELINE_SAMPLES = 5
+# Retries of a rate-limited call, and the cap on the wait between them
+RATE_LIMIT_RETRIES = 3
+RETRY_MAX_DELAY = 30.0
+# Completion tokens assumed for very short responses when normalizing latency
+MIN_LATENCY_TOKENS = 50
+
+
+def parse_tpm(value: str, provider: str) -> Optional[float]:
+    """
+    Tokens-per-minute budget for a provider from LLM_TPM.
+
+    Accepts a bare number for every provider or 'provider:tpm' pairs,
+    e.g. "anthropic:40000,openai:200000". Returns None when unlimited.
+    """
+    default = None
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, budget = item.rpartition(':')
+        try:
+            budget = float(budget)
+        except ValueError:
+            continue
+        if not name:
+            default = budget
+        elif name.strip().lower() == provider:
+            return budget or None
+    return default or None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for provider rate-limit (429) errors; these are safe to retry after backing off"""
+    status = getattr(error, 'status_code', None) or getattr(error, 'status', None)
+    if status == 429:
+        return True
+    message = str(error).lower()
+    return 'ratelimit' in type(error).__name__.lower() or '429' in message or 'rate limit' in message
+
+
+def is_overload_error(error: Exception) -> bool:
+    """True for rate-limit and timeout errors, which mean the provider is saturated"""
+    return isinstance(error, TimeoutError) or 'timeout' in type(error).__name__.lower() or is_rate_limit_error(error)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on LLM calls in flight, with an optional tokens-per-minute budget.
+
+    Each healthy call raises the limit by 1/limit (about +1 per round of
+    calls); a rate-limit error, timeout or latency spike halves it, at most
+    once per typical call duration so one burst of failures counts once.
+    Latency is compared per completion token against a smoothed baseline of
+    healthy calls, so long answers aren't mistaken for overload.
+    """
+
+    def __init__(
+        self,
+        initial: int = 1,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        tpm: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or int(os.getenv('LLM_MAX_CONCURRENCY', '8')))
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.bucket = TokenBucket(tpm / 60.0, tpm, clock) if tpm else None
+        self._clock = clock
+        self._sleep = sleep
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.baseline = None
+        self.call_seconds = None
+        self._samples = 0
+        self._last_decrease = float('-inf')
+        self._started = None
+        self.stats = {
+            'calls': 0, 'errors': 0, 'retries': 0, 'decreases': 0, 'peak_limit': int(self.limit),
+            'tokens': 0, 'throttled_seconds': 0.0, 'queued_seconds': 0.0
+        }
+
+    def acquire(self, tokens: int = 0):
+        """Block until a call slot (and, with a TPM budget, enough tokens) is available"""
+        waited_from = self._clock()
+        with self._condition:
+            if self._started is None:
+                self._started = waited_from
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            self.stats['queued_seconds'] += self._clock() - waited_from
+
+        if self.bucket and tokens:
+            wait = self.bucket.reserve(min(tokens, self.bucket.capacity))
+            if wait > 0:
+                with self._condition:
+                    self.stats['throttled_seconds'] += wait
+                self._sleep(wait)
+
+    def try_acquire(self, tokens: int = 0) -> bool:
+        """Take a call slot (and TPM tokens) only if both are available now, e.g. for an optional hedge"""
+        with self._condition:
+            if self.in_flight >= int(self.limit):
+                return False
+            if self.bucket and tokens and not self.bucket.try_reserve(min(tokens, self.bucket.capacity)):
+                return False
+            if self._started is None:
+                self._started = self._clock()
+            self.in_flight += 1
+            return True
+
+    def release(self, seconds: float, completion_tokens: int = 0, error: Optional[Exception] = None):
+        """Return a slot and adjust the limit from the call's outcome"""
+        with self._condition:
+            self.in_flight -= 1
+            self.stats['calls'] += 1
+            self.stats['tokens'] += completion_tokens
+
+            per_token = seconds / max(MIN_LATENCY_TOKENS, completion_tokens)
+            spike = (
+                error is None and self._samples >= MIN_BASELINE_SAMPLES
+                and per_token > self.baseline * LATENCY_SPIKE_FACTOR
+            )
+
+            if error is not None:
+                self.stats['errors'] += 1
+            if (error is not None and is_overload_error(error)) or spike:
+                self._decrease()
+            elif error is None:
+                # Healthy call: update the baseline and probe for more capacity
+                self.baseline = per_token if self.baseline is None else 0.9 * self.baseline + 0.1 * per_token
+                self.call_seconds = seconds if self.call_seconds is None else 0.9 * self.call_seconds + 0.1 * seconds
+                self._samples += 1
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.stats['peak_limit'] = max(self.stats['peak_limit'], int(self.limit))
+
+            self._condition.notify_all()
+
+    def _decrease(self):
+        now = self._clock()
+        # Calls already in flight when the limit dropped report the same overload
+        if now - self._last_decrease < (self.call_seconds or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        self.stats['decreases'] += 1
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Jittered wait before retrying a rate-limited call (counted as a retry)"""
+        with self._condition:
+            self.stats['retries'] += 1
+        return random.uniform(0, min(RETRY_MAX_DELAY, (self.call_seconds or 1.0) * (2 ** attempt)))
+
+    def get_stats(self) -> Dict[str, float]:
+        """Current limit, in-flight calls, throughput and throttling counters"""
+        with self._condition:
+            elapsed = max(self._clock() - (self._started or self._clock()), 1e-9)
+            stats = dict(self.stats)
+            stats.update({
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'calls_per_minute': self.stats['calls'] * 60 / elapsed,
+                'tokens_per_minute': self.stats['tokens'] * 60 / elapsed
+            })
+            return stats
@@ -1,8 +1,30 @@
 import os
+import re
 import sys
-from typing import Dict
+import time
+import copy
+import json
+import queue
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 from dotenv import load_dotenv
 from pathlib import Path
+from llm_cache import LLMCache
+from run_estimator import LatencyHistory, price_for, call_cost, DEFAULT_COMPLETION_RATIO
+from token_estimator import estimate_tokens
+from transcript_chunker import chunk_transcript
+from topic_stream import TopicStreamParser, parse_topics
+from transcript_compactor import TranscriptCompactor
+from transcript_salience import SalienceSelector
+from transcript_digest import DIGEST_VERSION, content_hash, build_digest, render_digest
+from transcript_filter import ExclusionFilter
+from transcript_triage import TriageScorer
+from llm_failover import LLMTarget, HedgedCaller, parse_targets
+from concurrency_controller import AdaptiveConcurrency, parse_tpm, is_rate_limit_error, RATE_LIMIT_RETRIES
+from output_repair import normalize_headers, normalize_quotes, missing_sections, check_analysis, splice_topic, drop_last_topic
+from structured_output import ANALYSIS_SCHEMA, JSON_FORMAT_EXAMPLE, extract_json, validate_analysis, normalize_analysis, render_markdown
 
 load_dotenv()
 
@@ -10,18 +32,65 @@ load_dotenv()
 unified_llm_path = Path.home() / 'Development' / 'Scripts' / 'UnifiedLLMClient'
 sys.path.insert(0, str(unified_llm_path))
 
-from llm_client import get_client
+try:
+    from llm_client import get_client
+except ImportError:
+    # Without UnifiedLLMClient only the deterministic 'fake' provider is available
+    get_client = None
+import fake_llm
+
+# Map step output budget per chunk; extraction is kept near-deterministic so
+# chunk results cache well across runs
+CHUNK_MAX_TOKENS = 1500
+CHUNK_TEMPERATURE = 0.2
+
+# Output budget for a request that rewrites one incomplete topic
+REPAIR_MAX_TOKENS = 1500
+
+# Share of list price charged for provider batch API requests
+BATCH_PRICE_RATIO = 0.5
+
+# Delimiters around each transcript's analysis in a packed response
+PACKED_FIRST_DELIMITER = '=== BEGIN ANALYSIS 1 ==='
+PACKED_SECTION_PATTERN = re.compile(r"=== BEGIN ANALYSIS (\d+) ===\s*(.*?)\s*=== END ANALYSIS \1 ===", re.DOTALL)
+
+def get_llm_client(provider: str):
+    """Create the LLM client for a provider; 'fake' is the local stand-in from fake_llm"""
+    if provider == 'fake':
+        return fake_llm.get_client(provider='fake')
+    if get_client is None:
+        raise ImportError(f"llm_client not found (expected UnifiedLLMClient in {unified_llm_path})")
+    return get_client(provider=provider)
 
 class ContentAnalyzer:
-    def __init__(self, content_focus=None, mode='test', model_override=None, provider_override=None):
+    def __init__(self, content_focus=None, mode='test', model_override=None, provider_override=None, concurrency=None, cache_mode='use', chunk_mode=None, connect=True, compact=None, pack=None, output_format=None, routing=None, adaptive=None, salience=None, digests=None, repair=None):
         """
         Initialize ContentAnalyzer with specified mode.
 
         Args:
-            content_focus: Custom content focus string
+            content_focus: Custom content focus string, or a list of focuses to analyze every transcript
+                           for in one run (iter_analyze then yields one result per transcript and focus)
             mode: 'test' (uses Qwen 2.5 32B) or 'production' (uses Qwen 2.5 32B). Default: 'test'
             model_override: Specific model name to override mode defaults
-            provider_override: Specific provider to use with model_override ('qwen', 'anthropic', 'openai', or 'google')
+            provider_override: Specific provider to use with model_override ('qwen', 'anthropic', 'openai', 'google',
+                               or 'fake' for the deterministic local stand-in)
+            concurrency: Max transcripts analyzed at once in batch runs (default: LLM_CONCURRENCY env or 1)
+            cache_mode: LLM response cache: 'use' (read and write), 'refresh' (regenerate and overwrite) or 'off'
+            chunk_mode: Map-reduce for long transcripts: 'auto' (when the prompt exceeds MAX_PROMPT_TOKENS),
+                        'always' or 'off' (default: CHUNK_MODE env or 'auto')
+            connect: Initialize the LLM client (False for dry runs that only build prompts)
+            compact: Compact transcript text before prompting (default: COMPACT_TRANSCRIPTS env or True)
+            pack: Analyze several short transcripts per LLM request in batch runs (default: PACK_TRANSCRIPTS env or False)
+            output_format: 'markdown' (model writes the topic markdown) or 'json' (model returns compact JSON
+                           that is validated and rendered to the same markdown locally). Default: OUTPUT_FORMAT env or markdown
+            routing: Triage transcripts first: skip low scorers, send borderline ones to ROUTE_MID_MODEL and
+                     only the rest to this model (default: ROUTING env or False)
+            adaptive: Adjust LLM calls in flight from rate-limit and latency feedback, starting at
+                      `concurrency` (default: LLM_ADAPTIVE_CONCURRENCY env or False)
+            salience: Keep only the most salient parts of transcripts over SALIENCE_BUDGET tokens
+                      (default: SALIENCE_SELECTION env or False)
+            digests: Analyze in two stages: a focus-independent digest of each transcript, cached by
+                     content hash, then topics from the digest (default: TRANSCRIPT_DIGESTS env or False)
         """
         # If model override is specified, use it with the provider
         if model_override:
@@ -40,6 +109,8 @@ class ContentAnalyzer:
                     self.provider = 'openai'
                 elif 'gemini' in model_override.lower():
                     self.provider = 'google'
+                elif 'fake' in model_override.lower():
+                    self.provider = 'fake'
                 else:
                     # Default to Qwen (local, free)
                     self.provider = 'qwen'
@@ -56,28 +127,166 @@ class ContentAnalyzer:
             self.provider = 'qwen'
             self.model = 'qwen2.5:32b'
 
+        # Measured call latencies, used by --dry-run ETA projections and hedge delays
+        self.latency_history = LatencyHistory()
+
         # Initialize the unified LLM client
-        self._init_client()
+        self.client = None
+        self.caller = None
+        self.supports_cache_prefix = False
+        self.supports_json_schema = False
+        if connect:
+            self._init_client()
+
+        # Provider prompt-cache usage (prompt tokens sent vs served from the provider's cache)
+        self.prompt_cache_stats = {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0}
+        self._stats_lock = threading.Lock()
+        # Transcript the current thread's LLM calls are for, recorded in the call ledger
+        self._call_context = threading.local()
+        # Cache keys being generated right now: identical concurrent requests wait for the first
+        self._in_flight = {}
+
+        # Number of LLM calls allowed in flight during batch analysis
+        self.concurrency = max(1, int(concurrency or os.getenv('LLM_CONCURRENCY', '1') or 1))
+
+        # AIMD controller that grows or shrinks LLM calls in flight (and honors LLM_TPM)
+        if adaptive is None:
+            adaptive = os.getenv('LLM_ADAPTIVE_CONCURRENCY', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.limiter = AdaptiveConcurrency(
+            initial=self.concurrency, tpm=parse_tpm(os.getenv('LLM_TPM', ''), self.provider)
+        ) if adaptive else None
+        if self.caller:
+            self.caller.limiter = self.limiter
+
+        # Persistent LLM response cache
+        self.cache_mode = cache_mode
+        self.cache = LLMCache() if cache_mode != 'off' else None
+
+        # Map-reduce settings for transcripts that exceed the model context
+        self.chunk_mode = (chunk_mode or os.getenv('CHUNK_MODE', 'auto')).lower()
+        self.max_prompt_tokens = int(os.getenv('MAX_PROMPT_TOKENS', '24000'))
+        self.chunk_tokens = int(os.getenv('CHUNK_TOKENS', '6000'))
+        self.chunk_concurrency = max(1, int(os.getenv('CHUNK_CONCURRENCY', '4')))
+
+        # Two-stage analysis through reusable focus-independent transcript digests
+        if digests is None:
+            digests = os.getenv('TRANSCRIPT_DIGESTS', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.digests = digests
+        self.digest_stats = {'transcripts': 0, 'reused': 0, 'transcript_tokens': 0, 'digest_tokens': 0, 'dropped_quotes': 0}
+
+        # Transcript compaction (timestamps, fillers, boilerplate, repeated speaker labels)
+        if compact is None:
+            compact = os.getenv('COMPACT_TRANSCRIPTS', 'true').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.compactor = TranscriptCompactor() if compact else None
+        self.compaction_stats = {'transcripts': 0, 'original_tokens': 0, 'compacted_tokens': 0}
+
+        # Packing short transcripts into shared requests
+        if pack is None:
+            pack = os.getenv('PACK_TRANSCRIPTS', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.pack = pack
+        self.pack_short_tokens = int(os.getenv('PACK_SHORT_TOKENS', '2500'))
+        self.pack_max_tokens = int(os.getenv('PACK_MAX_TOKENS', '10000'))
+        self.pack_max_transcripts = max(2, int(os.getenv('PACK_MAX_TRANSCRIPTS', '4')))
+        self.pack_max_output_tokens = int(os.getenv('PACK_MAX_OUTPUT_TOKENS', '8000'))
+        self.pack_stats = {'requests': 0, 'transcripts': 0, 'fallbacks': 0}
+        # Transcripts batch_requests had to leave out (their map step failed), as error results
+        self.batch_errors = []
+
+        # Response format requested from the model
+        self.output_format = (output_format or os.getenv('OUTPUT_FORMAT', 'markdown')).strip().lower()
+        if self.output_format not in ('markdown', 'json'):
+            raise ValueError(f"Unknown output format: {self.output_format} (use 'markdown' or 'json')")
+        self.structured_stats = {'responses': 0, 'invalid': 0}
+
+        # Targeted repair of truncated or malformed markdown analysis
+        if repair is None:
+            repair = os.getenv('REPAIR_OUTPUT', 'true').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.repair = repair
+        self.repair_max_calls = max(0, int(os.getenv('REPAIR_MAX_CALLS', '2')))
+        self.repair_stats = {'checked': 0, 'local_fixes': 0, 'repair_calls': 0, 'repaired': 0, 'dropped': 0, 'errors': 0, 'unrepaired': 0}
 
         # Load filter settings
         self.excluded_people = self._parse_csv_env('EXCLUDE_PEOPLE')
         self.excluded_subjects = self._parse_csv_env('EXCLUDE_SUBJECTS')
 
+        self.exclusions = ExclusionFilter(self.excluded_people, self.excluded_subjects)
+
         # Set content focus (default: AI strategy for business leaders)
-        if content_focus:
-            self.content_focus = content_focus
+        if isinstance(content_focus, (list, tuple)):
+            focuses = list(dict.fromkeys(f.strip() for f in content_focus if f and f.strip()))
+        else:
+            focuses = [content_focus] if content_focus else []
+        if focuses:
+            self.content_focus = focuses[0]
         else:
             self.content_focus = os.getenv('CONTENT_FOCUS', '').strip() or \
                                'AI strategy and innovation for business leaders'
+        # Every focus transcripts are analyzed for; more than one fans out (see _iter_focuses)
+        self.focuses = focuses or [self.content_focus]
+
+        # Extractive pre-selection of the salient parts of long transcripts
+        if salience is None:
+            salience = os.getenv('SALIENCE_SELECTION', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.selector = SalienceSelector(self.content_focus) if salience else None
+        self.salience_stats = {
+            'transcripts': 0, 'original_tokens': 0, 'selected_tokens': 0, 'focus_recall': 0.0, 'salience_kept': 0.0
+        }
+
+        # Two-tier routing with a local triage score
+        if routing is None:
+            routing = os.getenv('ROUTING', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.routing = routing
+        self.triage = TriageScorer(self.content_focus) if routing else None
+        self.route_min_score = float(os.getenv('ROUTE_MIN_SCORE', '0.2'))
+        self.route_main_score = float(os.getenv('ROUTE_MAIN_SCORE', '0.45'))
+        self.routing_log_path = os.getenv('ROUTING_LOG', 'routing_log.jsonl')
+        self.routing_stats = {'main': 0, 'mid': 0, 'skip': 0, 'saved_tokens': 0, 'saved_cost': 0.0}
+        self.run_started = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+        # Borderline transcripts go to a cheaper model; without one they stay on this model
+        self.mid_analyzer = None
+        mid_model = os.getenv('ROUTE_MID_MODEL', '').strip()
+        if routing and mid_model and mid_model != self.model:
+            self.mid_analyzer = ContentAnalyzer(
+                content_focus=self.content_focus, model_override=mid_model,
+                provider_override=os.getenv('ROUTE_MID_PROVIDER', '').strip() or None,
+                cache_mode=cache_mode, chunk_mode=chunk_mode, connect=connect,
+                compact=False, pack=False, output_format=self.output_format, routing=False, salience=False,
+                concurrency=self.concurrency, adaptive=adaptive
+            )
 
     def _init_client(self):
         """Initialize the unified LLM client"""
         try:
             # Use UnifiedLLMClient with explicit provider
-            self.client = get_client(provider=self.provider)
+            self.client = get_llm_client(self.provider)
         except Exception as e:
             raise ValueError(f"Failed to initialize {self.provider} client: {str(e)}")
 
+        # Clients that accept cache_prefix mark that leading part of the prompt as
+        # cacheable (e.g. Anthropic cache_control); others rely on automatic prefix
+        # caching (OpenAI) or KV cache reuse (local Qwen), which only need the
+        # static part to come first
+        try:
+            parameters = inspect.signature(self.client.generate).parameters
+        except (TypeError, ValueError):
+            parameters = {}
+        self.supports_cache_prefix = 'cache_prefix' in parameters
+        # Clients that accept json_schema can constrain output to ANALYSIS_SCHEMA
+        self.supports_json_schema = 'json_schema' in parameters
+
+        # Calls go through a deadline-bounded chain: this model first, then any
+        # LLM_FALLBACKS, raced in when it is slow (hedging) or failed over to on errors
+        fallbacks = [
+            LLMTarget(provider, model, client_factory=get_llm_client)
+            for provider, model in parse_targets(os.getenv('LLM_FALLBACKS', ''))
+            if (provider, model) != (self.provider, self.model)
+        ]
+        self.caller = HedgedCaller(
+            [LLMTarget(self.provider, self.model, client=self.client)] + fallbacks,
+            history=self.latency_history
+        )
+
     def _parse_csv_env(self, env_var: str) -> list:
         """Parse comma-separated environment variable into list"""
         value = os.getenv(env_var, '').strip()
@@ -86,32 +295,77 @@ class ContentAnalyzer:
         return [item.strip() for item in value.split(',') if item.strip()]
 
     def should_exclude_transcript(self, transcript: Dict) -> bool:
-        """Check if transcript should be excluded based on filters"""
-        # Check subject line filters
-        subject = transcript.get('subject', '').lower()
-        for keyword in self.excluded_subjects:
-            if keyword.lower() in subject:
-                return True
-
-        # Check people filters (in transcript body)
-        body = transcript.get('body', '').lower()
-        for person in self.excluded_people:
-            if person.lower() in body:
-                return True
-
-        return False
-
-    def _create_prompt(self, transcript: Dict) -> str:
-        """Create the analysis prompt"""
-        return f"""You are analyzing a conversation transcript for content focused on {self.content_focus}.
+        """Check if transcript should be excluded based on filters (see ExclusionFilter)"""
+        return self.exclusions.excludes(transcript)
 
-Conversation Topic: {transcript['topic']}
-Date: {transcript['date']}
+    def _prepare_transcript(self, transcript: Dict) -> Dict:
+        """
+        Return the transcript with its body compacted and, for long transcripts,
+        cut down to its salient parts (each when enabled), tallying the token reductions
+        """
+        return self._select_salient(self._compact_transcript(transcript))
 
-Transcript:
-{transcript['body']}
+    def _compact_transcript(self, transcript: Dict) -> Dict:
+        """Compaction step of _prepare_transcript (doesn't depend on the content focus)"""
+        if not self.compactor:
+            return transcript
 
-Please analyze this transcript and provide 2-5 recommended topics. For EACH topic, include:
+        body, stats = self.compactor.compact(transcript['body'])
+        with self._stats_lock:
+            self.compaction_stats['transcripts'] += 1
+            self.compaction_stats['original_tokens'] += stats['original_tokens']
+            self.compaction_stats['compacted_tokens'] += stats['compacted_tokens']
+        return {**transcript, 'body': body, 'compaction_ratio': stats['ratio']}
+
+    def _select_salient(self, transcript: Dict) -> Dict:
+        """
+        Salience selection step of _prepare_transcript.
+
+        The selection depends on the content focus, so transcripts headed for
+        map-reduce (including every transcript with digests) keep their full
+        text: their map step doesn't depend on the focus, and its cached
+        extracts serve every other focus and later re-runs.
+        """
+        if not self.selector or self._needs_chunking(transcript, self._create_prompt(transcript)):
+            return transcript
+
+        body, stats = self.selector.select(transcript['body'])
+        if stats['selected_tokens'] >= stats['original_tokens']:
+            return transcript
+        with self._stats_lock:
+            self.salience_stats['transcripts'] += 1
+            self.salience_stats['original_tokens'] += stats['original_tokens']
+            self.salience_stats['selected_tokens'] += stats['selected_tokens']
+            self.salience_stats['focus_recall'] += stats['focus_recall']
+            self.salience_stats['salience_kept'] += stats['salience_kept']
+        return {**transcript, 'body': body, 'salience': stats}
+
+    def for_focus(self, content_focus: str) -> 'ContentAnalyzer':
+        """
+        Analyzer for another content focus that shares this one's LLM client,
+        response cache, concurrency limiter and stats
+        """
+        analyzer = copy.copy(self)
+        analyzer.content_focus = content_focus
+        analyzer.focuses = [content_focus]
+        analyzer.triage = TriageScorer(content_focus) if self.triage else None
+        analyzer.selector = SalienceSelector(content_focus, self.selector.budget_tokens) if self.selector else None
+        analyzer.mid_analyzer = self.mid_analyzer.for_focus(content_focus) if self.mid_analyzer else None
+        return analyzer
+
+    def _create_prompt_prefix(self, output_format: Optional[str] = None) -> str:
+        """
+        Static part of the analysis prompt: identical for every transcript in a run.
+
+        It comes first so providers can cache it (Anthropic cache_control,
+        OpenAI automatic prefix caching, the local model's KV cache).
+        """
+        if (output_format or self.output_format) == 'json':
+            return self._create_json_prompt_prefix()
+
+        return f"""You are analyzing a conversation transcript for content focused on {self.content_focus}.
+
+Please analyze the transcript at the end of this prompt and provide 2-5 recommended topics. For EACH topic, include:
 - A compelling topic title geared towards the audience
 - 1-3 sentence description of why this would make a good article
 - 2-5 KEY INSIGHTS specifically related to this topic
@@ -185,13 +439,468 @@ NOTES:
 - Limit Evidence/Data items to max 5 per topic, each 3-5 sentences
 - Limit Real-World Examples to max 5 per topic, each 3-5 sentences"""
 
-    def _call_llm(self, prompt: str) -> str:
-        """Call LLM API via UnifiedLLMClient"""
-        return self.client.generate(
-            prompt=prompt,
-            max_tokens=4000,
-            temperature=0.7
+    def _create_json_prompt_prefix(self) -> str:
+        """Static analysis instructions asking for compact JSON instead of markdown"""
+        return f"""You are analyzing a conversation transcript for content focused on {self.content_focus}.
+
+Please analyze the transcript at the end of this prompt and recommend 2-5 article topics for this audience.
+
+Respond with ONLY a minified JSON object, no markdown and no code fences, in exactly this shape:
+{JSON_FORMAT_EXAMPLE}
+
+Keys for EACH topic:
+- t: a compelling topic title geared towards the audience
+- d: 1-3 sentences on why this would make a good article
+- i: 2-5 specific, actionable key insights related to this topic
+- q: 1-3 [speaker name, quote] pairs, quotes copied VERBATIM from the transcript ("Unknown" if the speaker isn't identifiable)
+- e: evidence - data points, statistics or research findings mentioned (max 5, each 3-5 sentences); [] if none
+- x: real-world stories, case studies or perspectives shared (max 5, each 3-5 sentences); [] if none
+
+Focus on content relevant to {self.content_focus}. Never invent quotes, evidence or examples."""
+
+    def _create_prompt(self, transcript: Dict, source_label: str = 'Transcript', output_format: Optional[str] = None) -> str:
+        """Create the analysis prompt: static instructions prefix followed by the transcript"""
+        return self._create_prompt_prefix(output_format) + f"""
+
+Conversation Topic: {transcript['topic']}
+Date: {transcript['date']}
+
+{source_label}:
+{transcript['body']}"""
+
+    def _create_chunk_prompt_prefix(self) -> str:
+        """Static part of the map step prompt, shared by every chunk of every transcript"""
+        return """You are extracting raw material from one part of a conversation transcript, given at the end of this prompt.
+
+Extract everything from this part that could support an article. Do not summarize away specifics.
+
+Format your response EXACTLY as follows (omit a section if nothing qualifies):
+
+### Insights
+• [Substantive idea, argument or lesson, stated specifically]
+
+### Quotes
+> **[Speaker Name]:** "[Exact quote copied verbatim from the transcript]"
+
+### Evidence
+• [Data point, statistic, metric or research finding mentioned]
+
+### Stories
+• [Real-world story, case study or example shared]
+
+RULES:
+- Quotes must be copied character-for-character from the transcript, with the speaker's name
+- Prefer quotes that are vivid, opinionated or memorable
+- Do not invent anything that is not in this part of the transcript"""
+
+    def _create_chunk_prompt(self, transcript: Dict, chunk: str, index: int, total: int) -> str:
+        """Create the focus-independent extraction prompt for one transcript chunk (map step)"""
+        return self._create_chunk_prompt_prefix() + f"""
+
+Conversation Topic: {transcript['topic']}
+Date: {transcript['date']}
+
+Transcript (part {index} of {total}):
+{chunk}"""
+
+    def _needs_chunking(self, transcript: Dict, prompt: str) -> bool:
+        """Decide whether to use map-reduce analysis for this transcript (always, with digests)"""
+        if self.chunk_mode == 'always' or self.digests:
+            return True
+        if self.chunk_mode == 'off':
+            return False
+        return estimate_tokens(prompt) > self.max_prompt_tokens
+
+    def _reduce_source_label(self) -> str:
+        if self.digests:
+            return 'Transcript digest (key claims, verbatim quotes, data points and stories from the full transcript)'
+        return 'Extracted notes (insights, verbatim quotes, evidence and stories from each part of the full transcript)'
+
+    def _digest_key(self, transcript: Dict) -> str:
+        """Cache key of a transcript's digest: its content hash plus everything that shapes the digest"""
+        return LLMCache.make_key(
+            f"digest:{content_hash(transcript['body'])}", self.provider, self.model, CHUNK_MAX_TOKENS, CHUNK_TEMPERATURE,
+            digest_version=DIGEST_VERSION, chunk_tokens=self.chunk_tokens
+        )
+
+    def _cached_digest(self, transcript: Dict) -> Optional[Dict]:
+        """A transcript's digest from the LLM cache, if one was built before"""
+        if not self.cache or self.cache_mode == 'refresh':
+            return None
+        cached = self.cache.get(self._digest_key(transcript))
+        return json.loads(cached) if cached else None
+
+    def plan_calls(self, transcript: Dict) -> list:
+        """
+        List the LLM calls analyze_transcript would make, without making them.
+
+        Returns:
+            List of dicts with 'prompt', 'max_tokens', 'temperature' and
+            'reduce' (True for the map-reduce final call, whose prompt also
+            carries the map outputs, so 'prompt' is only its template)
+        """
+        transcript = self._prepare_transcript(transcript)
+        prompt = self._create_prompt(transcript)
+        if not self._needs_chunking(transcript, prompt):
+            return [{'prompt': prompt, 'max_tokens': 4000, 'temperature': 0.7, 'reduce': False}]
+
+        # A cached digest leaves only the analysis call
+        digest = self._cached_digest(transcript) if self.digests else None
+        if digest:
+            prompt = self._create_prompt({**transcript, 'body': render_digest(digest)}, source_label=self._reduce_source_label())
+            return [{'prompt': prompt, 'max_tokens': 4000, 'temperature': 0.7, 'reduce': False}]
+
+        chunks = chunk_transcript(transcript['body'], self.chunk_tokens)
+        calls = [
+            {
+                'prompt': self._create_chunk_prompt(transcript, chunk, index, len(chunks)),
+                'max_tokens': CHUNK_MAX_TOKENS,
+                'temperature': CHUNK_TEMPERATURE,
+                'reduce': False
+            }
+            for index, chunk in enumerate(chunks, 1)
+        ]
+        calls.append({
+            'prompt': self._create_prompt({**transcript, 'body': ''}, source_label=self._reduce_source_label()),
+            'max_tokens': 4000,
+            'temperature': 0.7,
+            'reduce': True
+        })
+        return calls
+
+    def _create_reduce_prompt(self, transcript: Dict, output_format: Optional[str] = None) -> str:
+        """
+        Map step of the map-reduce analysis for long transcripts.
+
+        The transcript is split on speaker turns into chunks of CHUNK_TOKENS,
+        material is extracted from each chunk in parallel, and the combined
+        extracts are returned as the prompt for the final reduce call. Chunk
+        prompts don't depend on the content focus, so after a focus change
+        they are served from the LLM cache and only the reduce call runs.
+        With digests, the extracts are merged into the transcript's digest.
+        """
+        notes = render_digest(self._digest(transcript)) if self.digests else ''
+        if not notes:
+            # Without digests (or if the extracts couldn't be parsed into one) the raw extracts are the notes
+            extracts = self._extract_chunks(transcript)
+            notes = '\n\n'.join(
+                f"--- Part {index} of {len(extracts)} ---\n{extract.strip()}"
+                for index, extract in enumerate(extracts, 1)
+            )
+        reduce_transcript = {**transcript, 'body': notes}
+        return self._create_prompt(reduce_transcript, source_label=self._reduce_source_label(), output_format=output_format)
+
+    def _digest(self, transcript: Dict) -> Dict:
+        """
+        Stage one of two-stage analysis: the focus-independent digest of a transcript.
+
+        Built from the map-step extracts of its chunks (one chunk for most
+        transcripts) and cached by the transcript's content hash, so analyses
+        for other focuses - or re-runs - start from the digest.
+        """
+        digest = self._cached_digest(transcript)
+        reused = digest is not None
+        if not reused:
+            digest = build_digest(self._extract_chunks(transcript), transcript['body'])
+            if self.cache and (digest['claims'] or digest['quotes']):
+                self.cache.set(self._digest_key(transcript), json.dumps(digest))
+
+        with self._stats_lock:
+            self.digest_stats['transcripts'] += 1
+            self.digest_stats['reused'] += reused
+            self.digest_stats['transcript_tokens'] += estimate_tokens(transcript['body'])
+            self.digest_stats['digest_tokens'] += estimate_tokens(render_digest(digest))
+            self.digest_stats['dropped_quotes'] += 0 if reused else digest['dropped_quotes']
+        return digest
+
+    def _extract_chunks(self, transcript: Dict) -> list:
+        """Run the map-step extraction over a transcript's chunks in parallel"""
+        chunks = chunk_transcript(transcript['body'], self.chunk_tokens)
+        prompts = [
+            self._create_chunk_prompt(transcript, chunk, index, len(chunks))
+            for index, chunk in enumerate(chunks, 1)
+        ]
+
+        def extract(prompt):
+            self._set_call_context([transcript])
+            return self._call_llm(prompt, max_tokens=CHUNK_MAX_TOKENS, temperature=CHUNK_TEMPERATURE)
+
+        workers = min(len(prompts), self.chunk_concurrency)
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='chunk') as pool:
+            return list(pool.map(extract, prompts))
+
+    def _analyze_in_chunks(self, transcript: Dict, output_format: Optional[str] = None) -> str:
+        """Map-reduce analysis for long transcripts"""
+        return self._call_llm(self._create_reduce_prompt(transcript, output_format))
+
+    def _cache_key(self, prompt: str, max_tokens: int, temperature: float, target: Optional[LLMTarget] = None) -> Optional[str]:
+        if not self.cache:
+            return None
+        provider, model = (target.provider, target.model) if target else (self.provider, self.model)
+        return LLMCache.make_key(prompt, provider, model, max_tokens, temperature)
+
+    def _generate_kwargs(self, prompt: str, max_tokens: int, temperature: float) -> Dict:
+        """Arguments for client.generate(), marking the static prompt prefix as cacheable when supported"""
+        kwargs = {'prompt': prompt, 'max_tokens': max_tokens, 'temperature': temperature}
+        if self.supports_cache_prefix:
+            for prefix in (self._create_prompt_prefix(), self._create_chunk_prompt_prefix()):
+                if prompt.startswith(prefix):
+                    kwargs['cache_prefix'] = prefix
+                    break
+        # A packed response is several delimited JSON objects, which ANALYSIS_SCHEMA can't describe
+        if self.supports_json_schema and self.output_format == 'json' and \
+                prompt.startswith(self._create_json_prompt_prefix()) and PACKED_FIRST_DELIMITER not in prompt:
+            kwargs['json_schema'] = ANALYSIS_SCHEMA
+        return kwargs
+
+    def _cached_prompt_tokens(self, usage: Optional[Dict]) -> Optional[Dict]:
+        """
+        Read prompt, cache-hit and completion token counts from a call's usage report.
+
+        Understands OpenAI (prompt_tokens_details.cached_tokens), Anthropic
+        (cache_read_input_tokens) and Gemini (cached_content_token_count) usage
+        fields. Returns None when the client doesn't report usage.
+        """
+        if not isinstance(usage, dict):
+            return None
+
+        prompt_tokens = usage.get('prompt_tokens') or usage.get('input_tokens') or usage.get('prompt_token_count') or 0
+        cached_tokens = (
+            (usage.get('prompt_tokens_details') or {}).get('cached_tokens')
+            or usage.get('cache_read_input_tokens')
+            or usage.get('cached_content_token_count')
+            or usage.get('cached_tokens')
+            or 0
         )
+        # Anthropic reports cache reads separately from the uncached input tokens
+        if 'cache_read_input_tokens' in usage or 'cache_creation_input_tokens' in usage:
+            prompt_tokens += (usage.get('cache_read_input_tokens') or 0) + (usage.get('cache_creation_input_tokens') or 0)
+        completion_tokens = (
+            usage.get('completion_tokens') or usage.get('output_tokens') or usage.get('candidates_token_count') or None
+        )
+        return {'prompt_tokens': prompt_tokens, 'cached_tokens': cached_tokens, 'completion_tokens': completion_tokens}
+
+    def _call_details(self) -> Dict:
+        """Ledger fields describing what the current thread's LLM calls are for"""
+        return {
+            'focus': self.content_focus,
+            'transcript': getattr(self._call_context, 'transcript', None),
+            'topic': getattr(self._call_context, 'topic', None)
+        }
+
+    def _set_call_context(self, transcripts: list):
+        """Attribute this thread's following LLM calls to the given transcript(s) in the ledger"""
+        self._call_context.transcript = ','.join(str(t.get('id')) for t in transcripts)
+        self._call_context.topic = ' | '.join(t.get('topic', '') for t in transcripts)
+
+    def _log_call(self, prompt: str, response: Optional[str], max_tokens: int, seconds: float,
+                  target: Optional[LLMTarget] = None, usage: Optional[Dict] = None, **details):
+        """Append one call (or response cache hit) to the LLM call ledger"""
+        usage = usage or {}
+        try:
+            self.latency_history.record(
+                target.provider if target else self.provider, target.model if target else self.model,
+                usage.get('prompt_tokens') or estimate_tokens(prompt),
+                usage.get('completion_tokens') or estimate_tokens(response or ''),
+                seconds, max_tokens=max_tokens, cached_tokens=usage.get('cached_tokens'),
+                **self._call_details(), **details
+            )
+        except OSError:
+            pass
+
+    def _record_completion(self, cache_key: Optional[str], prompt: str, response: str, max_tokens: int, started: float,
+                           target: Optional[LLMTarget] = None, usage: Optional[Dict] = None, **details):
+        """Cache a fresh response and log it, with provider cache-hit tokens, in the ledger (under target when a fallback answered)"""
+        if not response:
+            return
+
+        if cache_key:
+            self.cache.set(cache_key, response)
+
+        usage = self._cached_prompt_tokens(usage)
+        if usage:
+            with self._stats_lock:
+                self.prompt_cache_stats['calls'] += 1
+                self.prompt_cache_stats['prompt_tokens'] += usage['prompt_tokens']
+                self.prompt_cache_stats['cached_tokens'] += usage['cached_tokens']
+
+        self._log_call(prompt, response, max_tokens, time.monotonic() - started, target, usage, **details)
+
+    def _cached_response(self, cache_key: Optional[str], prompt: str, max_tokens: int) -> Optional[str]:
+        """Serve a response from the LLM cache (logging the hit), unless refreshing"""
+        if not cache_key or self.cache_mode == 'refresh':
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self._log_call(prompt, cached, max_tokens, 0.0, cache_hit=True)
+        return cached
+
+    def _call_llm(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.7) -> str:
+        """
+        Call LLM API via UnifiedLLMClient, serving repeated requests from the response cache
+
+        A request identical to one already in flight (e.g. the same map-step chunk
+        for several focuses) waits for that call and is then served from the cache.
+        """
+        cache_key = self._cache_key(prompt, max_tokens, temperature)
+        cached = self._cached_response(cache_key, prompt, max_tokens)
+        if cached is not None:
+            return cached
+
+        done = None
+        in_flight_key = cache_key
+        if cache_key:
+            with self._stats_lock:
+                pending = self._in_flight.get(cache_key)
+                if pending is None:
+                    done = self._in_flight[cache_key] = threading.Event()
+            if pending is not None:
+                pending.wait()
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self._log_call(prompt, cached, max_tokens, 0.0, cache_hit=True)
+                    return cached
+
+        try:
+            started = time.monotonic()
+            try:
+                if self.limiter:
+                    response, target, started, attempts = self._call_limited(prompt, max_tokens, temperature)
+                else:
+                    response, target, attempts = self.caller.call(self._generate_kwargs(prompt, max_tokens, temperature))
+            except Exception as e:
+                self._log_call(prompt, None, max_tokens, time.monotonic() - started, error=str(e)[:200])
+                raise
+
+            # A fallback's answer is cached and timed under its own provider/model
+            if target is not self.caller.targets[0]:
+                cache_key = self._cache_key(prompt, max_tokens, temperature, target)
+            self._record_completion(cache_key, prompt, response, max_tokens, started, target,
+                                    self.caller.last_usage, retries=attempts - 1)
+            return response
+        finally:
+            if done is not None:
+                with self._stats_lock:
+                    self._in_flight.pop(in_flight_key, None)
+                done.set()
+
+    def _call_limited(self, prompt: str, max_tokens: int, temperature: float):
+        """
+        Call the model under the adaptive concurrency limit, retrying rate-limited calls after backing off
+
+        Returns:
+            Tuple of (response, target, start time of the successful attempt, providers tried in total)
+        """
+        tokens = estimate_tokens(prompt) + int(max_tokens * DEFAULT_COMPLETION_RATIO)
+        attempt = 0
+        while True:
+            self.limiter.acquire(tokens)
+            started = time.monotonic()
+            try:
+                response, target, attempts = self.caller.call(self._generate_kwargs(prompt, max_tokens, temperature))
+            except Exception as e:
+                self.limiter.release(time.monotonic() - started, error=e)
+                if attempt >= RATE_LIMIT_RETRIES or not is_rate_limit_error(e):
+                    raise
+                time.sleep(self.limiter.backoff_delay(attempt))
+                attempt += 1
+                continue
+            self.limiter.release(time.monotonic() - started, estimate_tokens(response or ''))
+            return response, target, started, attempts + attempt
+
+    def _stream_llm(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.7):
+        """
+        Yield the LLM response as text deltas.
+
+        Uses the client's generate_stream() when the provider supports
+        streaming, under the same deadline, failover, concurrency limit and
+        rate-limit backoff as _call_llm; otherwise (and for cached responses)
+        the whole response arrives as a single delta.
+        """
+        cache_key = self._cache_key(prompt, max_tokens, temperature)
+        cached = self._cached_response(cache_key, prompt, max_tokens)
+        if cached is not None:
+            yield cached
+            return
+
+        if getattr(self.client, 'generate_stream', None) is None:
+            response = self._call_llm(prompt, max_tokens, temperature)
+            if response:
+                yield response
+            return
+
+        tokens = estimate_tokens(prompt) + int(max_tokens * DEFAULT_COMPLETION_RATIO)
+        attempt = 0
+        while True:
+            if self.limiter:
+                self.limiter.acquire(tokens)
+            started = time.monotonic()
+            parts, ttft, outcome = [], None, {}
+            try:
+                for delta in self.caller.stream(self._generate_kwargs(prompt, max_tokens, temperature), outcome):
+                    if ttft is None:
+                        ttft = round(time.monotonic() - started, 3)
+                    parts.append(delta)
+                    yield delta
+            except GeneratorExit:
+                # The consumer stopped reading: give the slot back and log nothing
+                if self.limiter:
+                    self.limiter.release(time.monotonic() - started, estimate_tokens(''.join(parts)))
+                raise
+            except Exception as e:
+                if self.limiter:
+                    self.limiter.release(time.monotonic() - started, error=e)
+                # Rate-limited before any output: back off and try again, as _call_limited does
+                if self.limiter and not parts and attempt < RATE_LIMIT_RETRIES and is_rate_limit_error(e):
+                    time.sleep(self.limiter.backoff_delay(attempt))
+                    attempt += 1
+                    continue
+                self._log_call(prompt, None, max_tokens, time.monotonic() - started, error=str(e)[:200], ttft=ttft)
+                raise
+            break
+
+        response = ''.join(parts)
+        if self.limiter:
+            self.limiter.release(time.monotonic() - started, estimate_tokens(response))
+        # A fallback's answer is cached and timed under its own provider/model
+        target = outcome['target']
+        if target is not self.caller.targets[0]:
+            cache_key = self._cache_key(prompt, max_tokens, temperature, target)
+        self._record_completion(cache_key, prompt, response, max_tokens, started, target, self.caller.last_usage,
+                                retries=outcome['attempts'] - 1 + attempt, ttft=ttft)
+
+    def _error_result(self, transcript: Dict, error: Exception) -> Dict:
+        """Build the error result returned for a failed analysis"""
+        return {
+            'id': transcript.get('id'),
+            'topic': transcript.get('topic', ''),
+            'date': transcript.get('date', ''),
+            'error': f"Error analyzing transcript with {self.provider}/{self.model}: {str(error)}"
+        }
+
+    def _result(self, transcript: Dict, analysis: str, structured: Optional[Dict] = None) -> Dict:
+        """Build the result returned for a successful analysis"""
+        result = {
+            'id': transcript.get('id'),
+            'topic': transcript['topic'],
+            'date': transcript['date'],
+            'subject': transcript['subject'],
+            # Add source information to the analysis
+            'analysis': f"**Source:** {transcript['subject']}\n\n{analysis}"
+        }
+        if structured is not None:
+            result['structured'] = structured
+        return result
+
+    def _parse_structured(self, response: str) -> Optional[Dict]:
+        """Parse and validate a JSON-mode response; None if it doesn't match ANALYSIS_SCHEMA"""
+        data = extract_json(response)
+        valid = data is not None and not validate_analysis(data)
+        with self._stats_lock:
+            self.structured_stats['responses'] += 1
+            if not valid:
+                self.structured_stats['invalid'] += 1
+        return normalize_analysis(data) if valid else None
 
     def analyze_transcript(self, transcript: Dict) -> Dict:
         """
@@ -200,33 +909,595 @@ NOTES:
         Returns:
             Dict with keys: recommended_topics, key_insights, quotes
         """
+        return self._analyze_unit([self._prepare_transcript(transcript)])[0]
+
+    def _analyze_prepared(self, transcript: Dict) -> Dict:
+        """Analyze a transcript that has already been through _prepare_transcript"""
+        self._set_call_context([transcript])
         prompt = self._create_prompt(transcript)
 
         try:
-            # Call the unified LLM client
+            # Call the unified LLM client (map-reduce if the transcript is too long)
+            chunked = self._needs_chunking(transcript, prompt)
+            if chunked:
+                prompt = self._create_reduce_prompt(transcript)
             analysis = self._call_llm(prompt)
 
-            # Add source information to the analysis
-            analysis_with_source = f"**Source:** {transcript['subject']}\n\n{analysis}"
+            if self.output_format == 'json':
+                structured = self._parse_structured(analysis)
+                if structured:
+                    return self._result(transcript, render_markdown(structured), structured)
 
-            return {
-                'topic': transcript['topic'],
-                'date': transcript['date'],
-                'subject': transcript['subject'],
-                'analysis': analysis_with_source
-            }
+                # Invalid JSON: ask again for the markdown format
+                if chunked:
+                    prompt = self._create_reduce_prompt(transcript, output_format='markdown')
+                else:
+                    prompt = self._create_prompt(transcript, output_format='markdown')
+                analysis = self._call_llm(prompt)
+
+            return self._result(transcript, self._repair_analysis(prompt, analysis))
 
         except Exception as e:
-            return {
-                'topic': transcript['topic'],
-                'date': transcript['date'],
-                'error': f"Error analyzing transcript with {self.provider}/{self.model}: {str(e)}"
-            }
+            return self._error_result(transcript, e)
+
+    def _create_topic_repair_prompt(self, prompt: str, topic: Dict, missing: list) -> str:
+        """
+        Ask for one complete topic in place of an incomplete one.
+
+        The original prompt comes first unchanged, so the provider's prompt
+        cache (or the local model's KV cache) serves it again.
+        """
+        problem = 'was cut off' if '(cut off)' in missing else f"is missing: {', '.join(missing)}"
+        return f"""{prompt}
+
+---
+
+REPAIR REQUEST: In your earlier answer to the request above, this topic {problem}.
+
+{topic['content'].strip()}
+
+Write ONLY this one topic again, complete, in exactly the format specified above and starting with its "## TOPIC" header. Keep its title and any content that is already right; quotes must be verbatim from the transcript. Do not write any other topics."""
+
+    def _create_reformat_prompt(self, analysis: str) -> str:
+        """Ask for an analysis in the wrong layout to be rewritten in the topic format (no transcript needed)"""
+        return f"""Rewrite the article topic analysis below in EXACTLY this markdown format, keeping its content. Do not add, drop or invent anything; quotes stay word for word.
+
+## TOPIC 1: [Topic Title]
+
+**Description:** [2-3 sentence description]
+
+**Key Insights:**
+• [Insight]
+
+**Notable Quotes:**
+> **[Speaker Name]:** "[Exact quote]"
+
+**Evidence/Data:** (only if present)
+• [Data point]
+
+**Real-World Examples:** (only if present)
+• [Example]
+
+---
+
+## TOPIC 2: [Topic Title]
+...
+
+Analysis to rewrite:
+{analysis}"""
+
+    def _repair_analysis(self, prompt: Optional[str], analysis: str, max_tokens: int = 4000) -> str:
+        """
+        Fix a markdown analysis in place instead of regenerating it.
+
+        Loose topic headers and quote lines are rewritten locally. A topic
+        cut off at the token limit or missing required sections is asked
+        for again on its own (at most REPAIR_MAX_CALLS requests) and
+        spliced back in; an unrepairable cut-off last topic is dropped. A
+        response with no parseable topics is sent back for reformatting.
+
+        Args:
+            prompt: Prompt the analysis answered; None for local fixes only
+            analysis: Markdown analysis text
+            max_tokens: Output budget the analysis was generated with
+
+        Returns:
+            Repaired analysis text
+        """
+        if not self.repair or not analysis:
+            return analysis
+
+        text, _ = normalize_quotes(normalize_headers(analysis))
+        report = check_analysis(text, max_tokens)
+        stats = {'local_fixes': int(text != analysis), 'repair_calls': 0, 'repaired': 0, 'dropped': 0, 'errors': 0}
+        budget = self.repair_max_calls if prompt else 0
+
+        if not report['topics'] and text.strip() and budget:
+            budget -= 1
+            response = self._repair_call(self._create_reformat_prompt(text), max_tokens, stats)
+            reformatted, _ = normalize_quotes(normalize_headers(response or ''))
+            if parse_topics(reformatted):
+                text = reformatted
+                report = check_analysis(text, max_tokens)
+
+        for index, missing in report['incomplete'][:budget]:
+            topic = parse_topics(text)[index]
+            response = self._repair_call(
+                self._create_topic_repair_prompt(prompt, topic, missing), REPAIR_MAX_TOKENS, stats
+            )
+            fixed = parse_topics(normalize_quotes(normalize_headers(response or ''))[0])
+            if fixed and not missing_sections(fixed[0]):
+                text = splice_topic(text, index, fixed[0]['content'])
+                stats['repaired'] += 1
+                if index == report['topics'] - 1:
+                    report['truncated'] = False
+
+        # A half-written last topic is worse than none, as long as others remain
+        if report['truncated'] and report['topics'] > 1:
+            text = drop_last_topic(text)
+            stats['dropped'] += 1
+
+        with self._stats_lock:
+            self.repair_stats['checked'] += 1
+            for key, value in stats.items():
+                self.repair_stats[key] += value
+            self.repair_stats['unrepaired'] += len(check_analysis(text)['incomplete'])
+        return text
+
+    def _repair_call(self, prompt: str, max_tokens: int, stats: Dict) -> Optional[str]:
+        """
+        Make one repair request, counting it in stats
+
+        A failed request leaves the analysis as it was: the failure is counted in
+        stats['errors'] (its message is in the call ledger) rather than failing an
+        analysis that was already generated. Provider SDKs raise their own
+        exception types, so any error from the call itself is caught here.
+        """
+        stats['repair_calls'] += 1
+        try:
+            return self._call_llm(prompt, max_tokens=max_tokens)
+        except Exception:
+            stats['errors'] += 1
+            return None
+
+    def _create_packed_prompt(self, transcripts: list) -> str:
+        """Create one analysis prompt covering several short transcripts"""
+        sections = '\n\n'.join(
+            f"""==== TRANSCRIPT {number} ====
+Conversation Topic: {transcript['topic']}
+Date: {transcript['date']}
+
+Transcript:
+{transcript['body']}"""
+            for number, transcript in enumerate(transcripts, 1)
+        )
+        if self.output_format == 'json':
+            first_line = '{"topics":[...]}'
+            wrapping = "Write one JSON object per transcript and wrap each exactly like this (the delimiter\nlines are the only text allowed outside the JSON objects):"
+        else:
+            first_line = '## TOPIC 1: [Topic Title]'
+            wrapping = "Restart topic numbering for each transcript and wrap each transcript's analysis exactly like this:"
+        return self._create_prompt_prefix() + f"""
+
+This request contains {len(transcripts)} SEPARATE transcripts, numbered below. Apply the instructions above
+to EACH transcript independently: its topics, insights and quotes must come only from that transcript.
+{wrapping}
+
+{PACKED_FIRST_DELIMITER}
+{first_line}
+...
+=== END ANALYSIS 1 ===
+
+=== BEGIN ANALYSIS 2 ===
+...
+=== END ANALYSIS 2 ===
+
+{sections}"""
+
+    def _analyze_packed(self, transcripts: list) -> list:
+        """
+        Analyze several short prepared transcripts in one LLM request.
+
+        The response is split on its per-transcript delimiters; any transcript
+        whose section is missing or has no topics (e.g. the output was cut
+        off) falls back to its own request.
+        """
+        self._set_call_context(transcripts)
+        sections = {}
+        try:
+            response = self._call_llm(
+                self._create_packed_prompt(transcripts),
+                max_tokens=min(4000 * len(transcripts), self.pack_max_output_tokens)
+            )
+            for match in PACKED_SECTION_PATTERN.finditer(response or ''):
+                number, text = int(match.group(1)), match.group(2)
+                if number in sections:
+                    continue
+                if self.output_format == 'json':
+                    structured = self._parse_structured(text)
+                    if structured:
+                        sections[number] = (render_markdown(structured), structured)
+                else:
+                    # Only local fixes here: a cut-off section has no END delimiter and falls back anyway
+                    text = self._repair_analysis(None, text)
+                    if parse_topics(text):
+                        sections[number] = (text, None)
+        except Exception:
+            sections = {}
 
-    def batch_analyze(self, transcripts: list) -> list:
-        """Analyze multiple transcripts"""
         results = []
-        for transcript in transcripts:
-            result = self.analyze_transcript(transcript)
-            results.append(result)
+        with self._stats_lock:
+            self.pack_stats['requests'] += 1
+            self.pack_stats['transcripts'] += len(transcripts)
+            self.pack_stats['fallbacks'] += sum(1 for n in range(1, len(transcripts) + 1) if n not in sections)
+
+        for number, transcript in enumerate(transcripts, 1):
+            if number in sections:
+                results.append(self._result(transcript, *sections[number]))
+            else:
+                results.append(self._analyze_prepared(transcript))
         return results
+
+    def _pack_units(self, transcripts: list) -> list:
+        """
+        Group prepared transcripts into analysis units (lists of indices).
+
+        Short transcripts are binned, in input order, up to PACK_MAX_TOKENS of
+        transcript text and PACK_MAX_TRANSCRIPTS per request; longer ones get
+        a unit of their own.
+        """
+        units, current, current_tokens = [], [], 0
+        for index, transcript in enumerate(transcripts):
+            tokens = estimate_tokens(transcript['body'])
+            if tokens > self.pack_short_tokens:
+                units.append([index])
+                continue
+
+            if current and (current_tokens + tokens > self.pack_max_tokens or len(current) >= self.pack_max_transcripts):
+                units.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+
+        if current:
+            units.append(current)
+        return units
+
+    def _route(self, transcript: Dict) -> str:
+        """
+        Decide which tier analyzes a prepared transcript: 'main', 'mid' or 'skip'.
+
+        The decision, triage scores and estimated savings are appended to
+        ROUTING_LOG and tallied in routing_stats.
+        """
+        scores = self.triage.score(transcript)
+        if scores['score'] >= self.route_main_score:
+            tier = 'main'
+        elif scores['score'] >= self.route_min_score:
+            tier = 'mid' if self.mid_analyzer else 'main'
+        else:
+            tier = 'skip'
+
+        # Savings vs sending everything to the main model
+        input_tokens = estimate_tokens(self._create_prompt(transcript))
+        output_tokens = int(4000 * DEFAULT_COMPLETION_RATIO)
+        main_price = price_for(self.provider, self.model) or (0.0, 0.0)
+        saved_cost = 0.0
+        if tier == 'skip':
+            saved_cost = (input_tokens * main_price[0] + output_tokens * main_price[1]) / 1_000_000
+        elif tier == 'mid':
+            mid_price = price_for(self.mid_analyzer.provider, self.mid_analyzer.model) or (0.0, 0.0)
+            saved_cost = (input_tokens * (main_price[0] - mid_price[0]) + output_tokens * (main_price[1] - mid_price[1])) / 1_000_000
+
+        model = self.mid_analyzer.model if tier == 'mid' else (None if tier == 'skip' else self.model)
+        with self._stats_lock:
+            self.routing_stats[tier] += 1
+            if tier != 'main':
+                self.routing_stats['saved_tokens'] += input_tokens + output_tokens
+                self.routing_stats['saved_cost'] += saved_cost
+            try:
+                with open(self.routing_log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({
+                        'run': self.run_started,
+                        'id': transcript.get('id'),
+                        'topic': transcript.get('topic'),
+                        'tier': tier,
+                        'model': model,
+                        **scores,
+                        'saved_cost': round(saved_cost, 6)
+                    }) + '\n')
+            except OSError:
+                pass
+
+        return tier
+
+    def _skipped_result(self, transcript: Dict) -> Dict:
+        """Result for a transcript triage decided not to analyze (treated like an error by save paths)"""
+        return {
+            'id': transcript.get('id'),
+            'topic': transcript.get('topic', ''),
+            'date': transcript.get('date', ''),
+            'skipped': True,
+            'error': f"Skipped by triage: score below ROUTE_MIN_SCORE ({self.route_min_score}) for '{self.content_focus}'"
+        }
+
+    def _analyze_unit(self, transcripts: list) -> list:
+        """Analyze prepared transcripts, routing each by triage when enabled and packing the rest"""
+        results = [None] * len(transcripts)
+        main = []
+        for index, transcript in enumerate(transcripts):
+            tier = self._route(transcript) if self.routing else 'main'
+            if tier == 'skip':
+                results[index] = self._skipped_result(transcript)
+            elif tier == 'mid':
+                results[index] = self.mid_analyzer._analyze_prepared(transcript)
+            else:
+                main.append(index)
+
+        if len(main) == 1:
+            results[main[0]] = self._analyze_prepared(transcripts[main[0]])
+        elif main:
+            for index, result in zip(main, self._analyze_packed([transcripts[i] for i in main])):
+                results[index] = result
+        return results
+
+    def _iter_packed(self, transcripts: list, concurrency: int):
+        """iter_analyze with short transcripts packed into shared requests"""
+        prepared = [self._prepare_transcript(transcript) for transcript in transcripts]
+        units = self._pack_units(prepared)
+        unit_of = {index: unit_number for unit_number, unit in enumerate(units) for index in unit}
+
+        def run(unit_number):
+            return self._analyze_unit([prepared[i] for i in units[unit_number]])
+
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='analyze') if concurrency > 1 else None
+        try:
+            if pool:
+                futures = [pool.submit(run, unit_number) for unit_number in range(len(units))]
+            finished = {}
+
+            for index, transcript in enumerate(transcripts):
+                unit_number = unit_of[index]
+                if unit_number not in finished:
+                    try:
+                        finished[unit_number] = futures[unit_number].result() if pool else run(unit_number)
+                    except Exception as e:
+                        finished[unit_number] = [self._error_result(transcripts[i], e) for i in units[unit_number]]
+                yield finished[unit_number][units[unit_number].index(index)]
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def analyze_transcript_stream(self, transcript: Dict, on_topic=None) -> Dict:
+        """
+        Analyze a transcript with streamed generation, handing over each topic as soon as it is complete
+
+        Args:
+            transcript: Transcript to analyze
+            on_topic: Called with each parsed topic dict ('number', 'title', 'content')
+                      while the rest of the analysis is still being generated; with
+                      repair on, topics that may still change follow after repair
+
+        Returns:
+            Same result dict as analyze_transcript
+        """
+        transcript = self._prepare_transcript(transcript)
+
+        tier = self._route(transcript) if self.routing else 'main'
+        if tier == 'skip':
+            return self._skipped_result(transcript)
+        if tier == 'mid':
+            return self.mid_analyzer._stream_prepared(transcript, on_topic)
+        return self._stream_prepared(transcript, on_topic)
+
+    def _stream_prepared(self, transcript: Dict, on_topic=None) -> Dict:
+        self._set_call_context([transcript])
+        # JSON can't be rendered until it is complete: hand over topics at the end
+        if self.output_format == 'json':
+            result = self._analyze_prepared(transcript)
+            if 'error' not in result and on_topic:
+                for topic in parse_topics(result['analysis']):
+                    on_topic(topic)
+            return result
+
+        prompt = self._create_prompt(transcript)
+        parser = TopicStreamParser()
+
+        try:
+            # For long transcripts the map step runs first; only the reduce call streams
+            if self._needs_chunking(transcript, prompt):
+                prompt = self._create_reduce_prompt(transcript)
+
+            # With repair on, a topic is handed over only once repair can no longer change it:
+            # the newest topic may still be cut off and dropped, and one missing sections is
+            # re-requested, so those (and everything after them) wait for the repaired analysis
+            ready = []
+            emitted = 0
+            for delta in self._stream_llm(prompt):
+                ready.extend(parser.feed(delta))
+                while ready and (not self.repair or (len(ready) > 1 and not missing_sections(ready[0]))):
+                    topic = ready.pop(0)
+                    if self.repair:
+                        topic = dict(topic, content=normalize_quotes(topic['content'])[0])
+                    if on_topic:
+                        on_topic(topic)
+                    emitted += 1
+            parser.close()
+
+            analysis = self._repair_analysis(prompt, parser.text)
+            if on_topic:
+                for topic in parse_topics(analysis)[emitted:]:
+                    on_topic(topic)
+            return self._result(transcript, analysis)
+
+        except Exception as e:
+            return self._error_result(transcript, e)
+
+    def batch_requests(self, transcripts: list) -> list:
+        """
+        Build one analysis request per transcript for a provider batch job
+
+        Transcripts are compacted and, with routing, triaged as in a live run
+        (skipped ones are left out). Transcripts that a live run analyzes with
+        map-reduce (too long for one prompt, or with digests) get their map
+        step now, through the provider's regular API, and only the reduce
+        prompt is batched; ones whose map step fails are left out and listed
+        in self.batch_errors. Requests whose response is already in the LLM
+        cache are marked 'cached' and needn't be submitted.
+
+        Returns:
+            List of dicts with 'custom_id', 'prompt', 'max_tokens', 'temperature',
+            'cached', 'mapped' and the 'transcript' metadata needed to save the result
+        """
+        requests = []
+        self.batch_errors = []
+        for index, transcript in enumerate(transcripts):
+            transcript = self._prepare_transcript(transcript)
+            if self.routing and self._route(transcript) == 'skip':
+                continue
+            prompt = self._create_prompt(transcript)
+            mapped = self._needs_chunking(transcript, prompt)
+            if mapped:
+                # Same reduce prompt as a live run, so the batched response is cached under the same key
+                if self.client is None:
+                    self._init_client()
+                self._set_call_context([transcript])
+                try:
+                    prompt = self._create_reduce_prompt(transcript)
+                except Exception as e:
+                    self.batch_errors.append(self._error_result(transcript, e))
+                    continue
+            cache_key = self._cache_key(prompt, 4000, 0.7)
+            requests.append({
+                'custom_id': f"t{index:05d}",
+                'prompt': prompt,
+                'max_tokens': 4000,
+                'temperature': 0.7,
+                'cached': bool(cache_key and self.cache_mode != 'refresh' and self.cache.contains(cache_key)),
+                'mapped': mapped,
+                'transcript': {key: transcript.get(key) for key in ('id', 'topic', 'date', 'subject')}
+            })
+        return requests
+
+    def batch_result(self, request: Dict, response: Optional[str], error: Optional[str] = None) -> Dict:
+        """Turn a batch job response into the same result dict as analyze_transcript, caching it"""
+        transcript = request['transcript']
+        cache_key = self._cache_key(request['prompt'], request['max_tokens'], request['temperature'])
+        if request.get('cached') and cache_key:
+            response = self.cache.get(cache_key)
+            if response is None:
+                error = 'cached response no longer available; re-run this transcript'
+        if error or not response:
+            return self._error_result(transcript, RuntimeError(error or 'empty batch response'))
+
+        if cache_key and not request.get('cached'):
+            self.cache.set(cache_key, response)
+            # Batch APIs bill at about half the list price
+            self._set_call_context([transcript])
+            prompt_tokens, completion_tokens = estimate_tokens(request['prompt']), estimate_tokens(response)
+            cost = call_cost(self.provider, self.model, prompt_tokens, completion_tokens)
+            self._log_call(request['prompt'], response, request['max_tokens'], 0.0, batch=True,
+                           cost=cost * BATCH_PRICE_RATIO if cost is not None else None)
+
+        if self.output_format == 'json':
+            structured = self._parse_structured(response)
+            if not structured:
+                return self._error_result(transcript, ValueError('batch response is not valid structured output'))
+            return self._result(transcript, render_markdown(structured), structured)
+        # Collected results only get local fixes: the analyzer isn't connected to the provider
+        return self._result(transcript, self._repair_analysis(None, response, request['max_tokens']))
+
+    def iter_analyze(self, transcripts: list, concurrency: Optional[int] = None):
+        """
+        Analyze transcripts with bounded concurrency, yielding results in input order
+
+        Up to `concurrency` LLM calls run at once on worker threads (with adaptive
+        concurrency, as many as the controller currently allows). Errors are
+        captured per transcript as 'error' results. Closing the generator early
+        (e.g. the user stops an interactive run) cancels analyses not yet started.
+        With packing enabled, short transcripts share requests (see _pack_units).
+        With several content focuses, each transcript yields one result per focus
+        (see _iter_focuses).
+
+        Args:
+            transcripts: Transcripts to analyze
+            concurrency: Override for self.concurrency
+        """
+        concurrency = max(1, concurrency or self.concurrency)
+        if len(self.focuses) > 1:
+            yield from self._iter_focuses(transcripts, concurrency)
+            return
+
+        if self.limiter:
+            # Enough workers for the controller to grow into; it gates the LLM calls themselves
+            concurrency = max(concurrency, self.limiter.max_limit)
+
+        # Digests replace whole transcripts in the prompt, so there is nothing to pack
+        if self.pack and not self.digests and len(transcripts) > 1:
+            yield from self._iter_packed(transcripts, concurrency)
+            return
+
+        if concurrency == 1 or len(transcripts) <= 1:
+            for transcript in transcripts:
+                yield self.analyze_transcript(transcript)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='analyze')
+        try:
+            futures = [pool.submit(self.analyze_transcript, transcript) for transcript in transcripts]
+            for transcript, future in zip(transcripts, futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield self._error_result(transcript, e)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_focuses(self, transcripts: list, concurrency: int):
+        """
+        iter_analyze for several content focuses in one pass.
+
+        Each transcript is compacted once; then every focus runs its own
+        iter_analyze (with routing, packing and salience selection for that
+        focus) on a thread of its own, splitting `concurrency` between them
+        and sharing the client, response cache and limiter. Results are
+        yielded per transcript, one per focus in self.focuses order, each
+        tagged with its 'focus'.
+        """
+        compacted = [self._compact_transcript(transcript) for transcript in transcripts]
+        analyzers = []
+        for focus in self.focuses:
+            analyzer = self.for_focus(focus)
+            analyzer.compactor = None
+            analyzers.append(analyzer)
+        per_focus = max(1, concurrency // len(analyzers))
+        outputs = [queue.Queue() for _ in analyzers]
+        stop = threading.Event()
+
+        def run(analyzer, output):
+            analyses = analyzer.iter_analyze(compacted, per_focus)
+            done = 0
+            try:
+                for result in analyses:
+                    if stop.is_set():
+                        break
+                    output.put({**result, 'focus': analyzer.content_focus})
+                    done += 1
+            except Exception as e:
+                for transcript in transcripts[done:]:
+                    output.put({**analyzer._error_result(transcript, e), 'focus': analyzer.content_focus})
+            finally:
+                analyses.close()
+
+        for analyzer, output in zip(analyzers, outputs):
+            threading.Thread(target=run, args=(analyzer, output), name='focus', daemon=True).start()
+        try:
+            for _ in transcripts:
+                for output in outputs:
+                    yield output.get()
+        finally:
+            stop.set()
+
+    def batch_analyze(self, transcripts: list, concurrency: Optional[int] = None) -> list:
+        """Analyze multiple transcripts, up to `concurrency` at a time, preserving order (one result per focus)"""
+        return list(self.iter_analyze(transcripts, concurrency))
@@ -0,0 +1,224 @@
+import os
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+from typing import Dict, List, Optional
+from token_estimator import estimate_tokens
+
+# Recognizes the prompt kinds ContentAnalyzer sends
+_PACKED = re.compile(r"This request contains (\d+) SEPARATE transcripts")
+_JSON_MODE = 'Respond with ONLY a minified JSON object'
+_MAP_STEP = 'You are extracting raw material from one part of a conversation transcript'
+_SPEAKER_LINE = re.compile(r"^([A-Z][\w.'\-]*(?:\s+[A-Z][\w.'\-]*){0,3}):\s+(.+)$", re.MULTILINE)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name, '').strip()
+    return float(value) if value else default
+
+
+class FakeRateLimitError(Exception):
+    """Injected provider rate-limit error"""
+    status_code = 429
+
+
+class FakeProviderError(Exception):
+    """Injected provider server error"""
+    status_code = 500
+
+
+class FakeLLMClient:
+    """
+    Deterministic stand-in for a UnifiedLLMClient provider (provider name 'fake').
+
+    Responses are canned analyses in the format the prompt asks for
+    (markdown topics, compact JSON, packed sections or map-step extracts),
+    built from the transcript's own lines so quotes are verbatim. Like a
+    provider with structured outputs, a call given json_schema always
+    answers with one bare JSON object. Each call
+    sleeps for a sampled time-to-first-token (lognormal around a median)
+    plus output tokens / tokens per second, and may raise injected errors.
+
+    Everything is seeded from the prompt and how often it has been sent, so
+    a run is reproducible and a retried call gets a fresh draw. Settings
+    default to the FAKE_LLM_* environment variables.
+    """
+
+    def __init__(
+        self,
+        provider: str = 'fake',
+        latency_median: Optional[float] = None,
+        latency_sigma: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        rate_limit_rate: Optional[float] = None,
+        topics: Optional[int] = None,
+        seed: Optional[int] = None,
+        sleep=time.sleep
+    ):
+        self.provider = provider
+        self.latency_median = latency_median if latency_median is not None else _env_float('FAKE_LLM_LATENCY_MEDIAN', 0.05)
+        self.latency_sigma = latency_sigma if latency_sigma is not None else _env_float('FAKE_LLM_LATENCY_SIGMA', 0.5)
+        self.tokens_per_second = tokens_per_second if tokens_per_second is not None else _env_float('FAKE_LLM_TOKENS_PER_SECOND', 2000)
+        self.error_rate = error_rate if error_rate is not None else _env_float('FAKE_LLM_ERROR_RATE', 0.0)
+        self.rate_limit_rate = rate_limit_rate if rate_limit_rate is not None else _env_float('FAKE_LLM_RATE_LIMIT_RATE', 0.0)
+        self.topics = int(topics if topics is not None else _env_float('FAKE_LLM_TOPICS', 3))
+        self.seed = int(seed if seed is not None else _env_float('FAKE_LLM_SEED', 0))
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._sent: Dict[str, int] = {}
+        self.calls: List[Dict] = []
+        # Usage of each thread's last call, so concurrent calls don't overwrite each other's
+        self._usage = threading.local()
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        with self._lock:
+            attempt = self._sent.get(digest, 0)
+            self._sent[digest] = attempt + 1
+        return random.Random(f"{self.seed}:{digest}:{attempt}")
+
+    def _quotes(self, text: str, rng: random.Random, count: int) -> List[tuple]:
+        lines = [(speaker, words.strip()) for speaker, words in _SPEAKER_LINE.findall(text) if len(words.split()) > 3]
+        if not lines:
+            return [('Speaker', 'We should write about this.')] * count
+        return [rng.choice(lines) for _ in range(count)]
+
+    def _markdown(self, text: str, rng: random.Random, max_tokens: int) -> str:
+        topics = []
+        for number in range(1, self.topics + 1):
+            quotes = self._quotes(text, rng, 2)
+            topics.append('\n'.join([
+                f"## TOPIC {number}: Synthetic Topic {number} ({rng.randint(100, 999)})",
+                '',
+                f"**Description:** A canned description of topic {number} for benchmarking.",
+                '',
+                '**Key Insights:**',
+                *(f"• Insight {number}.{i} about the conversation" for i in range(1, 4)),
+                '',
+                '**Notable Quotes:**',
+                *(f"> **{speaker}:** \"{quote}\"\n" for speaker, quote in quotes),
+                '**Evidence/Data:**',
+                f"• {rng.randint(2, 90)}% of a made-up metric",
+                '',
+                '**Real-World Examples:**',
+                '• An example company'
+            ]))
+        return self._truncate('\n\n---\n\n'.join(topics), max_tokens)
+
+    def _json(self, text: str, rng: random.Random, max_tokens: int) -> str:
+        topics = []
+        for number in range(1, self.topics + 1):
+            topics.append({
+                't': f"Synthetic Topic {number} ({rng.randint(100, 999)})",
+                'd': f"A canned description of topic {number} for benchmarking.",
+                'i': [f"Insight {number}.{i} about the conversation" for i in range(1, 4)],
+                'q': [[speaker, quote] for speaker, quote in self._quotes(text, rng, 2)],
+                'e': [f"{rng.randint(2, 90)}% of a made-up metric"],
+                'x': ['An example company']
+            })
+        return self._truncate(json.dumps({'topics': topics}, separators=(',', ':')), max_tokens)
+
+    def _extract(self, text: str, rng: random.Random, max_tokens: int) -> str:
+        quotes = self._quotes(text, rng, 3)
+        return self._truncate('\n'.join([
+            '### Insights',
+            '• An extracted insight',
+            '',
+            '### Quotes',
+            *(f"> **{speaker}:** \"{quote}\"" for speaker, quote in quotes),
+            '',
+            '### Evidence',
+            f"• {rng.randint(2, 90)}% of a made-up metric"
+        ]), max_tokens)
+
+    @staticmethod
+    def _truncate(text: str, max_tokens: int) -> str:
+        # Like a real model, stop at the output budget (about 4 characters per token)
+        return text[:max_tokens * 4]
+
+    def _respond(self, prompt: str, max_tokens: int, json_schema: Optional[Dict] = None) -> tuple:
+        """Pick the response and how long producing it takes (one bare JSON object when schema-constrained)"""
+        rng = self._rng(prompt)
+
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            raise FakeRateLimitError('429 rate limit exceeded (injected)')
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise FakeProviderError('500 internal server error (injected)')
+
+        json_mode = _JSON_MODE in prompt
+        packed = _PACKED.search(prompt)
+        if json_schema:
+            response = self._json(prompt, rng, max_tokens)
+        elif _MAP_STEP in prompt:
+            response = self._extract(prompt, rng, max_tokens)
+        elif packed:
+            sections = re.split(r"==== TRANSCRIPT \d+ ====", prompt)[1:]
+            response = '\n\n'.join(
+                f"=== BEGIN ANALYSIS {number} ===\n"
+                f"{(self._json if json_mode else self._markdown)(section, rng, max_tokens)}\n"
+                f"=== END ANALYSIS {number} ==="
+                for number, section in enumerate(sections, 1)
+            )
+            response = self._truncate(response, max_tokens)
+        elif json_mode:
+            response = self._json(prompt, rng, max_tokens)
+        else:
+            response = self._markdown(prompt, rng, max_tokens)
+
+        first_token = self.latency_median * math.exp(rng.gauss(0, self.latency_sigma))
+        return response, first_token
+
+    @property
+    def last_usage(self) -> Optional[Dict]:
+        """Token usage of the calling thread's last call"""
+        return getattr(self._usage, 'usage', None)
+
+    def _record(self, prompt: str, response: str, seconds: float):
+        usage = {'prompt_tokens': estimate_tokens(prompt), 'completion_tokens': estimate_tokens(response)}
+        self._usage.usage = usage
+        with self._lock:
+            self.calls.append({'seconds': seconds, **usage})
+
+    def generate(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.7,
+                 json_schema: Optional[Dict] = None, **kwargs) -> str:
+        started = time.monotonic()
+        response, first_token = self._respond(prompt, max_tokens, json_schema)
+        self._sleep(first_token + estimate_tokens(response) / self.tokens_per_second)
+        self._record(prompt, response, time.monotonic() - started)
+        return response
+
+    def generate_stream(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.7,
+                        json_schema: Optional[Dict] = None, **kwargs):
+        started = time.monotonic()
+        response, first_token = self._respond(prompt, max_tokens, json_schema)
+        self._sleep(first_token)
+        for start in range(0, len(response), 200):
+            delta = response[start:start + 200]
+            self._sleep(estimate_tokens(delta) / self.tokens_per_second)
+            yield delta
+        self._record(prompt, response, time.monotonic() - started)
+
+
+# One client per provider name, so call records and retry draws are shared like a real connection
+_clients: Dict[str, FakeLLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider: str = 'fake', **kwargs) -> FakeLLMClient:
+    """Return the shared fake client for a provider name (same signature as llm_client.get_client)"""
+    with _clients_lock:
+        if provider not in _clients:
+            _clients[provider] = FakeLLMClient(provider=provider, **kwargs)
+        return _clients[provider]
+
+
+def reset_clients():
+    """Forget shared fake clients (e.g. between benchmark runs with different settings)"""
+    with _clients_lock:
+        _clients.clear()
@@ -1,59 +1,33 @@
 import os
-import pickle
 import re
 from datetime import datetime
 from typing import List, Dict, Optional
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import base64
 from dotenv import load_dotenv
 from google_docs_client import GoogleDocsClient
+from google_services import get_service
+from api_executor import execute, GMAIL_UNITS
 
 load_dotenv()
 
-SCOPES = [
-    'https://www.googleapis.com/auth/gmail.readonly',
-    'https://www.googleapis.com/auth/drive.readonly',
-    'https://www.googleapis.com/auth/documents',  # For creating/editing Google Docs
-    'https://www.googleapis.com/auth/drive.file'   # For creating files in Drive
-]
-
 class GmailClient:
-    def __init__(self, start_date: Optional[str] = None, label: Optional[str] = None):
-        self.service = None
+    def __init__(self, start_date: Optional[str] = None, label: Optional[str] = None, connect: bool = True):
         self.start_date = start_date or os.getenv('START_DATE')
         self.label = label
         self.docs_client = None
-        self.authenticate()
-
-    def authenticate(self):
-        """Authenticate with Gmail API"""
-        creds = None
+        # connect=False gives a client for query building and parsing only (used by the async layer)
+        if connect:
+            self.authenticate()
 
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                creds = pickle.load(token)
+    @property
+    def service(self):
+        """Gmail service for the calling thread (services are not thread-safe)"""
+        return get_service('gmail', 'v1')
 
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists('credentials.json'):
-                    raise FileNotFoundError(
-                        "credentials.json not found. Please download it from Google Cloud Console.\n"
-                        "See README for instructions."
-                    )
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    'credentials.json', SCOPES)
-                creds = flow.run_local_server(port=0)
-
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
-
-        self.service = build('gmail', 'v1', credentials=creds)
+    def authenticate(self):
+        """Authenticate with Gmail API using the shared service registry"""
+        get_service('gmail', 'v1')
         # Initialize Google Docs client with same credentials
         try:
             self.docs_client = GoogleDocsClient()
@@ -119,21 +93,21 @@ class GmailClient:
         try:
             query = self._build_date_query()
 
-            results = self.service.users().messages().list(
+            results = execute(self.service.users().messages().list(
                 userId='me',
                 q=query,
                 maxResults=max_results
-            ).execute()
+            ), 'gmail', cost=GMAIL_UNITS['messages.list'])
 
             messages = results.get('messages', [])
             transcripts = []
 
             for message in messages:
-                msg_data = self.service.users().messages().get(
+                msg_data = execute(self.service.users().messages().get(
                     userId='me',
                     id=message['id'],
                     format='full'
-                ).execute()
+                ), 'gmail', cost=GMAIL_UNITS['messages.get'])
 
                 # Gmail API has already filtered by label in the query, so no need to verify again
 
@@ -191,7 +165,7 @@ class GmailClient:
         try:
             # Get all labels for the user (cached to avoid repeated API calls)
             if not hasattr(self, '_label_cache'):
-                labels_result = self.service.users().labels().list(userId='me').execute()
+                labels_result = execute(self.service.users().labels().list(userId='me'), 'gmail', cost=GMAIL_UNITS['labels.list'])
                 self._label_cache = {label['id']: label['name'] for label in labels_result.get('labels', [])}
 
             # Normalize target label: convert to lowercase and normalize separators
@@ -1,36 +1,30 @@
-import os
-import pickle
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+import google_services
+from api_executor import execute
 
 class GoogleDocsClient:
-    def __init__(self, credentials_path='token.pickle'):
-        """Initialize Google Docs client using existing credentials"""
-        self.service = None
-        self.drive_service = None
-        self.load_credentials(credentials_path)
+    def __init__(self, credentials_path='token.pickle', connect=True, registry=None):
+        """Initialize Google Docs client using existing credentials (from the shared service registry by default)"""
+        self.credentials_path = credentials_path
+        self.registry = registry if registry is not None else google_services.registry
+        # connect=False gives a client for content extraction only (used by the async layer)
+        if connect:
+            self.load_credentials(credentials_path)
+
+    @property
+    def service(self):
+        """Docs service for the calling thread (services are not thread-safe)"""
+        return self.registry.get_service('docs', 'v1', self.credentials_path, allow_flow=False)
+
+    @property
+    def drive_service(self):
+        """Drive service for the calling thread"""
+        return self.registry.get_service('drive', 'v3', self.credentials_path, allow_flow=False)
 
     def load_credentials(self, credentials_path):
-        """Load credentials from pickle file"""
-        if not os.path.exists(credentials_path):
-            raise FileNotFoundError(
-                f"Credentials file '{credentials_path}' not found. "
-                "Please authenticate with Gmail first."
-            )
-
-        with open(credentials_path, 'rb') as token:
-            creds = pickle.load(token)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-                with open(credentials_path, 'wb') as token:
-                    pickle.dump(creds, token)
-
-        self.service = build('docs', 'v1', credentials=creds)
-        self.drive_service = build('drive', 'v3', credentials=creds)
+        """Get the shared Docs and Drive services for the existing credentials"""
+        self.registry.get_service('docs', 'v1', credentials_path, allow_flow=False)
+        self.registry.get_service('drive', 'v3', credentials_path, allow_flow=False)
 
     def get_plain_document_content(self, document_id: str) -> str:
         """
@@ -45,9 +39,9 @@ class GoogleDocsClient:
         """
         try:
             # Get document without tabs content for better performance
-            document = self.service.documents().get(
+            document = execute(self.service.documents().get(
                 documentId=document_id
-            ).execute()
+            ), 'docs_read')
 
             # Extract content from document body
             doc_content = document.get('body', {}).get('content', [])
@@ -73,63 +67,77 @@ class GoogleDocsClient:
         """
         try:
             # Get document with tabs content
-            document = self.service.documents().get(
+            document = execute(self.service.documents().get(
                 documentId=document_id,
                 includeTabsContent=True
-            ).execute()
+            ), 'docs_read')
 
-            all_content = []
+            return self.extract_document_text(document, prefer_transcript)
 
-            # Check if document has tabs (newer format)
-            if 'tabs' in document:
-                transcript_tab = None
-                notes_tab = None
+        except HttpError as error:
+            print(f'An error occurred fetching document {document_id}: {error}')
+            return ''
 
-                # Find Transcript and Notes tabs
-                for tab in document['tabs']:
-                    tab_title = tab.get('tabProperties', {}).get('title', '')
-
-                    if tab_title.lower() == 'transcript':
-                        transcript_tab = tab
-                    elif tab_title.lower() == 'notes':
-                        notes_tab = tab
-
-                # Prefer Transcript tab if available, otherwise use Notes tab
-                selected_tab = None
-                if prefer_transcript and transcript_tab:
-                    selected_tab = transcript_tab
-                    print(f'  → Processing Transcript Tab')
-                elif notes_tab:
-                    selected_tab = notes_tab
-                    if transcript_tab:
-                        print(f'  → Using Notes tab (Transcript tab exists but prefer_transcript=False)')
-                    else:
-                        print(f'  → Using Notes tab (no Transcript tab available)')
-
-                if selected_tab:
-                    doc_content = selected_tab.get('documentTab', {}).get('body', {}).get('content', [])
-                    all_content.extend(self._extract_content_from_elements(doc_content))
+    def extract_document_text(self, document: dict, prefer_transcript: bool = True) -> str:
+        """
+        Extract text from a Docs API document resource fetched with includeTabsContent.
+        Prefers the 'Transcript' tab if available, falls back to 'Notes' tab.
+
+        Args:
+            document: Document resource returned by documents.get
+            prefer_transcript: If True, prefer the Transcript tab over Notes tab (default: True)
+
+        Returns:
+            str: The full text content of the transcript or notes
+        """
+        all_content = []
+
+        # Check if document has tabs (newer format)
+        if 'tabs' in document:
+            transcript_tab = None
+            notes_tab = None
+
+            # Find Transcript and Notes tabs
+            for tab in document['tabs']:
+                tab_title = tab.get('tabProperties', {}).get('title', '')
+
+                if tab_title.lower() == 'transcript':
+                    transcript_tab = tab
+                elif tab_title.lower() == 'notes':
+                    notes_tab = tab
+
+            # Prefer Transcript tab if available, otherwise use Notes tab
+            selected_tab = None
+            if prefer_transcript and transcript_tab:
+                selected_tab = transcript_tab
+                print(f'  → Processing Transcript Tab')
+            elif notes_tab:
+                selected_tab = notes_tab
+                if transcript_tab:
+                    print(f'  → Using Notes tab (Transcript tab exists but prefer_transcript=False)')
                 else:
-                    # No Transcript or Notes tab found, use first tab
-                    print(f'Warning: Neither Transcript nor Notes tab found. Available tabs:')
-                    for tab in document['tabs']:
-                        tab_title = tab.get('tabProperties', {}).get('title', 'Untitled')
-                        print(f'  - {tab_title}')
-                    print('Using first tab as fallback...')
-
-                    first_tab = document['tabs'][0]
-                    doc_content = first_tab.get('documentTab', {}).get('body', {}).get('content', [])
-                    all_content.extend(self._extract_content_from_elements(doc_content))
+                    print(f'  → Using Notes tab (no Transcript tab available)')
+
+            if selected_tab:
+                doc_content = selected_tab.get('documentTab', {}).get('body', {}).get('content', [])
+                all_content.extend(self._extract_content_from_elements(doc_content))
             else:
-                # Legacy format (no tabs)
-                doc_content = document.get('body', {}).get('content', [])
+                # No Transcript or Notes tab found, use first tab
+                print(f'Warning: Neither Transcript nor Notes tab found. Available tabs:')
+                for tab in document['tabs']:
+                    tab_title = tab.get('tabProperties', {}).get('title', 'Untitled')
+                    print(f'  - {tab_title}')
+                print('Using first tab as fallback...')
+
+                first_tab = document['tabs'][0]
+                doc_content = first_tab.get('documentTab', {}).get('body', {}).get('content', [])
                 all_content.extend(self._extract_content_from_elements(doc_content))
+        else:
+            # Legacy format (no tabs)
+            doc_content = document.get('body', {}).get('content', [])
+            all_content.extend(self._extract_content_from_elements(doc_content))
 
-            return ''.join(all_content)
-
-        except HttpError as error:
-            print(f'An error occurred fetching document {document_id}: {error}')
-            return ''
+        return ''.join(all_content)
 
     def _extract_content_from_elements(self, elements):
         """Helper method to extract text from document elements"""
@@ -171,7 +179,7 @@ class GoogleDocsClient:
             return match.group(1)
         return url  # Return as-is if not a URL pattern
 
-    def create_document(self, title: str, content: str, folder_id: str = None) -> dict:
+    def create_document(self, title: str, content: str, folder_id: str = None, app_properties: dict = None) -> dict:
         """
         Create a new Google Doc with markdown-formatted content converted to proper formatting
 
@@ -179,13 +187,15 @@ class GoogleDocsClient:
             title: Document title
             content: Markdown content to convert and insert
             folder_id: Optional Google Drive folder ID to place the document
+            app_properties: Optional Drive appProperties to tag the document with
 
         Returns:
             dict: Document metadata with 'id' and 'url'
         """
         try:
             # Create a new document
-            doc = self.service.documents().create(body={'title': title}).execute()
+            # Writes aren't retried after a 5xx or timeout: the first attempt may have gone through
+            doc = execute(self.service.documents().create(body={'title': title}), 'docs_write', idempotent=False)
             doc_id = doc.get('documentId')
 
             # Parse markdown and generate formatting requests
@@ -193,15 +203,22 @@ class GoogleDocsClient:
 
             # Apply all formatting in a single batch
             if requests:
-                self.service.documents().batchUpdate(
+                execute(self.service.documents().batchUpdate(
                     documentId=doc_id,
                     body={'requests': requests}
-                ).execute()
+                ), 'docs_write', idempotent=False)
 
             # Move to folder if specified
             if folder_id:
                 self._move_to_folder(doc_id, folder_id)
 
+            if app_properties:
+                execute(self.drive_service.files().update(
+                    fileId=doc_id,
+                    body={'appProperties': app_properties},
+                    fields='id'
+                ), 'drive', idempotent=False)
+
             doc_url = f"https://docs.google.com/document/d/{doc_id}/edit"
 
             return {
@@ -214,6 +231,108 @@ class GoogleDocsClient:
             print(f'An error occurred creating document: {error}')
             return None
 
+    def update_document(self, document_id: str, content: str, title: str = None, app_properties: dict = None) -> dict:
+        """
+        Replace the content of an existing Google Doc in place
+
+        Args:
+            document_id: The ID of the document to update
+            content: Markdown content to convert and insert
+            title: Optional new document title
+            app_properties: Optional Drive appProperties to update
+
+        Returns:
+            dict: Document metadata with 'id' and 'url', or None on failure
+        """
+        try:
+            # Find the end of the current body so it can be cleared
+            document = execute(self.service.documents().get(
+                documentId=document_id,
+                fields='body(content(endIndex))'
+            ), 'docs_read')
+            body_content = document.get('body', {}).get('content', [])
+            end_index = body_content[-1]['endIndex'] if body_content else 1
+
+            requests = []
+            # The final newline of the body cannot be deleted
+            if end_index > 2:
+                requests.append({
+                    'deleteContentRange': {
+                        'range': {'startIndex': 1, 'endIndex': end_index - 1}
+                    }
+                })
+            requests.extend(self._convert_markdown_to_docs_requests(content))
+
+            execute(self.service.documents().batchUpdate(
+                documentId=document_id,
+                body={'requests': requests}
+            ), 'docs_write', idempotent=False)
+
+            file_metadata = {}
+            if title:
+                file_metadata['name'] = title
+            if app_properties:
+                file_metadata['appProperties'] = app_properties
+            if file_metadata:
+                execute(self.drive_service.files().update(
+                    fileId=document_id,
+                    body=file_metadata,
+                    fields='id'
+                ), 'drive', idempotent=False)
+
+            return {
+                'id': document_id,
+                'url': f"https://docs.google.com/document/d/{document_id}/edit",
+                'title': title
+            }
+
+        except HttpError as error:
+            print(f'An error occurred updating document {document_id}: {error}')
+            return None
+
+    def list_tagged_documents(self, folder_id: str, property_key: str) -> list:
+        """
+        List documents carrying a given Drive appProperty, with pagination
+
+        Args:
+            folder_id: Folder to search (None searches all accessible docs)
+            property_key: appProperties key that must be present
+
+        Returns:
+            list: File dicts with id, name, modifiedTime and appProperties
+        """
+        query_parts = [
+            "mimeType='application/vnd.google-apps.document'",
+            "trashed=false"
+        ]
+        if folder_id:
+            query_parts.insert(0, f"'{folder_id}' in parents")
+        query = ' and '.join(query_parts)
+
+        files = []
+        try:
+            page_token = None
+            while True:
+                results = execute(self.drive_service.files().list(
+                    q=query,
+                    pageSize=1000,
+                    fields="nextPageToken, files(id, name, modifiedTime, appProperties)",
+                    pageToken=page_token
+                ), 'drive')
+
+                for item in results.get('files', []):
+                    if property_key in item.get('appProperties', {}):
+                        files.append(item)
+
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+
+        except HttpError as error:
+            print(f'An error occurred listing output documents: {error}')
+
+        return files
+
     def _convert_markdown_to_docs_requests(self, content: str) -> list:
         """
         Convert markdown content to Google Docs API formatting requests
@@ -333,20 +452,20 @@ class GoogleDocsClient:
         """
         try:
             # Get the file's current parents
-            file = self.drive_service.files().get(
+            file = execute(self.drive_service.files().get(
                 fileId=document_id,
                 fields='parents'
-            ).execute()
+            ), 'drive')
 
             previous_parents = ",".join(file.get('parents', []))
 
             # Move the file to the new folder
-            self.drive_service.files().update(
+            execute(self.drive_service.files().update(
                 fileId=document_id,
                 addParents=folder_id,
                 removeParents=previous_parents,
                 fields='id, parents'
-            ).execute()
+            ), 'drive', idempotent=False)
 
         except HttpError as error:
             print(f'An error occurred moving document to folder: {error}')
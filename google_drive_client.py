@@ -1,68 +1,40 @@
 import os
-import pickle
 from typing import List, Dict, Optional
 from datetime import datetime
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
+import google_services
+from api_executor import execute
 
 load_dotenv()
 
-# Scopes required for Drive and Docs access
-SCOPES = [
-    'https://www.googleapis.com/auth/gmail.readonly',
-    'https://www.googleapis.com/auth/drive.readonly',
-    'https://www.googleapis.com/auth/documents',  # For creating/editing Google Docs
-    'https://www.googleapis.com/auth/drive.file'   # For creating files in Drive
-]
-
 class GoogleDriveClient:
-    def __init__(self, folder_id: Optional[str] = None, credentials_path='token.pickle'):
+    def __init__(self, folder_id: Optional[str] = None, credentials_path='token.pickle', connect: bool = True,
+                 registry: Optional[google_services.ServiceRegistry] = None):
         """
         Initialize Google Drive client using existing credentials
 
         Args:
             folder_id: Google Drive folder ID to scan (optional, can be set from env)
             credentials_path: Path to the credentials pickle file
+            connect: If False, skip authentication (query building only, used by the async layer)
+            registry: Service registry to get per-thread services from (default: the shared one)
         """
-        self.service = None
+        self.credentials_path = credentials_path
+        self.registry = registry if registry is not None else google_services.registry
         self.folder_id = folder_id or os.getenv('DRIVE_FOLDER_ID')
         self.recursive = os.getenv('DRIVE_RECURSIVE', 'false').lower() == 'true'
-        self.load_credentials(credentials_path)
+        if connect:
+            self.load_credentials(credentials_path)
+
+    @property
+    def service(self):
+        """Drive service for the calling thread (services are not thread-safe)"""
+        return self.registry.get_service('drive', 'v3', self.credentials_path)
 
     def load_credentials(self, credentials_path):
-        """Load or create credentials with OAuth flow"""
-        creds = None
-
-        # Load existing credentials if available
-        if os.path.exists(credentials_path):
-            with open(credentials_path, 'rb') as token:
-                creds = pickle.load(token)
-
-        # If credentials are invalid or don't exist, authenticate
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                # Refresh expired credentials
-                creds.refresh(Request())
-            else:
-                # Run OAuth flow to get new credentials
-                if not os.path.exists('credentials.json'):
-                    raise FileNotFoundError(
-                        "credentials.json not found. Please download it from Google Cloud Console.\n"
-                        "See README for instructions."
-                    )
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    'credentials.json', SCOPES)
-                creds = flow.run_local_server(port=0)
-
-            # Save credentials for future use
-            with open(credentials_path, 'wb') as token:
-                pickle.dump(creds, token)
-
-        self.service = build('drive', 'v3', credentials=creds)
+        """Get the shared Drive service, running the OAuth flow if needed"""
+        self.registry.get_service('drive', 'v3', credentials_path)
 
     def get_documents_in_folder(
         self,
@@ -94,34 +66,17 @@ class GoogleDriveClient:
 
         try:
             documents = []
-
-            # Build query
-            query_parts = [
-                f"'{folder_id}' in parents",
-                "mimeType='application/vnd.google-apps.document'",
-                "trashed=false"
-            ]
-
-            # Add date filter if provided
-            if modified_after:
-                try:
-                    dt = datetime.strptime(modified_after, '%m%d%Y')
-                    date_str = dt.strftime('%Y-%m-%dT%H:%M:%S')
-                    query_parts.append(f"modifiedTime >= '{date_str}'")
-                except ValueError:
-                    print(f"Warning: Invalid date format '{modified_after}'. Expected MMDDYYYY")
-
-            query = ' and '.join(query_parts)
+            query = self._build_documents_query(folder_id, modified_after)
 
             # Fetch documents with pagination
             page_token = None
             while True:
-                results = self.service.files().list(
+                results = execute(self.service.files().list(
                     q=query,
                     pageSize=100,
                     fields="nextPageToken, files(id, name, modifiedTime, createdTime)",
                     pageToken=page_token
-                ).execute()
+                ), 'drive')
 
                 items = results.get('files', [])
 
@@ -151,6 +106,25 @@ class GoogleDriveClient:
             print(f'An error occurred accessing Drive folder: {error}')
             return []
 
+    def _build_documents_query(self, folder_id: str, modified_after: Optional[str] = None) -> str:
+        """Build the Drive query for Google Docs directly inside a folder"""
+        query_parts = [
+            f"'{folder_id}' in parents",
+            "mimeType='application/vnd.google-apps.document'",
+            "trashed=false"
+        ]
+
+        # Add date filter if provided
+        if modified_after:
+            try:
+                dt = datetime.strptime(modified_after, '%m%d%Y')
+                date_str = dt.strftime('%Y-%m-%dT%H:%M:%S')
+                query_parts.append(f"modifiedTime >= '{date_str}'")
+            except ValueError:
+                print(f"Warning: Invalid date format '{modified_after}'. Expected MMDDYYYY")
+
+        return ' and '.join(query_parts)
+
     def get_documents_recursive(
         self,
         folder_id: Optional[str] = None,
@@ -196,10 +170,10 @@ class GoogleDriveClient:
             # Find subfolders
             try:
                 query = f"'{current_folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-                results = self.service.files().list(
+                results = execute(self.service.files().list(
                     q=query,
                     fields="files(id, name)"
-                ).execute()
+                ), 'drive')
 
                 for folder in results.get('files', []):
                     subfolder_path = f"{current_path}/{folder['name']}" if current_path else folder['name']
@@ -0,0 +1,175 @@
+import os
+import json
+import pickle
+import threading
+from typing import Dict, Tuple
+import httplib2
+from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+# Scopes shared by the Gmail, Docs and Drive clients
+SCOPES = [
+    'https://www.googleapis.com/auth/gmail.readonly',
+    'https://www.googleapis.com/auth/drive.readonly',
+    'https://www.googleapis.com/auth/documents',  # For creating/editing Google Docs
+    'https://www.googleapis.com/auth/drive.file'   # For creating files in Drive
+]
+
+# Socket timeout (seconds) for each worker's HTTP transport
+HTTP_TIMEOUT = int(os.getenv('GOOGLE_API_TIMEOUT', '60'))
+
+
+class SharedCredentialsHttp(AuthorizedHttp):
+    """
+    AuthorizedHttp for one worker thread whose credentials are shared process-wide.
+
+    Each instance owns its own httplib2.Http, so keep-alive connections are
+    reused within a thread but never shared across threads. Token refreshes
+    are serialized so concurrent workers refresh the shared credentials once.
+    """
+
+    def __init__(self, credentials, refresh_lock, timeout: int = HTTP_TIMEOUT):
+        super().__init__(credentials, http=httplib2.Http(timeout=timeout))
+        self._refresh_lock = refresh_lock
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        if not self.credentials.valid:
+            with self._refresh_lock:
+                if not self.credentials.valid:
+                    self.credentials.refresh(self._request)
+        return super().request(uri, method, body=body, headers=headers, **kwargs)
+
+
+class ServiceRegistry:
+    """
+    Process-wide registry of Google API credentials and service objects.
+
+    Credentials are loaded once per token file and discovery documents are
+    parsed once from the copies bundled with googleapiclient, so clients that share
+    the registry never repeat the unpickle, refresh or discovery work.
+
+    googleapiclient services and their httplib2 connections are not
+    thread-safe, so each thread gets its own service objects and HTTP
+    transport; all threads share the same credentials. A thread's transports
+    live in thread-local storage and are released when the thread exits.
+    """
+
+    def __init__(self, credentials=None):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._credentials: Dict[str, object] = {}
+        self._discovery_docs: Dict[Tuple[str, str], dict] = {}
+        self._local = threading.local()
+        if credentials is not None:
+            self._credentials['token.pickle'] = credentials
+
+    def get_credentials(self, credentials_path: str = 'token.pickle', allow_flow: bool = True):
+        """
+        Load, refresh or create OAuth credentials once per token file
+
+        Args:
+            credentials_path: Path to the credentials pickle file
+            allow_flow: Run the browser OAuth flow if no usable token exists.
+                        If False, a missing token raises FileNotFoundError.
+        """
+        with self._lock:
+            creds = self._credentials.get(credentials_path)
+            if creds is not None:
+                return creds
+
+            if os.path.exists(credentials_path):
+                with open(credentials_path, 'rb') as token:
+                    creds = pickle.load(token)
+            elif not allow_flow:
+                raise FileNotFoundError(
+                    f"Credentials file '{credentials_path}' not found. "
+                    "Please authenticate with Gmail first."
+                )
+
+            if not creds or not creds.valid:
+                if creds and creds.expired and creds.refresh_token:
+                    creds.refresh(Request())
+                else:
+                    if not os.path.exists('credentials.json'):
+                        raise FileNotFoundError(
+                            "credentials.json not found. Please download it from Google Cloud Console.\n"
+                            "See README for instructions."
+                        )
+                    flow = InstalledAppFlow.from_client_secrets_file(
+                        'credentials.json', SCOPES)
+                    creds = flow.run_local_server(port=0)
+
+                with open(credentials_path, 'wb') as token:
+                    pickle.dump(creds, token)
+
+            self._credentials[credentials_path] = creds
+            return creds
+
+    def get_discovery_document(self, api: str, version: str) -> dict:
+        """Return the parsed discovery document bundled with googleapiclient (never fetched over the network)"""
+        with self._lock:
+            key = (api, version)
+            if key in self._discovery_docs:
+                return self._discovery_docs[key]
+
+            content = get_static_doc(api, version)
+            if content is None:
+                raise RuntimeError(
+                    f"No bundled discovery document for {api} {version}; "
+                    "upgrade google-api-python-client (pip install -U google-api-python-client)"
+                )
+
+            doc = json.loads(content)
+            self._discovery_docs[key] = doc
+            return doc
+
+    def _thread_cache(self) -> Dict[str, dict]:
+        """Return this thread's transports and services"""
+        cache = getattr(self._local, 'cache', None)
+        if cache is None:
+            cache = self._local.cache = {'http': {}, 'services': {}}
+        return cache
+
+    def get_http(self, credentials_path: str = 'token.pickle', allow_flow: bool = True) -> SharedCredentialsHttp:
+        """Return the calling thread's authorized HTTP transport"""
+        transports = self._thread_cache()['http']
+        http = transports.get(credentials_path)
+        if http is None:
+            creds = self.get_credentials(credentials_path, allow_flow=allow_flow)
+            http = transports[credentials_path] = SharedCredentialsHttp(creds, self._refresh_lock)
+        return http
+
+    def get_service(self, api: str, version: str, credentials_path: str = 'token.pickle', allow_flow: bool = True):
+        """Return the calling thread's service object for an API, building it on first use"""
+        services = self._thread_cache()['services']
+        key = (api, version, credentials_path)
+        service = services.get(key)
+        if service is None:
+            service = services[key] = build_from_document(
+                self.get_discovery_document(api, version),
+                http=self.get_http(credentials_path, allow_flow=allow_flow)
+            )
+        return service
+
+    def reset(self):
+        """Drop all cached credentials, transports and services (discovery documents are kept)"""
+        with self._lock:
+            self._credentials.clear()
+            self._local = threading.local()
+
+
+# Default registry shared by every client in the process
+registry = ServiceRegistry()
+
+
+def get_credentials(credentials_path: str = 'token.pickle', allow_flow: bool = True):
+    """Return shared OAuth credentials from the default registry"""
+    return registry.get_credentials(credentials_path, allow_flow=allow_flow)
+
+
+def get_service(api: str, version: str, credentials_path: str = 'token.pickle', allow_flow: bool = True):
+    """Return the calling thread's Google API service from the default registry"""
+    return registry.get_service(api, version, credentials_path, allow_flow=allow_flow)
@@ -0,0 +1,338 @@
+import os
+import time
+import queue
+import inspect
+import statistics
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from run_estimator import DEFAULT_SPEED, DEFAULT_COMPLETION_RATIO
+from token_estimator import estimate_tokens
+
+# Latency samples needed before the hedge delay is taken from history
+MIN_HEDGE_SAMPLES = 10
+
+# A slow model's deadline is at least this multiple of its expected time for the
+# full output budget (e.g. local Qwen at ~11 tok/s needs ~6 minutes for 4000 tokens)
+DEADLINE_SPEED_MARGIN = 2.0
+
+# Seconds before trying again to start a hedge the concurrency limiter had no room for
+HEDGE_RETRY_INTERVAL = 1.0
+
+
+def parse_targets(value: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse a comma-separated 'provider' or 'provider:model' list (LLM_FALLBACKS)"""
+    targets = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        provider, _, model = item.partition(':')
+        targets.append((provider.strip().lower(), model.strip() or None))
+    return targets
+
+
+class LLMTarget:
+    """One provider/model in the call chain; its client is created on first use"""
+
+    def __init__(self, provider: str, model: Optional[str], client=None, client_factory: Optional[Callable] = None):
+        self.provider = provider
+        self.model = model or provider
+        self.client = client
+        self._client_factory = client_factory
+        self._parameters = {}
+        self._lock = threading.Lock()
+
+    def get_client(self):
+        with self._lock:
+            if self.client is None:
+                self.client = self._client_factory(self.provider)
+            return self.client
+
+    def _accepted(self, method, kwargs: Dict) -> Dict:
+        """Drop optional arguments a client method doesn't accept"""
+        name = method.__name__
+        if name not in self._parameters:
+            # Empty set: the signature is unknown or takes **kwargs, so pass everything
+            try:
+                parameters = inspect.signature(method).parameters
+            except (TypeError, ValueError):
+                parameters = {}
+            accepts_any = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+            self._parameters[name] = set() if accepts_any else set(parameters)
+        if self._parameters[name]:
+            kwargs = {key: value for key, value in kwargs.items() if key in self._parameters[name]}
+        return kwargs
+
+    def generate(self, kwargs: Dict) -> str:
+        """Call generate(), dropping optional arguments this client doesn't accept"""
+        client = self.get_client()
+        return client.generate(**self._accepted(client.generate, kwargs))
+
+    def stream(self, kwargs: Dict):
+        """Yield text deltas from generate_stream(), or the whole generate() response if the client can't stream"""
+        client = self.get_client()
+        generate_stream = getattr(client, 'generate_stream', None)
+        if generate_stream is None:
+            yield client.generate(**self._accepted(client.generate, kwargs))
+            return
+        yield from generate_stream(**self._accepted(generate_stream, kwargs))
+
+    def last_usage(self) -> Optional[Dict]:
+        """
+        The client's usage report for the call just made on this thread.
+
+        Must be read on the thread that made the call; clients shared between
+        threads should keep last_usage per thread.
+        """
+        return getattr(self.client, 'last_usage', None)
+
+
+class HedgedCaller:
+    """
+    Runs LLM calls against an ordered chain of providers with deadlines, hedging and failover.
+
+    The primary target is called first. If it hasn't answered after the hedge
+    delay (a percentile of its recorded latencies), the next target in the
+    chain is started alongside it and the first non-empty response wins. A
+    target that fails hands over to the next one straight away. Every call is
+    bounded by a deadline (see timeout_for), after which TimeoutError is raised.
+
+    Calls run on daemon threads; a losing or timed-out call is abandoned (its
+    result is discarded) since provider SDK calls can't be interrupted. With
+    no backup to hedge or fail over to, call() runs on the caller's thread
+    and is bounded by the client's own timeout. With a limiter set, a hedge
+    only starts when the limiter has room for it.
+    """
+
+    def __init__(
+        self,
+        targets: List[LLMTarget],
+        history=None,
+        hedge: Optional[bool] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_delay: Optional[float] = None,
+        min_hedge_delay: Optional[float] = None,
+        timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.targets = targets
+        self.history = history
+        if hedge is None:
+            hedge = os.getenv('LLM_HEDGE', 'true').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.hedge = hedge and len(targets) > 1
+        self.hedge_percentile = hedge_percentile if hedge_percentile is not None else float(os.getenv('LLM_HEDGE_PERCENTILE', '95'))
+        self.hedge_delay = hedge_delay if hedge_delay is not None else float(os.getenv('LLM_HEDGE_DELAY', '120'))
+        self.min_hedge_delay = min_hedge_delay if min_hedge_delay is not None else float(os.getenv('LLM_HEDGE_MIN_DELAY', '5'))
+        self.timeout = timeout if timeout is not None else float(os.getenv('LLM_TIMEOUT', '600'))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._delays = {}
+        # Usage report of the target that answered each thread's last call
+        self._local = threading.local()
+        # Optional AdaptiveConcurrency the caller runs primary calls under; hedges take a slot of their own
+        self.limiter = None
+        self.stats = {'calls': 0, 'hedged': 0, 'hedge_wins': 0, 'failovers': 0, 'timeouts': 0}
+
+    def _record(self, field: str):
+        with self._lock:
+            self.stats[field] += 1
+
+    def delay_for(self, max_tokens: int) -> float:
+        """Seconds to wait on the primary before hedging: a latency percentile, or LLM_HEDGE_DELAY without history"""
+        if max_tokens in self._delays:
+            return self._delays[max_tokens]
+
+        delay = self.hedge_delay
+        primary = self.targets[0]
+        if self.history is not None:
+            samples = [s['seconds'] for s in self.history.samples(primary.provider, primary.model)
+                       if s.get('max_tokens') in (None, max_tokens)]
+            if len(samples) >= MIN_HEDGE_SAMPLES:
+                cuts = statistics.quantiles(samples, n=100, method='inclusive')
+                delay = cuts[min(98, max(0, int(self.hedge_percentile) - 1))]
+
+        delay = max(self.min_hedge_delay, min(delay, self.timeout))
+        self._delays[max_tokens] = delay
+        return delay
+
+    def timeout_for(self, target: LLMTarget, max_tokens: int) -> float:
+        """Deadline in seconds for a call: LLM_TIMEOUT, stretched for models too slow to fill max_tokens within it"""
+        tokens_per_second, overhead = DEFAULT_SPEED.get(target.provider, (None, 0.0))
+        if not tokens_per_second:
+            return self.timeout
+        return max(self.timeout, DEADLINE_SPEED_MARGIN * (overhead + max_tokens / tokens_per_second))
+
+    def _launch(self, index: int, kwargs: Dict, results: queue.Queue, limited: bool = False):
+        """Start a call on its own thread; limited calls hold a limiter slot already taken by try_acquire"""
+        def run():
+            started = time.monotonic()
+            try:
+                response = self.targets[index].generate(dict(kwargs))
+            except Exception as error:
+                if limited:
+                    self.limiter.release(time.monotonic() - started, error=error)
+                results.put((index, None, error, None))
+                return
+            if limited:
+                self.limiter.release(time.monotonic() - started, estimate_tokens(response or ''))
+            results.put((index, response, None, self.targets[index].last_usage()))
+
+        threading.Thread(target=run, name=f"llm-{self.targets[index].provider}", daemon=True).start()
+
+    def _launch_stream(self, index: int, kwargs: Dict, events: queue.Queue):
+        def run():
+            target = self.targets[index]
+            try:
+                for delta in target.stream(dict(kwargs)):
+                    if delta:
+                        events.put(('delta', delta))
+                events.put(('done', target.last_usage()))
+            except Exception as error:
+                events.put(('error', error))
+
+        threading.Thread(target=run, name=f"llm-stream-{self.targets[index].provider}", daemon=True).start()
+
+    def stream(self, kwargs: Dict, outcome: Optional[Dict] = None):
+        """
+        Stream a response through the chain, yielding text deltas
+
+        A target that fails (or returns nothing) before its first delta hands
+        over to the next one. Once deltas have been handed out an error is
+        raised instead, since they can't be taken back. The whole stream is
+        bounded by the deadline. Streams are not hedged.
+
+        Args:
+            kwargs: Arguments for client.generate_stream() (prompt, max_tokens, temperature, ...)
+            outcome: Optional dict that receives 'target' (the target that
+                     answered) and 'attempts' (targets tried) when the stream ends
+        """
+        self._record('calls')
+        self._local.usage = None
+        timeout = self.timeout_for(self.targets[0], kwargs.get('max_tokens', 4000))
+        deadline = self._clock() + timeout
+        last_error = None
+
+        for index, target in enumerate(self.targets):
+            if index:
+                self._record('failovers')
+            events = queue.Queue()
+            self._launch_stream(index, kwargs, events)
+            streamed = False
+
+            while True:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    self._record('timeouts')
+                    raise TimeoutError(f"No complete LLM response within {timeout:.0f}s from {target.provider}")
+                try:
+                    kind, value = events.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+
+                if kind == 'delta':
+                    streamed = True
+                    yield value
+                elif kind == 'done' and streamed:
+                    self._local.usage = value
+                    if outcome is not None:
+                        outcome.update(target=target, attempts=index + 1)
+                    return
+                else:
+                    error = value if kind == 'error' else ValueError(f"Empty response from {target.provider}")
+                    if streamed:
+                        raise error
+                    last_error = error
+                    break
+
+        raise last_error
+
+    def call(self, kwargs: Dict) -> Tuple[str, LLMTarget, int]:
+        """
+        Generate a response through the chain
+
+        Args:
+            kwargs: Arguments for client.generate() (prompt, max_tokens, temperature, ...)
+
+        Returns:
+            Tuple of (response text, target that produced it, number of targets tried)
+        """
+        self._record('calls')
+        self._local.usage = None
+
+        if len(self.targets) == 1:
+            # Nothing to hedge or fail over to: no thread needed
+            target = self.targets[0]
+            response = target.generate(dict(kwargs))
+            if not response:
+                raise ValueError(f"Empty response from {target.provider}")
+            self._local.usage = target.last_usage()
+            return response, target, 1
+
+        started = self._clock()
+        timeout = self.timeout_for(self.targets[0], kwargs.get('max_tokens', 4000))
+        deadline = started + timeout
+        delay = self.delay_for(kwargs.get('max_tokens', 4000)) if self.hedge else None
+        results = queue.Queue()
+
+        self._launch(0, kwargs, results)
+        next_index, running = 1, 1
+        hedge_at = started + delay if delay is not None else None
+        last_error = None
+
+        while True:
+            now = self._clock()
+            if now >= deadline:
+                self._record('timeouts')
+                raise TimeoutError(
+                    f"No LLM response within {timeout:.0f}s from "
+                    f"{', '.join(t.provider for t in self.targets[:next_index])}"
+                )
+
+            wait_until = min(deadline, hedge_at) if hedge_at is not None else deadline
+            try:
+                index, response, error, usage = results.get(timeout=max(0.0, wait_until - now))
+            except queue.Empty:
+                # Primary (or the latest attempt) is slow: race the next target against it
+                if hedge_at is not None and self._clock() >= hedge_at and next_index < len(self.targets):
+                    # A hedge is extra traffic: it needs its own limiter slot and TPM budget
+                    limited = self.limiter is not None
+                    if limited and not self.limiter.try_acquire(self._hedge_tokens(kwargs)):
+                        hedge_at = self._clock() + HEDGE_RETRY_INTERVAL
+                        continue
+                    self._launch(next_index, kwargs, results, limited=limited)
+                    self._record('hedged')
+                    next_index, running = next_index + 1, running + 1
+                    hedge_at = self._clock() + delay if next_index < len(self.targets) else None
+                continue
+
+            running -= 1
+            if error is None and response:
+                if index > 0 and running:
+                    self._record('hedge_wins')
+                self._local.usage = usage
+                return response, self.targets[index], next_index
+
+            last_error = error or ValueError(f"Empty response from {self.targets[index].provider}")
+            if not running:
+                if next_index >= len(self.targets):
+                    raise last_error
+                # Failover: the next target takes over immediately
+                self._launch(next_index, kwargs, results)
+                self._record('failovers')
+                next_index, running = next_index + 1, running + 1
+                if hedge_at is not None:
+                    hedge_at = self._clock() + delay if next_index < len(self.targets) else None
+
+    @staticmethod
+    def _hedge_tokens(kwargs: Dict) -> int:
+        """Tokens a hedge is expected to use, for the limiter's TPM budget"""
+        return estimate_tokens(kwargs.get('prompt', '')) + int(kwargs.get('max_tokens', 4000) * DEFAULT_COMPLETION_RATIO)
+
+    @property
+    def last_usage(self) -> Optional[Dict]:
+        """Usage report (prompt/completion/cached tokens) for the calling thread's last successful call()"""
+        return getattr(self._local, 'usage', None)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
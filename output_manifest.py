@@ -0,0 +1,131 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Optional
+
+# Drive appProperties keys stamped on every generated doc so the manifest
+# can be rebuilt from the output folder if the local file is lost
+APP_PROPERTY_TRANSCRIPT = 'qwiloTranscriptId'
+APP_PROPERTY_TOPIC = 'qwiloTopic'
+APP_PROPERTY_HASH = 'qwiloContentHash'
+
+DEFAULT_MANIFEST_PATH = 'output_manifest.json'
+
+
+class OutputManifest:
+    """
+    Local record of generated output documents.
+
+    Entries are keyed by transcript id and topic number (or 'combined') and
+    store the content hash and Google Doc id of the last save, so re-running
+    a batch can skip unchanged topics and update changed ones in place.
+    Safe to share between concurrent save workers.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.RLock()
+        self.loaded_from_disk = False
+        self.load()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """Return a stable hash for document content"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+    @staticmethod
+    def _key(transcript_id: str, topic) -> str:
+        return f"{transcript_id}:{topic}"
+
+    def load(self):
+        """Load manifest entries from disk if the file exists"""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('entries', {})
+            self.loaded_from_disk = True
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read output manifest '{self.path}': {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write manifest entries to disk atomically"""
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': self.entries}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def lookup(self, transcript_id: str, topic) -> Optional[Dict]:
+        """Return the manifest entry for a transcript topic, if any"""
+        with self._lock:
+            return self.entries.get(self._key(transcript_id, topic))
+
+    def record(self, transcript_id: str, topic, content_hash: str, doc_id: str, title: str, url: str):
+        """Record the document generated for a transcript topic and persist"""
+        with self._lock:
+            self.entries[self._key(transcript_id, topic)] = {
+                'transcript_id': transcript_id,
+                'topic': str(topic),
+                'content_hash': content_hash,
+                'doc_id': doc_id,
+                'title': title,
+                'url': url
+            }
+            self.save()
+
+    def app_properties(self, transcript_id: str, topic, content_hash: str) -> Dict[str, str]:
+        """Build the Drive appProperties that tag a document with its manifest key"""
+        return {
+            APP_PROPERTY_TRANSCRIPT: transcript_id,
+            APP_PROPERTY_TOPIC: str(topic),
+            APP_PROPERTY_HASH: content_hash
+        }
+
+    def rebuild_from_folder(self, docs_client, folder_id: Optional[str]) -> int:
+        """
+        Rebuild the manifest from tagged documents in the output folder.
+
+        Uses a single paginated Drive listing.
+
+        Args:
+            docs_client: GoogleDocsClient instance
+            folder_id: Output folder ID (None searches all app-created docs)
+
+        Returns:
+            int: Number of entries recovered
+        """
+        files = docs_client.list_tagged_documents(folder_id, APP_PROPERTY_TRANSCRIPT)
+
+        with self._lock:
+            recovered = set()
+            for item in files:
+                props = item.get('appProperties', {})
+                transcript_id = props.get(APP_PROPERTY_TRANSCRIPT)
+                topic = props.get(APP_PROPERTY_TOPIC)
+                if not transcript_id or not topic:
+                    continue
+
+                key = self._key(transcript_id, topic)
+                # Keep the most recently modified doc if duplicates already exist
+                existing = self.entries.get(key)
+                if existing and existing.get('modified', '') >= item.get('modifiedTime', ''):
+                    continue
+
+                self.entries[key] = {
+                    'transcript_id': transcript_id,
+                    'topic': topic,
+                    'content_hash': props.get(APP_PROPERTY_HASH, ''),
+                    'doc_id': item['id'],
+                    'title': item.get('name', ''),
+                    'url': f"https://docs.google.com/document/d/{item['id']}/edit",
+                    'modified': item.get('modifiedTime', '')
+                }
+                recovered.add(key)
+
+            self.save()
+        return len(recovered)
@@ -0,0 +1,133 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from token_estimator import estimate_tokens
+from topic_stream import TOPIC_HEADER_PATTERN, parse_topics
+
+# Sections every topic must have (Evidence/Data and Real-World Examples are optional)
+REQUIRED_SECTIONS = ['**Description:**', '**Key Insights:**', '**Notable Quotes:**']
+
+# A response this close to its max_tokens budget probably stopped at the limit
+TRUNCATION_RATIO = 0.95
+
+# Topic headers models write instead of "## TOPIC N: Title"
+_LOOSE_HEADER = re.compile(
+    r"^[ \t]*(?:#{1,4}[ \t]*)?(?:\*\*)?[ \t]*Topic[ \t]+(\d+)[ \t]*[:.\-–—][ \t]*(.+?)[ \t]*(?:\*\*)?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+_HEADER_AT_LINE_START = re.compile(r"^## TOPIC \d+:", re.MULTILINE)
+
+# Quote lines in the Notable Quotes section; the expected form is  > **Name:** "quote"
+_WELL_FORMED_QUOTE = re.compile(r'^>\s*\*\*[^*]+:\*\*\s*["“].+["”]\s*$')
+_LOOSE_QUOTES = [
+    # **Name:** "quote"  /  - **Name**: "quote"  /  > Name: "quote"
+    re.compile(r'^(?:>|[•*\-])?\s*(?:\*\*)?(?P<speaker>[A-Z][\w.\' \-]{0,40}?)(?:\*\*)?\s*:\s*(?:\*\*)?\s*["“](?P<quote>.+?)["”]\s*$'),
+    # "quote" - Name  /  > "quote" — Name
+    re.compile(r'^(?:>|[•*\-])?\s*["“](?P<quote>.+?)["”]\s*[-–—]+\s*(?P<speaker>[A-Z][\w.\' \-]{0,40})\s*$'),
+    # > "quote"  (no speaker)
+    re.compile(r'^(?:>|[•*\-])\s*["“](?P<quote>.+?)["”]\s*$'),
+]
+_SECTION_LABEL = re.compile(r"^\*\*(?:Description|Key Insights|Notable Quotes|Evidence/Data|Real-World Examples):\*\*")
+_TERMINAL = re.compile(r"""[.!?"”')\]*]\s*$""")
+
+
+def normalize_headers(text: str) -> str:
+    """Rewrite loose topic headers ("### Topic 1 - Title", "**TOPIC 1: Title**") as "## TOPIC N: Title" """
+    if _HEADER_AT_LINE_START.search(text):
+        return text
+    return _LOOSE_HEADER.sub(lambda m: f"## TOPIC {m.group(1)}: {m.group(2).strip('* ')}", text)
+
+
+def normalize_quotes(text: str) -> Tuple[str, int]:
+    """
+    Rewrite malformed quote lines in Notable Quotes sections as  > **Name:** "quote"
+
+    Quotes with no identifiable speaker are attributed to "Unknown".
+
+    Returns:
+        Tuple of (text, number of quote lines rewritten)
+    """
+    lines = text.split('\n')
+    fixed = 0
+    in_quotes = False
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('**Notable Quotes:**'):
+            in_quotes = True
+            continue
+        if _SECTION_LABEL.match(stripped) or stripped.startswith('## ') or stripped == '---':
+            in_quotes = False
+        if not in_quotes or not stripped or _WELL_FORMED_QUOTE.match(stripped):
+            continue
+        for pattern in _LOOSE_QUOTES:
+            match = pattern.match(stripped)
+            if match:
+                speaker = (match.groupdict().get('speaker') or 'Unknown').strip()
+                lines[index] = f"> **{speaker}:** \"{match.group('quote').strip()}\""
+                fixed += 1
+                break
+    return '\n'.join(lines), fixed
+
+
+def missing_sections(topic: Dict) -> List[str]:
+    """Required sections a parsed topic lacks (a section with no content counts as missing)"""
+    content = topic['content']
+    missing = []
+    for label in REQUIRED_SECTIONS:
+        position = content.find(label)
+        if position < 0 or not content[position + len(label):].strip():
+            missing.append(label.strip('*:'))
+    if 'Notable Quotes' not in missing and not any(
+        _WELL_FORMED_QUOTE.match(line.strip()) for line in content.split('\n')
+    ):
+        missing.append('Notable Quotes')
+    return missing
+
+
+def check_analysis(text: str, max_tokens: Optional[int] = None) -> Dict:
+    """
+    Validate markdown analysis output
+
+    Args:
+        text: Markdown analysis
+        max_tokens: Output budget the text was generated with; None skips the truncation check
+
+    Returns:
+        Dict with 'topics' (count), 'truncated' (the output hit its token budget
+        and the last topic ends mid-way) and 'incomplete' (list of
+        (topic index, missing section names) for topics needing repair)
+    """
+    topics = parse_topics(text)
+    hit_budget = max_tokens is not None and estimate_tokens(text) >= max_tokens * TRUNCATION_RATIO
+    incomplete = []
+    truncated = False
+    for index, topic in enumerate(topics):
+        missing = missing_sections(topic)
+        last = index == len(topics) - 1
+        if last and hit_budget and (missing or not _TERMINAL.search(topic['content'])):
+            truncated = True
+            missing = missing or ['(cut off)']
+        if missing:
+            incomplete.append((index, missing))
+    return {'topics': len(topics), 'truncated': truncated, 'incomplete': incomplete}
+
+
+def _topic_starts(text: str) -> List[re.Match]:
+    return list(re.finditer(TOPIC_HEADER_PATTERN, text))
+
+
+def splice_topic(text: str, index: int, section: str) -> str:
+    """Replace the index-th "## TOPIC" section of text with a new section, keeping its number"""
+    starts = _topic_starts(text)
+    section = re.sub(TOPIC_HEADER_PATTERN + r"[ \t]*", starts[index].group(0) + ' ', section.strip(), count=1)
+    section = re.sub(r"\n-{3,}\s*$", "", section).rstrip()
+    if index + 1 < len(starts):
+        return text[:starts[index].start()] + section + "\n\n---\n\n" + text[starts[index + 1].start():]
+    return text[:starts[index].start()] + section + "\n"
+
+
+def drop_last_topic(text: str) -> str:
+    """Remove the last "## TOPIC" section of text (and the separator before it)"""
+    starts = _topic_starts(text)
+    if not starts:
+        return text
+    return re.sub(r"\s*-{3,}\s*$", "", text[:starts[-1].start()]).rstrip() + "\n"
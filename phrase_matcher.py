@@ -0,0 +1,100 @@
+import string
+from typing import Iterable, List, Optional, Set
+
+# Punctuation becomes whitespace; apostrophes are kept so names like "O'Brien"
+# stay one word. str.translate + split is several times faster than a regex
+# findall on long transcripts.
+_APOSTROPHES = "'’"
+_SEPARATORS = ''.join(c for c in string.punctuation if c not in _APOSTROPHES) + '“”‘—–…•'
+_SEPARATOR_TABLE = str.maketrans(_SEPARATORS, ' ' * len(_SEPARATORS))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text"""
+    return [word.strip(_APOSTROPHES) for word in text.lower().translate(_SEPARATOR_TABLE).split()]
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over word tokens for matching many phrases at once.
+
+    Phrases and text are tokenized into lowercase words, so matches respect
+    word boundaries ("Ann" does not match "Annual") and cost one pass over
+    the text no matter how many phrases there are. Multi-word phrases match
+    across any whitespace or punctuation between their words.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        # State 0 is the root; goto[state] maps a word to the next state
+        self.goto = [{}]
+        self.fail = [0]
+        self.output: List[Set[str]] = [set()]
+
+        for phrase in phrases:
+            words = tokenize(phrase)
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                next_state = self.goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][word] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                state = next_state
+            self.output[state].add(phrase)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for word, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(word, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def __bool__(self):
+        return len(self.goto) > 1
+
+    def _scan(self, text: str):
+        """Yield the phrases ending at each matching word position"""
+        goto, fail, output = self.goto, self.fail, self.output
+        root = goto[0]
+        words = tokenize(text)
+
+        # Every match starts with a root word; when none occurs (the usual case
+        # for exclusion filters) a C-level set intersection skips the walk
+        if root.keys().isdisjoint(words):
+            return
+
+        state = 0
+        for word in words:
+            if state == 0:
+                # Fast path: most words don't start any phrase
+                state = root.get(word, 0)
+            else:
+                while state and word not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(word, 0)
+            if output[state]:
+                yield output[state]
+
+    def search(self, text: str) -> Optional[str]:
+        """Return one phrase found in text, or None (stops at the first match)"""
+        for found in self._scan(text):
+            return next(iter(found))
+        return None
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return every phrase found in text"""
+        matches = set()
+        for found in self._scan(text):
+            matches |= found
+        return matches
@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import threading
+import statistics
+from typing import Dict, List, Optional
+from llm_cache import LLMCache
+from token_estimator import estimate_tokens
+
+DEFAULT_HISTORY_PATH = 'llm_latency.jsonl'
+
+# Approximate list prices in USD per 1M tokens: (input, output)
+PRICING = {
+    ('qwen', 'qwen2.5:32b'): (0.0, 0.0),
+    ('openai', 'gpt-4o-mini'): (0.15, 0.60),
+    ('openai', 'gpt-4o'): (2.50, 10.00),
+    ('claude', 'claude-3-5-haiku-20241022'): (0.80, 4.00),
+    ('claude', 'claude-3-5-sonnet-20241022'): (3.00, 15.00),
+    ('google', 'gemini-2.5-flash'): (0.30, 2.50),
+    ('google', 'gemini-2.5-pro'): (1.25, 10.00),
+    ('google', 'gemini-1.5-flash'): (0.075, 0.30),
+}
+
+# Fallback generation speed (output tokens/second) and fixed per-call
+# overhead (seconds, covering queueing and prompt processing) per provider
+DEFAULT_SPEED = {
+    'qwen': (11.0, 20.0),
+    'openai': (80.0, 1.0),
+    'claude': (60.0, 1.5),
+    'anthropic': (60.0, 1.5),
+    'google': (300.0, 1.0),
+}
+
+# Completion length assumed when there is no history: topics output tends
+# to land around half of the 4,000-token cap
+DEFAULT_COMPLETION_RATIO = 0.5
+
+
+def price_for(provider: str, model: str) -> Optional[tuple]:
+    """Return (input, output) USD per 1M tokens for a model, matching by prefix if needed"""
+    if (provider, model) in PRICING:
+        return PRICING[(provider, model)]
+    for (_, known_model), price in PRICING.items():
+        if model.startswith(known_model) or known_model.startswith(model):
+            return price
+    return None
+
+
+def call_cost(provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Estimated USD cost of one call at list prices (before provider prompt-cache discounts)"""
+    price = price_for(provider, model)
+    if price is None:
+        return None
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+class LatencyHistory:
+    """
+    Append-only JSONL ledger of LLM calls.
+
+    One entry per call with provider, model, prompt/completion tokens,
+    latency (and time to first token when streamed), retries, response
+    cache hits, errors, estimated cost and the content focus and
+    transcript it was for. Successful uncached entries double as the
+    latency history behind ETA projections and hedge delays.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('LLM_LATENCY_HISTORY', DEFAULT_HISTORY_PATH)
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, prompt_tokens: int, completion_tokens: int, seconds: float,
+               max_tokens: Optional[int] = None, cached_tokens: Optional[int] = None, **details):
+        """
+        Append one call
+
+        Args:
+            cached_tokens: Prompt tokens the provider served from its prompt cache
+            details: Extra fields such as ttft, retries, cache_hit, error, focus, transcript, topic
+        """
+        entry = {
+            'ts': time.time(),
+            'provider': provider,
+            'model': model,
+            'max_tokens': max_tokens,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'cached_tokens': cached_tokens,
+            'seconds': round(seconds, 3),
+            'cost': None if details.get('cache_hit') else call_cost(provider, model, prompt_tokens, completion_tokens)
+        }
+        entry.update(details)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def entries(self, since: Optional[float] = None) -> List[Dict]:
+        """Return every entry, optionally only those recorded at or after the `since` timestamp"""
+        if not os.path.exists(self.path):
+            return []
+
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or entry.get('ts', 0) >= since:
+                    entries.append(entry)
+        return entries
+
+    def samples(self, provider: str, model: str, limit: int = 200) -> List[Dict]:
+        """Return the most recent timed call measurements (no cache hits, errors or batch jobs) for a provider/model"""
+        matches = [
+            entry for entry in self.entries()
+            if entry.get('provider') == provider and entry.get('model') == model
+            and not entry.get('cache_hit') and not entry.get('error') and not entry.get('batch')
+        ]
+        return matches[-limit:]
+
+
+def summarize_calls(entries: List[Dict], key) -> List[Dict]:
+    """
+    Aggregate ledger entries by key(entry)
+
+    Returns:
+        One row per key, most expensive first, with calls, cache_hits, errors,
+        retries, prompt/completion tokens, cost, total seconds and p50/p95 latency
+    """
+    groups: Dict[str, List[Dict]] = {}
+    for entry in entries:
+        groups.setdefault(key(entry) or '-', []).append(entry)
+
+    rows = []
+    for name, group in groups.items():
+        calls = [e for e in group if not e.get('cache_hit')]
+        latencies = sorted(e['seconds'] for e in calls if not e.get('error') and not e.get('batch'))
+        rows.append({
+            'key': name,
+            'calls': len(calls),
+            'cache_hits': len(group) - len(calls),
+            'errors': sum(1 for e in calls if e.get('error')),
+            'retries': sum(e.get('retries') or 0 for e in calls),
+            'prompt_tokens': sum(e.get('prompt_tokens') or 0 for e in calls),
+            'completion_tokens': sum(e.get('completion_tokens') or 0 for e in calls),
+            'cost': sum(e.get('cost') or 0.0 for e in calls),
+            'seconds': sum(e.get('seconds') or 0.0 for e in calls),
+            'p50': latencies[len(latencies) // 2] if latencies else None,
+            'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        })
+    return sorted(rows, key=lambda row: (row['cost'], row['seconds']), reverse=True)
+
+
+class RunEstimator:
+    """
+    Projects tokens, cost and wall-clock time for analyzing a set of transcripts.
+
+    Builds the same prompts the analyzer would send (including map-reduce
+    chunk prompts for long transcripts), skips prompts already in the LLM
+    response cache, and never calls the model.
+    """
+
+    def __init__(self, analyzer, history: Optional[LatencyHistory] = None):
+        self.analyzer = analyzer
+        self.history = history or LatencyHistory()
+        self.samples = self.history.samples(analyzer.provider, analyzer.model)
+
+    def _expected_completion(self, max_tokens: int) -> int:
+        """Median completion length of past calls with the same budget, else a fraction of max_tokens"""
+        lengths = [
+            s['completion_tokens'] for s in self.samples
+            if s.get('completion_tokens') and s.get('max_tokens') in (None, max_tokens)
+        ]
+        if len(lengths) >= 3:
+            return min(max_tokens, int(statistics.median(lengths)))
+        return int(max_tokens * DEFAULT_COMPLETION_RATIO)
+
+    def _seconds_per_call(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Projected latency of one call, from history when available"""
+        timed = [s for s in self.samples if s.get('completion_tokens') and s.get('seconds')]
+        if len(timed) >= 3:
+            per_token = statistics.median(s['seconds'] / s['completion_tokens'] for s in timed)
+            return per_token * completion_tokens
+        tokens_per_second, overhead = DEFAULT_SPEED.get(self.analyzer.provider, (50.0, 2.0))
+        return overhead + completion_tokens / tokens_per_second
+
+    def _is_cached(self, prompt: str, max_tokens: int, temperature: float) -> bool:
+        cache = getattr(self.analyzer, 'cache', None)
+        if not cache or getattr(self.analyzer, 'cache_mode', 'use') == 'refresh':
+            return False
+        key = LLMCache.make_key(prompt, self.analyzer.provider, self.analyzer.model, max_tokens, temperature)
+        return cache.contains(key)
+
+    def estimate_transcript(self, transcript: Dict) -> Dict:
+        """Estimate the calls, tokens and seconds needed to analyze one transcript"""
+        calls = self.analyzer.plan_calls(transcript)
+
+        input_tokens = output_tokens = cached_calls = 0
+        map_output_tokens = 0
+        seconds = map_seconds = 0.0
+        for call in calls:
+            prompt, max_tokens = call['prompt'], call['max_tokens']
+            completion_tokens = self._expected_completion(max_tokens)
+
+            if call['reduce']:
+                # The reduce prompt carries every map output on top of its template
+                prompt_tokens = estimate_tokens(prompt) + map_output_tokens
+            elif self._is_cached(prompt, max_tokens, call['temperature']):
+                cached_calls += 1
+                map_output_tokens += completion_tokens
+                continue
+            else:
+                prompt_tokens = estimate_tokens(prompt)
+                map_output_tokens += completion_tokens
+
+            input_tokens += prompt_tokens
+            output_tokens += completion_tokens
+            if len(calls) > 1 and not call['reduce']:
+                map_seconds += self._seconds_per_call(prompt_tokens, completion_tokens)
+            else:
+                seconds += self._seconds_per_call(prompt_tokens, completion_tokens)
+
+        # Map calls for one transcript run chunk_concurrency at a time
+        seconds += map_seconds / max(1, getattr(self.analyzer, 'chunk_concurrency', 1))
+
+        return {
+            'topic': transcript['topic'],
+            'date': transcript['date'],
+            'calls': len(calls),
+            'cached_calls': cached_calls,
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'seconds': seconds
+        }
+
+    def estimate(self, transcripts: List[Dict], concurrency: int = 1) -> Dict:
+        """Estimate a whole run; ETA assumes `concurrency` transcripts in flight"""
+        rows = [self.estimate_transcript(t) for t in transcripts]
+        input_tokens = sum(r['input_tokens'] for r in rows)
+        output_tokens = sum(r['output_tokens'] for r in rows)
+        serial_seconds = sum(r['seconds'] for r in rows)
+        parallelism = max(1, min(concurrency, len(rows)))
+
+        costs = {}
+        for (provider, model), (input_price, output_price) in PRICING.items():
+            costs[f"{provider}/{model}"] = (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+        price = price_for(self.analyzer.provider, self.analyzer.model)
+        selected_cost = None
+        if price:
+            selected_cost = (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+        return {
+            'rows': rows,
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'calls': sum(r['calls'] for r in rows),
+            'cached_calls': sum(r['cached_calls'] for r in rows),
+            'eta_seconds': serial_seconds / parallelism,
+            'selected_cost': selected_cost,
+            'costs_by_model': costs,
+            'history_samples': len(self.samples)
+        }
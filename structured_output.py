@@ -0,0 +1,142 @@
+import json
+from typing import Dict, List, Optional
+
+# Compact wire format requested from the model. Single-letter keys and
+# [speaker, quote] pairs keep output tokens well below the equivalent
+# markdown; normalize_analysis() expands them to readable field names.
+#   t = title, d = description, i = insights, q = quotes,
+#   e = evidence/data, x = real-world examples
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'required': ['topics'],
+    'properties': {
+        'topics': {
+            'type': 'array',
+            'minItems': 1,
+            'maxItems': 5,
+            'items': {
+                'type': 'object',
+                'required': ['t', 'd', 'i', 'q'],
+                'properties': {
+                    't': {'type': 'string'},
+                    'd': {'type': 'string'},
+                    'i': {'type': 'array', 'items': {'type': 'string'}},
+                    'q': {
+                        'type': 'array',
+                        'items': {'type': 'array', 'items': {'type': 'string'}, 'minItems': 2, 'maxItems': 2}
+                    },
+                    'e': {'type': 'array', 'items': {'type': 'string'}},
+                    'x': {'type': 'array', 'items': {'type': 'string'}}
+                }
+            }
+        }
+    }
+}
+
+JSON_FORMAT_EXAMPLE = (
+    '{"topics":[{"t":"<title>","d":"<description>","i":["<insight>"],'
+    '"q":[["<speaker>","<verbatim quote>"]],"e":["<evidence>"],"x":["<example>"]}]}'
+)
+
+
+def extract_json(text: str) -> Optional[Dict]:
+    """Parse the JSON object in a model response, tolerating code fences and surrounding text"""
+    if not text:
+        return None
+
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end <= start:
+        return None
+
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _string_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def validate_analysis(data: Dict) -> List[str]:
+    """
+    Check a compact structured analysis against ANALYSIS_SCHEMA.
+
+    Returns:
+        List of problems (empty if valid)
+    """
+    topics = data.get('topics') if isinstance(data, dict) else None
+    if not isinstance(topics, list) or not topics:
+        return ["'topics' must be a non-empty list"]
+
+    errors = []
+    for number, topic in enumerate(topics, 1):
+        if not isinstance(topic, dict):
+            errors.append(f"topic {number} is not an object")
+            continue
+        if not isinstance(topic.get('t'), str) or not topic['t'].strip():
+            errors.append(f"topic {number} has no title")
+        if not isinstance(topic.get('d'), str):
+            errors.append(f"topic {number} has no description")
+        if not _string_list(topic.get('i')):
+            errors.append(f"topic {number} insights must be a list of strings")
+        quotes = topic.get('q')
+        if not isinstance(quotes, list) or not all(
+            isinstance(q, list) and len(q) == 2 and _string_list(q) for q in quotes
+        ):
+            errors.append(f"topic {number} quotes must be a list of [speaker, quote] pairs")
+        for key in ('e', 'x'):
+            if topic.get(key) is not None and not _string_list(topic[key]):
+                errors.append(f"topic {number} '{key}' must be a list of strings")
+    return errors
+
+
+def normalize_analysis(data: Dict) -> Dict:
+    """Expand a validated compact analysis to readable field names"""
+    return {
+        'topics': [
+            {
+                'title': topic['t'].strip(),
+                'description': topic['d'].strip(),
+                'insights': [item.strip() for item in topic['i']],
+                'quotes': [{'speaker': speaker.strip() or 'Unknown', 'text': text.strip().strip('"“”')}
+                           for speaker, text in topic['q']],
+                'evidence': [item.strip() for item in topic.get('e') or []],
+                'examples': [item.strip() for item in topic.get('x') or []]
+            }
+            for topic in data['topics']
+        ]
+    }
+
+
+def render_markdown(analysis: Dict) -> str:
+    """Render a normalized analysis in the markdown topic format used for display and docs"""
+    sections = []
+    for number, topic in enumerate(analysis['topics'], 1):
+        lines = [
+            f"## TOPIC {number}: {topic['title']}",
+            '',
+            f"**Description:** {topic['description']}",
+            '',
+            '**Key Insights:**'
+        ]
+        lines.extend(f"• {insight}" for insight in topic['insights'])
+
+        if topic['quotes']:
+            lines.extend(['', '**Notable Quotes:**'])
+            for quote in topic['quotes']:
+                lines.extend([f"> **{quote['speaker']}:** \"{quote['text']}\"", ''])
+            lines.pop()
+
+        if topic['evidence']:
+            lines.extend(['', '**Evidence/Data:**'])
+            lines.extend(f"• {item}" for item in topic['evidence'])
+
+        if topic['examples']:
+            lines.extend(['', '**Real-World Examples:**'])
+            lines.extend(f"• {item}" for item in topic['examples'])
+
+        sections.append('\n'.join(lines))
+
+    return '\n\n---\n\n'.join(sections)
@@ -0,0 +1,128 @@
+import pytest
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence
+from api_executor import ApiExecutor
+
+
+class FakeClock:
+    """Clock that only moves when the executor sleeps"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def drive_service(responses):
+    return build('drive', 'v3', http=HttpMockSequence(responses), static_discovery=True)
+
+
+def docs_service(responses):
+    return build('docs', 'v1', http=HttpMockSequence(responses), static_discovery=True)
+
+
+def error(status, **headers):
+    return ({'status': str(status), **headers}, f'{{"error": {{"code": {status}, "message": "error {status}"}}}}')
+
+
+OK = ({'status': '200'}, '{"files": [{"id": "doc1"}]}')
+
+
+def make_executor(clock, **kwargs):
+    return ApiExecutor(quotas={'drive': (1.0, 2.0)}, sleep=clock.sleep, clock=clock, **kwargs)
+
+
+def test_retries_429_and_5xx_then_succeeds_honoring_retry_after():
+    clock = FakeClock()
+    executor = make_executor(clock, max_retries=5, base_delay=1.0)
+    service = drive_service([error(429, **{'retry-after': '3'}), error(503), OK])
+
+    response = executor.execute(service.files().list(), 'drive')
+
+    assert response == {'files': [{'id': 'doc1'}]}
+    stats = executor.get_stats()['drive']
+    assert stats['calls'] == 3
+    assert stats['retries'] == 2
+    assert stats['failures'] == 0
+    # The first retry waits exactly Retry-After; the 503 retry waits a jittered backoff of at most 2s
+    assert 3.0 in clock.sleeps
+    assert 0.0 <= stats['backoff_seconds'] - 3.0 <= 2.0
+
+
+def test_gives_up_after_max_retries():
+    clock = FakeClock()
+    executor = make_executor(clock, max_retries=2)
+    service = drive_service([error(500), error(500), error(500), OK])
+
+    with pytest.raises(HttpError):
+        executor.execute(service.files().list(), 'drive')
+
+    stats = executor.get_stats()['drive']
+    assert stats['calls'] == 3
+    assert stats['retries'] == 2
+    assert stats['failures'] == 1
+
+
+def test_does_not_retry_client_errors():
+    clock = FakeClock()
+    executor = make_executor(clock)
+    service = drive_service([error(404), OK])
+
+    with pytest.raises(HttpError):
+        executor.execute(service.files().list(), 'drive')
+
+    assert executor.get_stats()['drive']['retries'] == 0
+    assert clock.sleeps == []
+
+
+def test_token_bucket_throttles_beyond_burst():
+    clock = FakeClock()
+    executor = make_executor(clock)
+    service = drive_service([OK] * 4)
+
+    for _ in range(4):
+        executor.execute(service.files().list(), 'drive')
+
+    # Burst of 2, then one token per second
+    assert clock.sleeps == [1.0, 1.0]
+    assert executor.get_stats()['drive']['throttled_seconds'] == pytest.approx(2.0)
+
+
+def test_non_idempotent_create_is_not_retried_after_5xx():
+    clock = FakeClock()
+    executor = make_executor(clock)
+    # The 503 may have come after the document was created; a retry could create a duplicate
+    service = docs_service([error(503), ({'status': '200'}, '{"documentId": "doc1"}')])
+
+    with pytest.raises(HttpError):
+        executor.execute(service.documents().create(body={'title': 'Topic'}), 'docs_write', idempotent=False)
+
+    stats = executor.get_stats()['docs_write']
+    assert stats['calls'] == 1
+    assert stats['retries'] == 0
+    assert stats['failures'] == 1
+
+
+def test_non_idempotent_create_is_retried_when_rate_limited():
+    clock = FakeClock()
+    executor = make_executor(clock)
+    service = docs_service([error(429, **{'retry-after': '2'}), ({'status': '200'}, '{"documentId": "doc1"}')])
+
+    response = executor.execute(service.documents().create(body={'title': 'Topic'}), 'docs_write', idempotent=False)
+
+    assert response == {'documentId': 'doc1'}
+    assert executor.get_stats()['docs_write']['retries'] == 1
+    assert 2.0 in clock.sleeps
+
+
+def test_write_timeouts_are_only_retried_when_idempotent():
+    assert ApiExecutor.is_retryable(TimeoutError())
+    assert not ApiExecutor.is_retryable(TimeoutError(), idempotent=False)
+    assert ApiExecutor.is_retryable(ConnectionRefusedError(), idempotent=False)
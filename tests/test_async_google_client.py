@@ -0,0 +1,121 @@
+import asyncio
+import httpx
+import pytest
+from googleapiclient.errors import HttpError
+from google.auth.credentials import AnonymousCredentials
+from api_executor import ApiExecutor
+import async_google_client
+from async_google_client import AsyncGoogleClient
+
+
+def make_client(handler, **kwargs):
+    executor = ApiExecutor(max_retries=3)
+    return AsyncGoogleClient(
+        credentials=AnonymousCredentials(),
+        executor=executor,
+        transport=httpx.MockTransport(handler),
+        folder_id='root-folder',
+        **kwargs
+    )
+
+
+def test_retries_429_honoring_retry_after(monkeypatch):
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(async_google_client.asyncio, 'sleep', fake_sleep)
+    responses = iter([
+        httpx.Response(429, headers={'Retry-After': '4'}, json={'error': {'code': 429}}),
+        httpx.Response(200, json={'id': 'file1', 'name': 'Notes'}),
+    ])
+
+    async def run():
+        async with make_client(lambda request: next(responses)) as client:
+            return await client.get_file('file1'), client.executor.get_stats()['drive']
+
+    file, stats = asyncio.run(run())
+
+    assert file == {'id': 'file1', 'name': 'Notes'}
+    assert sleeps == [4.0]
+    assert stats['calls'] == 2
+    assert stats['retries'] == 1
+    assert stats['failures'] == 0
+
+
+def test_concurrent_requests_are_bounded_by_semaphore():
+    in_flight = peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={'documentId': request.url.path.rsplit('/', 1)[-1]})
+
+    async def run():
+        async with make_client(handler, max_concurrency=3) as client:
+            return await asyncio.gather(*(client.get_document(f'doc{i}') for i in range(10)))
+
+    documents = asyncio.run(run())
+
+    assert [d['documentId'] for d in documents] == [f'doc{i}' for i in range(10)]
+    assert peak == 3
+
+
+def test_folder_listing_follows_page_tokens():
+    seen_tokens = []
+    pages = {
+        None: {'files': [{'id': 'a', 'name': 'A', 'modifiedTime': '2025-01-01'}], 'nextPageToken': 'p2'},
+        'p2': {'files': [{'id': 'b', 'name': 'B', 'modifiedTime': '2025-02-01'}]},
+    }
+
+    def handler(request):
+        token = request.url.params.get('pageToken')
+        seen_tokens.append(token)
+        return httpx.Response(200, json=pages[token])
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.get_documents_in_folder()
+
+    documents = asyncio.run(run())
+
+    assert seen_tokens == [None, 'p2']
+    assert [d['id'] for d in documents] == ['b', 'a']
+
+
+def test_non_retryable_error_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404, json={'error': {'code': 404}})
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.get_document_content('missing')
+
+    assert asyncio.run(run()) == ''
+    assert len(calls) == 1
+
+
+
+def test_create_is_not_retried_after_5xx():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, json={'error': {'code': 503}})
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.create_document('Topic')
+
+    with pytest.raises(HttpError):
+        asyncio.run(run())
+    assert len(calls) == 1
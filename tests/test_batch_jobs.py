@@ -0,0 +1,174 @@
+import io
+import json
+from types import SimpleNamespace
+import pytest
+from rich.console import Console
+import cli
+import fake_llm
+from batch_jobs import FAILED, BatchJobStore, LocalBatchProvider, OpenAIBatchProvider
+from benchmark_pipeline import make_transcripts
+from token_estimator import estimate_tokens
+
+
+def use_transcripts(monkeypatch, transcripts):
+    """Have cli fetch these transcripts from a stand-in Gmail client"""
+    class FakeGmail:
+        def __init__(self, **kwargs):
+            pass
+
+        def get_transcripts(self):
+            return [dict(t) for t in transcripts]
+
+    monkeypatch.setattr(cli, 'GmailClient', FakeGmail)
+
+
+@pytest.fixture
+def batch_cli(tmp_path, monkeypatch):
+    """cli with Gmail, Docs and the console replaced, the fake LLM and the local batch provider"""
+    use_transcripts(monkeypatch, make_transcripts(3, ['short']))
+
+    output = io.StringIO()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('BATCH_PROVIDER', 'local')
+    monkeypatch.setenv('BATCH_JOBS_DIR', str(tmp_path / 'batch_jobs'))
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    monkeypatch.setattr(cli, 'GoogleDocsClient', lambda: None)
+    monkeypatch.setattr(cli, 'console', Console(file=output, width=200))
+    fake_llm.reset_clients()
+    return output
+
+
+def submit():
+    cli.submit_batch(model_override='fake-llm', provider_override='fake', cache_mode='off', routing=False)
+    jobs = BatchJobStore().pending()
+    assert len(jobs) == 1
+    return jobs[0]
+
+
+def saved_files(tmp_path):
+    return sorted(path.name for path in tmp_path.glob('*.md'))
+
+
+def test_submit_then_collect_saves_results(batch_cli, tmp_path):
+    job = submit()
+    assert job['batch_provider'] == 'local'
+    assert len(job['requests']) == 3
+
+    cli.collect_batches(save_local=True, cache_mode='off')
+
+    assert BatchJobStore().pending() == []
+    assert BatchJobStore().load(job['job_id'])['status'] == 'collected'
+    assert 'Saved 3 of 3 analyses' in batch_cli.getvalue()
+    assert len(saved_files(tmp_path)) == 9  # 3 topics per transcript from the fake LLM
+
+
+def test_unfinished_job_is_reported_and_kept(batch_cli, tmp_path, monkeypatch):
+    job = submit()
+    # The local job never runs, as if the provider were still working on it
+    monkeypatch.setattr(LocalBatchProvider, 'run', lambda self, job_id, generate: None)
+
+    cli.collect_batches(save_local=True, cache_mode='off')
+
+    assert f"Batch job {job['job_id']} is still processing" in batch_cli.getvalue()
+    assert [pending['job_id'] for pending in BatchJobStore().pending()] == [job['job_id']]
+    assert saved_files(tmp_path) == []
+
+
+def test_failed_requests_are_reported(batch_cli, tmp_path, monkeypatch):
+    submit()
+    run = LocalBatchProvider.run
+
+    def run_with_failure(self, job_id, generate):
+        def generate_or_fail(prompt, **kwargs):
+            if 'Conversation Topic: Synthetic short meeting 1' in prompt:
+                raise RuntimeError('injected provider failure')
+            return generate(prompt=prompt, **kwargs)
+        run(self, job_id, generate_or_fail)
+
+    monkeypatch.setattr(LocalBatchProvider, 'run', run_with_failure)
+
+    cli.collect_batches(save_local=True, cache_mode='off')
+
+    output = batch_cli.getvalue()
+    assert 'Synthetic short meeting 1: Error analyzing transcript' in output
+    assert 'injected provider failure' in output
+    assert 'Saved 2 of 3 analyses' in output
+    assert len(saved_files(tmp_path)) == 6
+
+
+def test_request_missing_from_output_is_reported(batch_cli, tmp_path, monkeypatch):
+    job = submit()
+    results = LocalBatchProvider.results
+    dropped = job['requests'][0]['custom_id']
+    monkeypatch.setattr(LocalBatchProvider, 'results', lambda self, job_id: {
+        custom_id: result for custom_id, result in results(self, job_id).items() if custom_id != dropped
+    })
+
+    cli.collect_batches(save_local=True, cache_mode='off')
+
+    output = batch_cli.getvalue()
+    assert 'Synthetic short meeting 0: Error analyzing transcript' in output
+    assert 'missing from batch output' in output
+    assert 'Saved 2 of 3 analyses' in output
+
+
+def test_failed_job_is_marked_failed_and_nothing_saved(batch_cli, tmp_path, monkeypatch):
+    job = submit()
+    monkeypatch.setattr(LocalBatchProvider, 'status', lambda self, job_id: FAILED)
+
+    cli.collect_batches(save_local=True, cache_mode='off')
+
+    assert f"Batch job {job['job_id']} failed or expired" in batch_cli.getvalue()
+    assert BatchJobStore().load(job['job_id'])['status'] == 'failed'
+    assert BatchJobStore().pending() == []
+    assert saved_files(tmp_path) == []
+
+
+def test_openai_results_include_errored_requests():
+    output = [
+        {'custom_id': 'ok', 'response': {'status_code': 200, 'body': {'choices': [{'message': {'content': 'analysis'}}]}}},
+        {'custom_id': 'limited', 'response': {'status_code': 429, 'body': {'error': {'message': 'rate limited'}}}},
+    ]
+    errors = [{'custom_id': 'expired', 'response': None, 'error': {'code': 'batch_expired'}}]
+    files = {'out': output, 'err': errors}
+    provider = OpenAIBatchProvider.__new__(OpenAIBatchProvider)
+    provider.client = SimpleNamespace(
+        batches=SimpleNamespace(retrieve=lambda job_id: SimpleNamespace(output_file_id='out', error_file_id='err')),
+        files=SimpleNamespace(content=lambda file_id: SimpleNamespace(text='\n'.join(json.dumps(row) for row in files[file_id])))
+    )
+
+    results = provider.results('batch_1')
+
+    assert results['ok'] == ('analysis', None)
+    assert results['limited'][0] is None and 'rate limited' in results['limited'][1]
+    assert results['expired'][0] is None and 'batch_expired' in results['expired'][1]
+
+
+def test_long_transcript_is_mapped_now_and_its_reduce_call_batched(batch_cli, tmp_path, monkeypatch):
+    monkeypatch.setenv('MAX_PROMPT_TOKENS', '4000')
+    monkeypatch.setenv('CHUNK_TOKENS', '2000')
+    transcripts = make_transcripts(2, ['short', 'long'])
+    use_transcripts(monkeypatch, transcripts)
+
+    job = submit()
+
+    long_request = next(request for request in job['requests'] if request['mapped'])
+    assert 'Extracted notes' in long_request['prompt']
+    assert estimate_tokens(long_request['prompt']) < estimate_tokens(transcripts[1]['body']) / 2
+    assert [request['mapped'] for request in job['requests']] == [False, True]
+    assert 'Extracted 1 long transcript(s) in parts now' in batch_cli.getvalue()
+
+    cli.collect_batches(save_local=True, cache_mode='off')
+
+    assert 'Saved 2 of 2 analyses' in batch_cli.getvalue()
+
+
+def test_excluded_transcripts_are_not_submitted(batch_cli, monkeypatch):
+    monkeypatch.setenv('EXCLUDE_SUBJECTS', 'meeting 2')
+
+    job = submit()
+
+    assert [request['transcript']['topic'] for request in job['requests']] == [
+        'Synthetic short meeting 0', 'Synthetic short meeting 1'
+    ]
+    assert 'Excluded 1 transcript(s)' in batch_cli.getvalue()
@@ -0,0 +1,172 @@
+import pytest
+import content_analyzer
+import fake_llm
+from concurrency_controller import AdaptiveConcurrency, RATE_LIMIT_RETRIES, parse_tpm
+from content_analyzer import ContentAnalyzer
+
+
+class FakeClock:
+    """Clock that only moves when told to (or when the limiter sleeps)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def make_limiter(clock, **kwargs):
+    kwargs.setdefault('max_limit', 16)
+    return AdaptiveConcurrency(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def healthy_call(limiter, seconds=1.0, tokens=100):
+    limiter.acquire()
+    limiter.release(seconds, tokens)
+
+
+def test_healthy_calls_grow_the_limit_additively():
+    limiter = make_limiter(FakeClock(), initial=2)
+
+    for _ in range(2):
+        healthy_call(limiter)
+
+    assert limiter.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+    assert limiter.get_stats()['peak_limit'] == 2
+
+
+def test_429_halves_the_limit_once_per_burst():
+    clock = FakeClock()
+    limiter = make_limiter(clock, initial=8)
+    healthy_call(limiter, seconds=2.0)
+    limit = limiter.limit
+
+    for _ in range(3):
+        limiter.acquire()
+    for _ in range(3):
+        limiter.release(0.5, error=RateLimitError('429 Too Many Requests'))
+
+    assert limiter.limit == pytest.approx(limit / 2)
+    assert limiter.stats['decreases'] == 1
+
+    clock.now += 2.0  # a typical call later, the next 429 counts again
+    limiter.acquire()
+    limiter.release(0.5, error=RateLimitError('429 Too Many Requests'))
+    assert limiter.limit == pytest.approx(limit / 4)
+
+
+def test_limit_never_drops_below_the_minimum():
+    clock = FakeClock()
+    limiter = make_limiter(clock, initial=2, min_limit=1)
+
+    for _ in range(5):
+        clock.now += 10
+        limiter.acquire()
+        limiter.release(0.5, error=TimeoutError())
+
+    assert limiter.limit == 1.0
+
+
+def test_latency_spike_counts_as_overload_but_other_errors_do_not():
+    clock = FakeClock()
+    limiter = make_limiter(clock, initial=4)
+    for _ in range(5):
+        healthy_call(limiter, seconds=1.0, tokens=100)
+    limit = limiter.limit
+
+    limiter.acquire()
+    limiter.release(1.0, error=ValueError('bad request'))
+    assert limiter.limit == limit
+
+    limiter.acquire()
+    limiter.release(10.0, 100)  # same length answer, 10x slower
+    assert limiter.limit == pytest.approx(limit / 2)
+
+
+def test_tpm_budget_sleeps_off_the_deficit():
+    clock = FakeClock()
+    limiter = make_limiter(clock, tpm=6000)  # 100 tokens/s
+
+    limiter.acquire(6000)
+    limiter.release(1.0, 100)
+    limiter.acquire(500)
+
+    assert clock.sleeps == [pytest.approx(5.0)]
+    assert limiter.get_stats()['throttled_seconds'] == pytest.approx(5.0)
+
+
+def test_parse_tpm():
+    assert parse_tpm('anthropic:40000,openai:200000', 'openai') == 200000
+    assert parse_tpm('90000,anthropic:40000', 'gemini') == 90000
+    assert parse_tpm('', 'openai') is None
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff waits taken by ContentAnalyzer, recorded instead of slept"""
+    recorded = []
+    monkeypatch.setattr(content_analyzer.time, 'sleep', recorded.append)
+    return recorded
+
+
+@pytest.fixture
+def analyzer(monkeypatch, sleeps):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    monkeypatch.delenv('LLM_TPM', raising=False)
+    fake_llm.reset_clients()
+    return ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off', adaptive=True, concurrency=4)
+
+
+def failing_caller(analyzer, monkeypatch, errors):
+    """Make the analyzer's caller raise each of errors in turn, then answer"""
+    calls = []
+
+    def call(kwargs):
+        calls.append(kwargs)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return 'answer', analyzer.caller.targets[0], 1
+
+    monkeypatch.setattr(analyzer.caller, 'call', call)
+    return calls
+
+
+def test_rate_limited_call_backs_off_and_retries(analyzer, sleeps, monkeypatch):
+    calls = failing_caller(analyzer, monkeypatch, [RateLimitError('429'), RateLimitError('429')])
+
+    response, _, _, attempts = analyzer._call_limited('prompt', 1000, 0.7)
+
+    assert (response, len(calls), attempts) == ('answer', 3, 3)
+    assert len(sleeps) == 2
+    stats = analyzer.limiter.get_stats()
+    assert (stats['retries'], stats['errors'], stats['decreases'], stats['in_flight']) == (2, 2, 1, 0)
+    assert stats['limit'] == 2
+
+
+def test_rate_limit_retries_are_capped(analyzer, monkeypatch):
+    calls = failing_caller(analyzer, monkeypatch, [RateLimitError('429')] * (RATE_LIMIT_RETRIES + 1))
+
+    with pytest.raises(RateLimitError):
+        analyzer._call_limited('prompt', 1000, 0.7)
+
+    assert len(calls) == RATE_LIMIT_RETRIES + 1
+    assert analyzer.limiter.get_stats()['in_flight'] == 0
+
+
+def test_other_errors_are_not_retried(analyzer, sleeps, monkeypatch):
+    calls = failing_caller(analyzer, monkeypatch, [fake_llm.FakeProviderError('500 internal server error')])
+
+    with pytest.raises(fake_llm.FakeProviderError):
+        analyzer._call_limited('prompt', 1000, 0.7)
+
+    assert len(calls) == 1
+    assert sleeps == []
@@ -0,0 +1,76 @@
+import threading
+import pytest
+from google.auth.credentials import AnonymousCredentials
+import cli
+import google_docs_client
+import google_services
+from google_docs_client import GoogleDocsClient
+from google_services import ServiceRegistry
+
+
+def test_discovery_documents_come_from_the_bundled_copies(monkeypatch):
+    monkeypatch.setattr(google_services.httplib2.Http, 'request', lambda *args, **kwargs: pytest.fail('network fetch'))
+    registry = ServiceRegistry(credentials=AnonymousCredentials())
+
+    doc = registry.get_discovery_document('drive', 'v3')
+
+    assert doc['name'] == 'drive'
+    assert registry.get_discovery_document('drive', 'v3') is doc
+
+
+def test_missing_bundled_discovery_document_fails_loudly():
+    registry = ServiceRegistry(credentials=AnonymousCredentials())
+
+    with pytest.raises(RuntimeError, match='No bundled discovery document for nosuchapi v9'):
+        registry.get_discovery_document('nosuchapi', 'v9')
+
+
+def in_two_threads(func):
+    """Run func on two threads that are alive at the same time, returning both results"""
+    barrier = threading.Barrier(2)
+    results = [None, None]
+
+    def run(index):
+        barrier.wait(5)
+        results[index] = func()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_threads_get_their_own_services_on_shared_credentials():
+    credentials = AnonymousCredentials()
+    registry = ServiceRegistry(credentials=credentials)
+
+    first, second = in_two_threads(lambda: (registry.get_service('drive', 'v3'), registry.get_service('drive', 'v3')))
+
+    assert first[0] is first[1]  # reused within a thread
+    assert first[0] is not second[0]
+    assert first[0]._http is not second[0]._http
+    assert first[0]._http.credentials is second[0]._http.credentials is credentials
+
+
+def test_threaded_doc_saves_use_their_own_registry_services(monkeypatch):
+    credentials = AnonymousCredentials()
+    docs_client = GoogleDocsClient(registry=ServiceRegistry(credentials=credentials))
+    used = []
+
+    def execute(request, api, **kwargs):
+        used.append((threading.current_thread(), request.http))
+        return {'documentId': 'doc1'}
+
+    monkeypatch.setattr(google_docs_client, 'execute', execute)
+
+    results = in_two_threads(lambda: cli.save_google_doc(docs_client, 'Title', '# Heading\n\nBody', None))
+
+    assert [status for _, status in results] == ['created', 'created']
+    https = {thread: {id(http) for t, http in used if t is thread} for thread, _ in used}
+    assert len(https) == 2
+    assert all(len(ids) == 1 for ids in https.values())  # create and batchUpdate share the thread's transport
+    first, second = https.values()
+    assert first != second
+    assert all(http.credentials is credentials for _, http in used)
@@ -0,0 +1,56 @@
+import itertools
+import os
+import zlib
+import llm_cache
+from llm_cache import LLMCache
+
+
+def make_cache(tmp_path, monkeypatch, max_bytes):
+    # Each set/get is one tick later, so recency never ties
+    ticks = itertools.count()
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: float(next(ticks)))
+    return LLMCache(str(tmp_path / 'cache.sqlite3'), max_bytes=max_bytes)
+
+
+def responses(keys):
+    """Random text per key, with its compressed size as stored in the cache"""
+    texts = {key: os.urandom(300).hex() + key for key in keys}
+    return texts, {key: len(zlib.compress(text.encode('utf-8'), 6)) for key, text in texts.items()}
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes(tmp_path, monkeypatch):
+    texts, sizes = responses('abcd')
+    # Room for any three entries but not all four
+    cache = make_cache(tmp_path, monkeypatch, max_bytes=sum(sorted(sizes.values())[1:]))
+    for key in 'abc':
+        cache.set(key, texts[key])
+    assert cache.stats()['evictions'] == 0
+
+    assert cache.get('a') == texts['a']  # now more recent than b
+    cache.set('d', texts['d'])
+
+    assert not cache.contains('b')
+    assert all(cache.contains(key) for key in 'acd')
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= cache.max_bytes
+
+
+def test_an_entry_bigger_than_the_cache_is_not_kept(tmp_path, monkeypatch):
+    texts, _ = responses('a')
+    cache = make_cache(tmp_path, monkeypatch, max_bytes=100)
+
+    cache.set('a', texts['a'])
+
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['writes'], stats['evictions'], stats['entries'], stats['misses']) == (1, 1, 0, 1)
+
+
+def test_key_covers_model_and_parameters():
+    key = LLMCache.make_key('prompt', 'openai', 'gpt-4o-mini', 4000, 0.7)
+
+    assert key == LLMCache.make_key('prompt', 'openai', 'gpt-4o-mini', 4000, 0.7)
+    assert key != LLMCache.make_key('prompt', 'openai', 'gpt-4o', 4000, 0.7)
+    assert key != LLMCache.make_key('prompt', 'openai', 'gpt-4o-mini', 4000, 0.2)
+    assert key != LLMCache.make_key('prompt', 'openai', 'gpt-4o-mini', 4000, 0.7, output_format='json')
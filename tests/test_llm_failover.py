@@ -0,0 +1,99 @@
+import threading
+import pytest
+from concurrency_controller import AdaptiveConcurrency
+from llm_failover import HedgedCaller, LLMTarget
+
+
+class Client:
+    """Answers after release is set (immediately if there is none), recording the calling thread"""
+
+    def __init__(self, response='answer', release=None, error=None):
+        self.response = response
+        self.release = release
+        self.error = error
+        self.threads = []
+
+    def generate(self, prompt, max_tokens=4000, temperature=0.7):
+        self.threads.append(threading.current_thread())
+        if self.release:
+            self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.response
+
+
+def make_caller(*clients, **kwargs):
+    targets = [LLMTarget(f"p{i}", f"m{i}", client=client) for i, client in enumerate(clients)]
+    kwargs.setdefault('hedge_delay', 0.05)
+    kwargs.setdefault('min_hedge_delay', 0.0)
+    kwargs.setdefault('timeout', 5)
+    kwargs.setdefault('hedge', True)
+    return HedgedCaller(targets, **kwargs)
+
+
+def test_single_target_runs_on_the_calling_thread():
+    client = Client()
+    caller = make_caller(client)
+
+    response, target, attempts = caller.call({'prompt': 'hi', 'max_tokens': 100})
+
+    assert (response, attempts) == ('answer', 1)
+    assert client.threads == [threading.current_thread()]
+
+
+def test_failover_to_backup_after_error():
+    primary, backup = Client(error=RuntimeError('500')), Client('backup answer')
+    caller = make_caller(primary, backup, hedge=False)
+
+    response, target, attempts = caller.call({'prompt': 'hi', 'max_tokens': 100})
+
+    assert (response, target.provider, attempts) == ('backup answer', 'p1', 2)
+    assert caller.get_stats()['failovers'] == 1
+
+
+def test_slow_primary_is_hedged():
+    release = threading.Event()
+    caller = make_caller(Client('slow', release=release), Client('fast'))
+
+    response, target, _ = caller.call({'prompt': 'hi', 'max_tokens': 100})
+    release.set()
+
+    assert (response, target.provider) == ('fast', 'p1')
+    assert caller.get_stats()['hedged'] == 1
+    assert caller.get_stats()['hedge_wins'] == 1
+
+
+def test_hedge_waits_for_room_in_the_limiter():
+    release = threading.Event()
+    caller = make_caller(Client('slow', release=release), Client('fast'))
+    caller.limiter = AdaptiveConcurrency(initial=1, max_limit=1)
+    caller.limiter.acquire()  # the primary's slot, as taken by ContentAnalyzer._call_limited
+    threading.Timer(0.3, release.set).start()
+
+    response, target, _ = caller.call({'prompt': 'hi', 'max_tokens': 100})
+
+    assert (response, target.provider) == ('slow', 'p0')
+    assert caller.get_stats()['hedged'] == 0
+
+
+def test_hedge_holds_a_limiter_slot_of_its_own():
+    release = threading.Event()
+    caller = make_caller(Client('slow', release=release), Client('fast'))
+    caller.limiter = AdaptiveConcurrency(initial=2, max_limit=2)
+    caller.limiter.acquire()
+
+    response, _, _ = caller.call({'prompt': 'hi', 'max_tokens': 100})
+    release.set()
+
+    assert response == 'fast'
+    stats = caller.limiter.get_stats()
+    assert stats['calls'] == 1  # the hedge, released when it answered
+    assert stats['in_flight'] == 1  # the primary's slot stays with its caller
+
+
+def test_deadline_is_stretched_for_slow_models():
+    caller = HedgedCaller([LLMTarget('qwen', 'qwen2.5:32b', client=Client())], timeout=600)
+
+    # 2 x (20s overhead + 4000 tokens at 11 tok/s)
+    assert caller.timeout_for(caller.targets[0], 4000) == pytest.approx(2 * (20 + 4000 / 11))
+    assert caller.timeout_for(LLMTarget('openai', 'gpt-4o-mini', client=Client()), 4000) == 600
@@ -0,0 +1,61 @@
+import threading
+import fake_llm
+from benchmark_pipeline import make_transcripts
+from content_analyzer import ContentAnalyzer
+
+FOCUSES = ['AI safety', 'Startup fundraising']
+
+
+def make_analyzer(monkeypatch, **kwargs):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    fake_llm.reset_clients()
+    return ContentAnalyzer(content_focus=FOCUSES, model_override='fake-llm', provider_override='fake', cache_mode='off',
+                           compact=True, pack=False, routing=False, **kwargs)
+
+
+def record_prompts(analyzer, monkeypatch):
+    prompts = []
+    lock = threading.Lock()
+    generate = analyzer.client.generate
+
+    def recording_generate(prompt, **kwargs):
+        with lock:
+            prompts.append(prompt)
+        return generate(prompt, **kwargs)
+
+    monkeypatch.setattr(analyzer.client, 'generate', recording_generate)
+    return prompts
+
+
+def test_each_transcript_yields_one_result_per_focus_in_order(monkeypatch):
+    analyzer = make_analyzer(monkeypatch)
+    prompts = record_prompts(analyzer, monkeypatch)
+    transcripts = make_transcripts(2, ['short'])
+
+    results = list(analyzer.iter_analyze(transcripts, concurrency=4))
+
+    assert [(result['topic'], result['focus']) for result in results] == [
+        (transcript['topic'], focus) for transcript in transcripts for focus in FOCUSES
+    ]
+    assert not any('error' in result for result in results)
+    assert sorted(focus for prompt in prompts for focus in FOCUSES if f"focused on {focus}" in prompt) == sorted(FOCUSES * 2)
+    # Compacted once per transcript, not once per focus
+    assert analyzer.compaction_stats['transcripts'] == 2
+
+
+def test_a_failing_focus_does_not_stop_the_others(monkeypatch):
+    analyzer = make_analyzer(monkeypatch)
+    generate = analyzer.client.generate
+
+    def generate_or_fail(prompt, **kwargs):
+        if f"focused on {FOCUSES[1]}" in prompt:
+            raise ValueError('injected failure')
+        return generate(prompt, **kwargs)
+
+    monkeypatch.setattr(analyzer.client, 'generate', generate_or_fail)
+
+    results = list(analyzer.iter_analyze(make_transcripts(2, ['short']), concurrency=2))
+
+    assert [(result['focus'], 'error' in result) for result in results] == [
+        (FOCUSES[0], False), (FOCUSES[1], True), (FOCUSES[0], False), (FOCUSES[1], True)
+    ]
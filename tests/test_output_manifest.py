@@ -0,0 +1,77 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from rich.console import Console
+import cli
+from output_manifest import OutputManifest
+
+
+class FakeDocsClient:
+    """Records creates and updates instead of calling the Docs API"""
+
+    def __init__(self):
+        self.created = []
+        self.updated = []
+
+    def create_document(self, title, content, folder_id=None, app_properties=None):
+        doc_id = f"doc{len(self.created) + 1}"
+        self.created.append(content)
+        return {'id': doc_id, 'url': f"https://docs.google.com/document/d/{doc_id}/edit", 'title': title}
+
+    def update_document(self, document_id, content, title=None, app_properties=None):
+        self.updated.append(content)
+        return {'id': document_id, 'url': f"https://docs.google.com/document/d/{document_id}/edit", 'title': title}
+
+    def list_tagged_documents(self, folder_id, key):
+        return []
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('OUTPUT_FOLDER_ID', 'folder')
+    monkeypatch.setattr(cli, '_output_manifest', None)
+    monkeypatch.setattr(cli, 'console', Console(file=io.StringIO()))
+    return FakeDocsClient()
+
+
+RESULT = {'id': 'msg1', 'topic': 'Weekly sync', 'date': '2026-01-05'}
+TOPIC = {'number': 1, 'title': 'Agents', 'content': '## TOPIC 1: Agents\n\n**Description:** About agents.'}
+
+
+def test_streamed_then_batch_save_of_same_topic_is_unchanged(docs):
+    cli.save_topic(RESULT, TOPIC, 1, None, docs_client=docs)
+    cli.save_topic(RESULT, TOPIC, 1, 3, docs_client=docs)
+
+    assert len(docs.created) == 1
+    assert docs.updated == []
+
+
+def test_changed_topic_updates_its_doc_in_place(docs):
+    cli.save_topic(RESULT, TOPIC, 1, 3, docs_client=docs)
+    cli.save_topic(RESULT, dict(TOPIC, content=TOPIC['content'] + ' More.'), 1, 3, docs_client=docs)
+
+    assert len(docs.created) == 1
+    assert len(docs.updated) == 1
+
+
+def test_focuses_get_separate_docs(docs):
+    cli.save_topic(dict(RESULT, focus='AI safety'), TOPIC, 1, 3, docs_client=docs)
+    cli.save_topic(dict(RESULT, focus='Startups'), TOPIC, 1, 3, docs_client=docs)
+
+    assert len(docs.created) == 2
+
+
+def test_concurrent_records_are_all_kept(tmp_path):
+    manifest = OutputManifest(str(tmp_path / 'manifest.json'))
+
+    def record(number):
+        manifest.record('msg1', number, f"hash{number}", f"doc{number}", f"Topic {number}", f"url{number}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record, range(50)))
+
+    saved = json.loads((tmp_path / 'manifest.json').read_text())['entries']
+    assert len(saved) == 50
+    assert OutputManifest(str(tmp_path / 'manifest.json')).lookup('msg1', 49)['doc_id'] == 'doc49'
@@ -0,0 +1,112 @@
+import pytest
+import fake_llm
+from content_analyzer import ContentAnalyzer
+from output_repair import check_analysis, drop_last_topic, normalize_headers, normalize_quotes, splice_topic
+from token_estimator import estimate_tokens
+from topic_stream import parse_topics
+
+
+def topic(number, quotes=True):
+    lines = [
+        f"## TOPIC {number}: Topic {number}",
+        '',
+        f"**Description:** What topic {number} is about.",
+        '',
+        '**Key Insights:**',
+        f"• Insight about topic {number}",
+        '',
+    ]
+    if quotes:
+        lines += ['**Notable Quotes:**', f'> **Ana:** "Quote for topic {number}"']
+    return '\n'.join(lines)
+
+
+def analysis(*topics):
+    return '\n\n---\n\n'.join(topics) + '\n'
+
+
+CUT_OFF = "## TOPIC 3: Topic 3\n\n**Description:** What topic 3 is about, and how the team plans to"
+
+
+@pytest.mark.parametrize('header', ['### Topic 1 - Agents', '**TOPIC 1: Agents**', 'Topic 1. Agents'])
+def test_loose_headers_are_normalized(header):
+    assert normalize_headers(f"{header}\n\nBody") == '## TOPIC 1: Agents\n\nBody'
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('**Ana:** "We ship Friday"', '> **Ana:** "We ship Friday"'),
+    ('- "We ship Friday" — Ana', '> **Ana:** "We ship Friday"'),
+    ('> "We ship Friday"', '> **Unknown:** "We ship Friday"'),
+    ('> **Ana:** "We ship Friday"', '> **Ana:** "We ship Friday"'),
+])
+def test_quote_lines_are_normalized(line, expected):
+    text, fixed = normalize_quotes(f"**Notable Quotes:**\n{line}")
+
+    assert text.split('\n')[1] == expected
+    assert fixed == int(line != expected)
+
+
+def test_cut_off_last_topic_is_detected_only_at_the_token_budget():
+    text = analysis(topic(1), topic(2), CUT_OFF)
+
+    at_budget = check_analysis(text, max_tokens=estimate_tokens(text))
+    assert at_budget['truncated']
+    assert at_budget['incomplete'] == [(2, ['Key Insights', 'Notable Quotes'])]
+    assert not check_analysis(text, max_tokens=4000)['truncated']
+
+
+def test_splice_keeps_the_topic_number_and_separators():
+    text = analysis(topic(1), topic(2, quotes=False), topic(3))
+
+    spliced = splice_topic(text, 1, topic(7) + '\n\n---')
+
+    assert [t['title'] for t in parse_topics(spliced)] == ['Topic 1', 'Topic 7', 'Topic 3']
+    assert [t['number'] for t in parse_topics(spliced)] == [1, 2, 3]
+    assert '## TOPIC 2: Topic 7' in spliced
+    assert spliced.count('\n---\n') == 2
+    assert check_analysis(spliced)['incomplete'] == []
+
+
+def test_drop_last_topic_removes_its_separator():
+    assert drop_last_topic(analysis(topic(1), CUT_OFF)) == topic(1) + '\n'
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    fake_llm.reset_clients()
+    return ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off', repair=True)
+
+
+def test_cut_off_topic_is_repaired_and_spliced_back(analyzer, monkeypatch):
+    prompts = []
+    monkeypatch.setattr(analyzer, '_call_llm', lambda prompt, max_tokens=4000: prompts.append(prompt) or topic(3))
+    text = analysis(topic(1), topic(2), CUT_OFF)
+
+    repaired = analyzer._repair_analysis('original prompt', text, max_tokens=estimate_tokens(text))
+
+    assert [t['title'] for t in parse_topics(repaired)] == ['Topic 1', 'Topic 2', 'Topic 3']
+    assert 'Quote for topic 3' in repaired
+    assert len(prompts) == 1 and 'original prompt' in prompts[0]
+    assert (analyzer.repair_stats['repaired'], analyzer.repair_stats['dropped']) == (1, 0)
+
+
+def test_unrepairable_cut_off_topic_is_dropped(analyzer, monkeypatch):
+    monkeypatch.setattr(analyzer, '_call_llm', lambda prompt, max_tokens=4000: 'Sorry, I cannot help with that.')
+    text = analysis(topic(1), topic(2), CUT_OFF)
+
+    repaired = analyzer._repair_analysis('original prompt', text, max_tokens=estimate_tokens(text))
+
+    assert repaired == analysis(topic(1), topic(2))
+    stats = analyzer.repair_stats
+    assert (stats['repair_calls'], stats['repaired'], stats['dropped'], stats['unrepaired']) == (1, 0, 1, 0)
+
+
+def test_only_local_fixes_without_a_prompt(analyzer, monkeypatch):
+    monkeypatch.setattr(analyzer, '_call_llm', lambda *args, **kwargs: pytest.fail('repair request made'))
+    text = analysis(topic(1), topic(2)).replace('> **Ana:** "Quote for topic 2"', '"Quote for topic 2" - Ana')
+
+    repaired = analyzer._repair_analysis(None, text)
+
+    assert repaired == analysis(topic(1), topic(2))
+    assert analyzer.repair_stats['local_fixes'] == 1
@@ -0,0 +1,57 @@
+import fake_llm
+from content_analyzer import ContentAnalyzer
+from benchmark_pipeline import make_transcripts
+
+
+def make_analyzer(monkeypatch, output_format):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    fake_llm.reset_clients()
+    return ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off',
+                           pack=True, output_format=output_format, routing=False)
+
+
+def record_schemas(analyzer, monkeypatch):
+    """Record, per call, whether the prompt was packed and whether it was schema-constrained"""
+    calls = []
+    generate = analyzer.client.generate
+
+    def recording_generate(prompt, **kwargs):
+        calls.append(('SEPARATE transcripts' in prompt, 'json_schema' in kwargs))
+        return generate(prompt, **kwargs)
+
+    monkeypatch.setattr(analyzer.client, 'generate', recording_generate)
+    return calls
+
+
+def test_json_packing_splits_sections_without_the_schema(monkeypatch):
+    analyzer = make_analyzer(monkeypatch, 'json')
+    assert analyzer.supports_json_schema
+    calls = record_schemas(analyzer, monkeypatch)
+
+    results = list(analyzer.iter_analyze(make_transcripts(3, ['short']), concurrency=1))
+
+    assert [('error' in result) for result in results] == [False, False, False]
+    assert all(result['structured']['topics'] for result in results)
+    assert analyzer.pack_stats == {'requests': 1, 'transcripts': 3, 'fallbacks': 0}
+    assert calls == [(True, False)]
+
+
+def test_single_json_request_is_schema_constrained(monkeypatch):
+    analyzer = make_analyzer(monkeypatch, 'json')
+    calls = record_schemas(analyzer, monkeypatch)
+
+    result = analyzer.analyze_transcript(make_transcripts(1, ['short'])[0])
+
+    assert 'error' not in result
+    assert calls == [(False, True)]
+
+
+def test_cut_off_packed_section_falls_back_to_its_own_request(monkeypatch):
+    analyzer = make_analyzer(monkeypatch, 'markdown')
+    analyzer.pack_max_output_tokens = 1200  # room for the first sections only
+
+    results = list(analyzer.iter_analyze(make_transcripts(3, ['short']), concurrency=1))
+
+    assert [('error' in result) for result in results] == [False, False, False]
+    assert analyzer.pack_stats['requests'] == 1
+    assert analyzer.pack_stats['fallbacks'] >= 1
@@ -0,0 +1,21 @@
+import io
+from rich.console import Console
+import cli
+import fake_llm
+from benchmark_pipeline import make_transcripts
+from content_analyzer import ContentAnalyzer
+
+
+def test_run_stats_show_the_counters_a_run_touched(monkeypatch):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    fake_llm.reset_clients()
+    output = io.StringIO()
+    monkeypatch.setattr(cli, 'console', Console(file=output, width=200))
+    analyzer = ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off', pack=True, routing=False)
+
+    list(analyzer.iter_analyze(make_transcripts(3, ['short']), concurrency=1))
+    cli.display_run_stats(analyzer)
+
+    text = output.getvalue()
+    assert 'Packing: 3 short transcript(s) in 1 request(s)' in text
+    assert 'Routing:' not in text
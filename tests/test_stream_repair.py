@@ -0,0 +1,85 @@
+import fake_llm
+from content_analyzer import ContentAnalyzer
+from benchmark_pipeline import make_transcripts
+
+
+def topic(number, quotes=True):
+    lines = [
+        f"## TOPIC {number}: Topic {number}",
+        '',
+        f"**Description:** What topic {number} is about.",
+        '',
+        '**Key Insights:**',
+        f"• Insight about topic {number}",
+        '',
+    ]
+    if quotes:
+        lines += ['**Notable Quotes:**', f'> **Ana:** "Quote for topic {number}"']
+    return '\n'.join(lines)
+
+
+def make_analyzer(monkeypatch, repair):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    fake_llm.reset_clients()
+    return ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off', repair=repair)
+
+
+def stream(analyzer, monkeypatch, text, events):
+    """Stream text in one delta per line, recording handed-over topics alongside the deltas"""
+    def stream_llm(prompt, max_tokens=4000):
+        for line in text.splitlines(keepends=True):
+            events.append('delta')
+            yield line
+        events.append('end')
+
+    monkeypatch.setattr(analyzer, '_stream_llm', stream_llm)
+    transcript = make_transcripts(1, ['short'])[0]
+    return analyzer.analyze_transcript_stream(transcript, on_topic=lambda t: events.append(t))
+
+
+def test_topics_needing_repair_are_handed_over_repaired(monkeypatch):
+    analyzer = make_analyzer(monkeypatch, repair=True)
+    monkeypatch.setattr(analyzer, '_call_llm', lambda prompt, max_tokens=4000: topic(1))
+    events = []
+
+    result = stream(analyzer, monkeypatch, '\n\n---\n\n'.join([topic(1), topic(2, quotes=False), topic(3)]), events)
+
+    topics = [event for event in events if isinstance(event, dict)]
+    assert [t['number'] for t in topics] == [1, 2, 3]
+    # The complete first topic is handed over while the rest is still streaming
+    assert events.index(topics[0]) < events.index('end')
+    # The topic missing its quotes only after it was repaired
+    assert events.index(topics[1]) > events.index('end')
+    assert 'Quote for topic 1' in topics[1]['content']
+    assert topics[1]['content'].startswith('## TOPIC 2:')
+    assert 'Quote for topic 1' in result['analysis']
+    assert analyzer.repair_stats['repaired'] == 1
+
+
+def test_without_repair_topics_are_handed_over_as_they_complete(monkeypatch):
+    analyzer = make_analyzer(monkeypatch, repair=False)
+    events = []
+
+    stream(analyzer, monkeypatch, '\n\n---\n\n'.join([topic(1), topic(2, quotes=False), topic(3)]), events)
+
+    topics = [event for event in events if isinstance(event, dict)]
+    assert [t['number'] for t in topics] == [1, 2, 3]
+    assert events.index(topics[1]) < events.index('end')
+
+
+def test_failed_repair_request_is_counted_and_keeps_the_analysis(monkeypatch):
+    analyzer = make_analyzer(monkeypatch, repair=True)
+
+    def fail(prompt, max_tokens=4000):
+        raise fake_llm.FakeProviderError('500 internal server error (injected)')
+
+    monkeypatch.setattr(analyzer, '_call_llm', fail)
+    events = []
+
+    result = stream(analyzer, monkeypatch, '\n\n---\n\n'.join([topic(1), topic(2, quotes=False), topic(3)]), events)
+
+    assert 'error' not in result
+    assert [event['number'] for event in events if isinstance(event, dict)] == [1, 2, 3]
+    assert analyzer.repair_stats['repair_calls'] == 1
+    assert analyzer.repair_stats['errors'] == 1
+    assert analyzer.repair_stats['unrepaired'] == 1
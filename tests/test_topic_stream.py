@@ -0,0 +1,48 @@
+import pytest
+from topic_stream import TopicStreamParser, parse_topics
+
+TEXT = (
+    "Here are the topics.\n\n"
+    "## TOPIC 1: Agents\n\n**Description:** Agents that act.\n\n---\n\n"
+    "## TOPIC 2: Evals\n\n**Description:** Measuring the ## TOPIC markers is hard.\n\n---\n\n"
+    "## TOPIC 10: Costs\n\n**Description:** Tokens add up."
+)
+
+
+def stream(deltas):
+    parser = TopicStreamParser()
+    completed = []
+    for delta in deltas:
+        completed.append(parser.feed(delta))
+    return completed, parser.close()
+
+
+@pytest.mark.parametrize('split', range(len(TEXT) + 1))
+def test_any_two_deltas_give_the_same_topics_as_the_full_text(split):
+    completed, final = stream([TEXT[:split], TEXT[split:]])
+
+    assert [topic for topics in completed for topic in topics] + final == parse_topics(TEXT)
+
+
+def test_one_character_at_a_time():
+    completed, final = stream(TEXT)
+
+    topics = [topic for topics in completed for topic in topics] + final
+    assert [(topic['number'], topic['title']) for topic in topics] == [(1, 'Agents'), (2, 'Evals'), (3, 'Costs')]
+
+
+def test_topic_is_handed_over_once_the_next_header_is_complete():
+    parser = TopicStreamParser()
+
+    assert parser.feed("## TOPIC 1: Agents\n\nBody.\n\n## TOP") == []
+    assert parser.feed("IC 2") == []
+    assert [topic['title'] for topic in parser.feed(": Evals\n")] == ['Agents']
+    assert [topic['title'] for topic in parser.close()] == ['Evals']
+    assert parser.close() == []
+
+
+def test_no_topics_without_headers():
+    completed, final = stream(["I could not find ", "any topics in this transcript."])
+
+    assert completed == [[], []]
+    assert final == []
@@ -0,0 +1,56 @@
+import re
+import fake_llm
+from content_analyzer import ContentAnalyzer
+from token_estimator import estimate_tokens
+from transcript_chunker import chunk_transcript, split_speaker_turns
+
+BODY = '\n'.join(
+    f"{['Jane Doe', 'Sam Lee'][index % 2]}: Point number {index} is about the roadmap and the launch plan for this quarter."
+    for index in range(40)
+) + '\n'
+
+
+def test_chunks_stay_within_budget_and_never_split_a_turn():
+    chunks = chunk_transcript(BODY, 100)
+
+    assert len(chunks) > 1
+    assert ''.join(chunks) == BODY
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert all(turn['speaker'] for chunk in chunks for turn in split_speaker_turns(chunk))
+
+
+def test_an_oversized_turn_is_split_on_sentences():
+    turn = 'Jane Doe: ' + ' '.join(f"Sentence {index} about the launch." for index in range(60))
+
+    chunks = chunk_transcript(turn, 50)
+
+    assert len(chunks) > 1
+    assert all(chunk.rstrip().endswith('.') for chunk in chunks)
+    assert ' '.join(chunks) == turn
+
+
+def test_reduce_prompt_merges_part_extracts_in_order(monkeypatch):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    fake_llm.reset_clients()
+    analyzer = ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off',
+                               chunk_mode='always', compact=False, salience=False, digests=False, routing=False)
+    analyzer.chunk_tokens = 100
+    prompts = []
+
+    def call_llm(prompt, max_tokens=4000, temperature=0.7):
+        prompts.append(prompt)
+        part = re.search(r'Transcript \(part (\d+) of (\d+)\)', prompt)
+        return f"Extract from part {part.group(1)}" if part else 'final analysis'
+
+    monkeypatch.setattr(analyzer, '_call_llm', call_llm)
+    transcript = {'id': 't1', 'topic': 'Roadmap', 'date': '2026-01-05', 'subject': 'Notes: Roadmap', 'body': BODY}
+
+    analysis = analyzer._analyze_in_chunks(transcript)
+
+    total = len(chunk_transcript(BODY, 100))
+    assert analysis == 'final analysis'
+    assert len(prompts) == total + 1
+    reduce_prompt = prompts[-1]
+    positions = [reduce_prompt.index(f"--- Part {index} of {total} ---\nExtract from part {index}") for index in range(1, total + 1)]
+    assert positions == sorted(positions)
+    assert 'Point number 0 is about' not in reduce_prompt  # only the extracts reach the reduce call
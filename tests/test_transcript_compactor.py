@@ -0,0 +1,55 @@
+import pytest
+from transcript_compactor import TranscriptCompactor
+
+
+def compact_turn(spoken):
+    compactor = TranscriptCompactor(strip_fillers=True, intern_speakers=False)
+    text, _ = compactor.compact(f"Jane Doe: {spoken}\nSam Lee: Okay, go on then.")
+    return text.split('\n')[0][len('Jane Doe: '):]
+
+
+@pytest.mark.parametrize('spoken', [
+    'The sensor is 50 mm wide.',
+    'Sales of the iPhone grew. iPhone owners upgrade less.',
+    'Hmm. I said we should wait.',
+])
+def test_quotes_stay_verbatim(spoken):
+    assert compact_turn(spoken) == spoken
+
+
+@pytest.mark.parametrize('spoken, expected', [
+    ('So, um, we ship on Friday.', 'So, we ship on Friday.'),
+    ('um, so we ship on Friday.', 'so we ship on Friday.'),
+    ('We uh ship it, um', 'We ship it'),
+    ('Uh-huh, the umbrella team agreed.', 'Uh-huh, the umbrella team agreed.'),
+])
+def test_standalone_fillers_are_removed(spoken, expected):
+    assert compact_turn(spoken) == expected
+
+
+GEMINI_TRANSCRIPT = """Transcript
+00:00:00
+
+Jane Doe: Rule one: you know, like, we never ship on a Friday. It's 3 a.m. fixes for everyone.
+00:00:12
+Jane Doe: Um, and the 50 mm sensor stays.
+Sam Lee: Okay, agreed.
+This editable transcript was computer generated and might contain errors.
+"""
+
+
+def test_full_transcript_keeps_the_quote_verbatim():
+    compacted, stats = TranscriptCompactor(strip_fillers=True, intern_speakers=True).compact(GEMINI_TRANSCRIPT)
+
+    assert compacted.split('\n') == [
+        '[Speakers: Jane = Jane Doe, Sam = Sam Lee]',
+        "Jane: Rule one: you know, like, we never ship on a Friday. It's 3 a.m. fixes for everyone. and the 50 mm sensor stays.",
+        'Sam: Okay, agreed.',
+    ]
+    assert stats['compacted_tokens'] < stats['original_tokens']
+
+
+def test_text_without_speaker_turns_is_never_made_bigger():
+    notes = 'Action items\n- Ship the beta\n- Review pricing'
+
+    assert TranscriptCompactor().compact(notes)[0] == notes
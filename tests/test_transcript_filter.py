@@ -0,0 +1,38 @@
+from transcript_filter import ExclusionFilter
+
+
+def transcript(subject='Weekly sync', body='Sam Lee: we should ship the agent.'):
+    return {'subject': subject, 'topic': subject, 'body': body}
+
+
+def test_subject_keywords_match_anywhere_in_the_subject():
+    exclusions = ExclusionFilter(people=[], subjects=['standup', 'HR'])
+
+    assert exclusions.excludes(transcript(subject='Team standups'))
+    assert exclusions.excludes(transcript(subject='hr review'))
+    assert not exclusions.excludes(transcript(subject='Roadmap'))
+
+
+def test_people_match_whole_words_in_the_body():
+    exclusions = ExclusionFilter(people=['Ann', 'Jane Doe'], subjects=[])
+
+    assert exclusions.excludes(transcript(body='Ann: hello.'))
+    assert exclusions.excludes(transcript(body='Notes from JANE  DOE, the PM.'))
+    assert not exclusions.excludes(transcript(body='Sam: the annual plan is ready.'))
+
+
+def test_apply_keeps_order_and_reads_env(monkeypatch):
+    monkeypatch.setenv('EXCLUDE_SUBJECTS', 'internal, admin')
+    monkeypatch.setenv('EXCLUDE_PEOPLE', '')
+    transcripts = [transcript('Roadmap'), transcript('Internal sync'), transcript('Pricing')]
+
+    assert [t['subject'] for t in ExclusionFilter().apply(transcripts)] == ['Roadmap', 'Pricing']
+
+
+def test_no_filters_keeps_everything(monkeypatch):
+    monkeypatch.delenv('EXCLUDE_SUBJECTS', raising=False)
+    monkeypatch.delenv('EXCLUDE_PEOPLE', raising=False)
+    transcripts = [transcript()]
+
+    assert not ExclusionFilter()
+    assert ExclusionFilter().apply(transcripts) is transcripts
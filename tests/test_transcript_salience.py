@@ -0,0 +1,42 @@
+from token_estimator import estimate_tokens
+from transcript_salience import GAP_MARKER, SalienceSelector, _segments
+
+FILLER = "Sam Lee: We talked about the weather and where to get lunch today, nothing else came up in this part of the call really.\n"
+ON_FOCUS = [
+    "Jane Doe: Our pricing strategy moves enterprise plans to usage pricing, which lifted revenue 30% in the pilot group.\n",
+    "Ana Ruiz: The pricing strategy test showed 12% churn on flat plans against 4% on usage pricing for the same accounts.\n",
+]
+BODY = '[Speakers: JD = Jane Doe]\n' + FILLER * 10 + ON_FOCUS[0] + FILLER * 10 + ON_FOCUS[1] + FILLER * 10
+
+
+def test_transcript_within_budget_is_unchanged():
+    selected, stats = SalienceSelector('pricing strategy', budget_tokens=10_000).select(BODY)
+
+    assert selected == BODY
+    assert stats['kept_segments'] == stats['segments'] == 32
+    assert stats['focus_recall'] == 1.0
+
+
+def test_on_focus_turns_are_kept_verbatim_in_order_within_budget():
+    selector = SalienceSelector('pricing strategy', budget_tokens=150)
+
+    selected, stats = selector.select(BODY)
+
+    assert estimate_tokens(selected) <= 150
+    assert selected.startswith('[Speakers: JD = Jane Doe]\n')
+    assert selected.index(ON_FOCUS[0].strip()) < selected.index(ON_FOCUS[1].strip())
+    assert GAP_MARKER in selected
+    assert stats['focus_recall'] == 1.0
+    assert stats['kept_segments'] < stats['segments']
+    assert stats['selected_tokens'] < stats['original_tokens']
+
+
+def test_long_turns_are_split_into_labelled_sentence_runs():
+    turn = 'Jane Doe: ' + ' '.join(f"Sentence {index} covers the launch plan in some detail." for index in range(150))
+
+    header, segments = _segments('[Speakers: JD = Jane Doe]\n' + turn)
+
+    assert header == '[Speakers: JD = Jane Doe]'
+    assert len(segments) > 1
+    assert all(segment.startswith('Jane Doe: Sentence ') and segment.endswith('.') for segment in segments)
+    assert ' '.join(segment[len('Jane Doe: '):] for segment in segments) == turn[len('Jane Doe: '):]
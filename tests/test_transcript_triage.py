@@ -0,0 +1,55 @@
+import json
+import fake_llm
+from benchmark_pipeline import make_transcripts
+from content_analyzer import ContentAnalyzer
+from transcript_triage import TriageScorer
+
+
+def test_focus_terms_raise_relevance_across_word_forms():
+    scorer = TriageScorer('AI strategy for business leaders')
+    on_topic = {'subject': 'Notes: Planning', 'body': 'Ana: Our strategic bet on AI agents. Ben: The AI strategy needs budget.'}
+    off_topic = {'subject': 'Notes: Lunch', 'body': 'Ana: Shall we order pizza again? Ben: Sure, the usual place.'}
+
+    assert scorer.focus_stems == {'ai', 'strat'}
+    assert scorer.score(on_topic)['relevance'] == 1.0
+    assert scorer.score(off_topic)['relevance'] == 0.0
+    assert scorer.score({'body': ''}) == {'relevance': 0.0, 'richness': 0.0, 'score': 0.0, 'words': 0}
+
+
+def test_transcripts_are_routed_by_score(tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    monkeypatch.setenv('ROUTE_MID_MODEL', 'fake-llm-mini')
+    monkeypatch.setenv('ROUTE_MID_PROVIDER', 'fake')
+    monkeypatch.setenv('ROUTING_LOG', str(tmp_path / 'routing.jsonl'))
+    fake_llm.reset_clients()
+    analyzer = ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off', pack=False, routing=True)
+    transcripts = make_transcripts(3, ['short'])
+    # Rich and on-focus, borderline, off-topic
+    scores = dict(zip((t['topic'] for t in transcripts), (0.9, 0.3, 0.1)))
+    monkeypatch.setattr(analyzer.triage, 'score', lambda t: {'relevance': 0.0, 'richness': 0.0, 'score': scores[t['topic']], 'words': 1})
+    models = []
+    for tier in (analyzer, analyzer.mid_analyzer):
+        monkeypatch.setattr(tier, '_analyze_prepared', lambda t, tier=tier: models.append(tier.model) or {'id': t['id'], 'analysis': tier.model})
+
+    results = list(analyzer.iter_analyze(transcripts, concurrency=1))
+
+    assert [result.get('analysis') for result in results] == ['fake-llm', 'fake-llm-mini', None]
+    assert results[2]['skipped'] and 'ROUTE_MIN_SCORE' in results[2]['error']
+    assert models == ['fake-llm', 'fake-llm-mini']
+    stats = analyzer.routing_stats
+    assert (stats['main'], stats['mid'], stats['skip']) == (1, 1, 1)
+    assert stats['saved_tokens'] > 0
+    log = [json.loads(line) for line in (tmp_path / 'routing.jsonl').read_text().splitlines()]
+    assert [(entry['tier'], entry['model']) for entry in log] == [('main', 'fake-llm'), ('mid', 'fake-llm-mini'), ('skip', None)]
+
+
+def test_borderline_transcripts_stay_on_the_main_model_without_a_mid_model(tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MEDIAN', '0')
+    monkeypatch.delenv('ROUTE_MID_MODEL', raising=False)
+    monkeypatch.setenv('ROUTING_LOG', str(tmp_path / 'routing.jsonl'))
+    fake_llm.reset_clients()
+    analyzer = ContentAnalyzer(model_override='fake-llm', provider_override='fake', cache_mode='off', pack=False, routing=True)
+    monkeypatch.setattr(analyzer.triage, 'score', lambda t: {'relevance': 0.0, 'richness': 0.0, 'score': 0.3, 'words': 1})
+
+    assert analyzer.mid_analyzer is None
+    assert analyzer._route(make_transcripts(1, ['short'])[0]) == 'main'
@@ -0,0 +1,90 @@
+import re
+from typing import Dict, List
+
+# Topic headers as emitted by the analysis prompt: "## TOPIC N: Title"
+TOPIC_HEADER_PATTERN = r'## TOPIC \d+:'
+_HEADER_AT_LINE_START = re.compile(r'^' + TOPIC_HEADER_PATTERN, re.MULTILINE)
+
+
+def parse_topics(analysis_text: str, start: int = 1) -> List[Dict]:
+    """
+    Parse individual topics from analysis markdown text.
+
+    Args:
+        analysis_text: Markdown containing "## TOPIC N:" sections
+        start: Number given to the first topic found
+
+    Returns:
+        List of dicts with 'number', 'title' and 'content'
+    """
+    # Split on topic headers (## TOPIC N:)
+    splits = re.split(TOPIC_HEADER_PATTERN, analysis_text)
+
+    # First split is before any topics (usually empty or intro text)
+    # Remaining splits are topic content
+    topics = []
+    topic_headers = re.findall(TOPIC_HEADER_PATTERN, analysis_text)
+
+    for i, (header, content) in enumerate(zip(topic_headers, splits[1:]), start):
+        # Extract topic title from header
+        title_match = re.search(r'## TOPIC \d+: (.+)', header + content.split('\n')[0])
+        if title_match:
+            title = title_match.group(1).strip()
+        else:
+            title = f"Topic {i}"
+
+        # Clean content (remove the title line if it was captured)
+        lines = content.strip().split('\n')
+        if lines and lines[0].strip():
+            topic_content = header + ' ' + content
+        else:
+            topic_content = header + '\n' + content
+
+        topics.append({
+            'number': i,
+            'title': title,
+            'content': topic_content.strip()
+        })
+
+    return topics
+
+
+class TopicStreamParser:
+    """
+    Incrementally parses "## TOPIC N:" sections from streamed LLM output.
+
+    A topic is complete once the next topic header starts (or the stream
+    ends), so each one can be displayed and saved while the model is still
+    generating the rest. Topics come out identical to parse_topics() on the
+    full text.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.emitted = 0
+
+    def _header_starts(self) -> List[int]:
+        return [match.start() for match in _HEADER_AT_LINE_START.finditer(self.text)]
+
+    def feed(self, delta: str) -> List[Dict]:
+        """Add streamed text and return the topics completed by it"""
+        self.text += delta
+
+        starts = self._header_starts()
+        completed = []
+        # The last header's section may still be growing
+        while self.emitted < len(starts) - 1:
+            section = self.text[starts[self.emitted]:starts[self.emitted + 1]]
+            completed.extend(parse_topics(section, start=self.emitted + 1))
+            self.emitted += 1
+        return completed
+
+    def close(self) -> List[Dict]:
+        """End of stream: return the final topic, if any"""
+        starts = self._header_starts()
+        completed = []
+        while self.emitted < len(starts):
+            end = starts[self.emitted + 1] if self.emitted + 1 < len(starts) else len(self.text)
+            completed.extend(parse_topics(self.text[starts[self.emitted]:end], start=self.emitted + 1))
+            self.emitted += 1
+        return completed
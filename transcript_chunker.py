@@ -0,0 +1,84 @@
+import re
+from typing import Dict, List
+from token_estimator import estimate_tokens
+
+# A speaker turn starts a line with an optional timestamp and "Name:" e.g.
+#   "Stephen Sklarew: So the plan is..."  or  "00:12:31 Jane Doe: Right."
+SPEAKER_TURN_PATTERN = re.compile(
+    r"^\s*(?:\[?\d{1,2}:\d{2}(?::\d{2})?\]?\s*)?"
+    r"(?P<speaker>[A-Z][\w.'\-]*(?:\s+[A-Z][\w.'\-]*){0,3}):\s+",
+    re.MULTILINE
+)
+
+# Fallback split points for a single turn that exceeds the chunk budget
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_speaker_turns(body: str) -> List[Dict[str, str]]:
+    """
+    Split transcript text into speaker turns.
+
+    Returns:
+        List of dicts with 'speaker' (empty for text before the first turn)
+        and 'text' (the full turn, including the speaker label)
+    """
+    matches = list(SPEAKER_TURN_PATTERN.finditer(body))
+    if not matches:
+        return [{'speaker': '', 'text': body}] if body.strip() else []
+
+    turns = []
+    if matches[0].start() > 0 and body[:matches[0].start()].strip():
+        turns.append({'speaker': '', 'text': body[:matches[0].start()]})
+
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        end = next_match.start() if next_match else len(body)
+        turns.append({'speaker': match.group('speaker'), 'text': body[match.start():end]})
+
+    return turns
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """Split one over-budget turn on sentence boundaries"""
+    pieces, current = [], ''
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{current} {sentence}" if current else sentence
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_transcript(body: str, max_tokens: int) -> List[str]:
+    """
+    Pack speaker turns into chunks of at most max_tokens (estimated).
+
+    Chunks never split a turn unless the turn alone exceeds the budget, so
+    quotes stay intact and attributed to the right speaker.
+    """
+    chunks, current, current_tokens = [], [], 0
+
+    for turn in split_speaker_turns(body):
+        turn_tokens = estimate_tokens(turn['text'])
+
+        if turn_tokens > max_tokens:
+            if current:
+                chunks.append(''.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_oversized(turn['text'], max_tokens))
+            continue
+
+        if current and current_tokens + turn_tokens > max_tokens:
+            chunks.append(''.join(current))
+            current, current_tokens = [], 0
+
+        current.append(turn['text'])
+        current_tokens += turn_tokens
+
+    if current:
+        chunks.append(''.join(current))
+
+    return chunks
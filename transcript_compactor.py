@@ -0,0 +1,134 @@
+import os
+import re
+from typing import Dict, Tuple
+from token_estimator import estimate_tokens
+from transcript_chunker import split_speaker_turns
+
+# Boilerplate lines Gemini adds around the conversation itself
+BOILERPLATE_LINES = re.compile(
+    r"^\s*(?:Transcript|Notes|Meeting records|Summary|Details|Suggested next steps|"
+    r"Attachments?|Attendees|Invited.*|Recording|"
+    r"This editable transcript was computer generated.*|"
+    r"You should review Gemini's notes.*|Please provide feedback about using Gemini.*|"
+    r"Transcription ended after .*|Meeting ended after .*)\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Standalone timestamp lines ("00:12:31") and leading timestamps on a turn ("[00:12] Jane: ...")
+TIMESTAMP_LINE = re.compile(r"^\s*\[?\d{1,2}:\d{2}(?::\d{2})?\]?\s*$", re.MULTILINE)
+LEADING_TIMESTAMP = re.compile(r"^\s*\[?\d{1,2}:\d{2}(?::\d{2})?\]?\s+(?=\S)", re.MULTILINE)
+
+# Pure disfluencies only - words that carry meaning ("like", "you know") are kept
+# so extracted quotes still read as what the speaker said. A filler is only
+# removed where it stands alone between spaces or commas ("so, um, we"), never
+# next to other punctuation ("Hmm. I said") or inside a word or unit ("50 mm")
+FILLERS = re.compile(r"(?P<lead>^|,?\s+)(?:um+|uh+|erm+|uhm+|hmm+)(?:,|(?=\s)|$)", re.IGNORECASE)
+
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name, '').strip().lower()
+    if not value:
+        return default
+    return value in ('1', 'true', 'yes', 'on')
+
+
+def _remove_fillers(text: str) -> str:
+    # A filler that ends the turn takes the comma before it along ("so, um" -> "so")
+    text = FILLERS.sub(lambda m: '' if m.end() == len(m.string) else m.group('lead'), text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def _speaker_aliases(speakers) -> Dict[str, str]:
+    """Map full speaker names to first names when the first name is unambiguous"""
+    speakers = list(speakers)
+    full_names = [s for s in dict.fromkeys(speakers) if s and ' ' in s]
+    first_names = [name.split()[0] for name in dict.fromkeys(speakers) if name]
+    return {
+        name: name.split()[0]
+        for name in full_names
+        if first_names.count(name.split()[0]) == 1
+    }
+
+
+class TranscriptCompactor:
+    """
+    Shrinks transcript text before it goes into the analysis prompt.
+
+    Strips Gemini boilerplate and timestamps, removes pure disfluencies,
+    merges consecutive turns by the same speaker, normalizes whitespace
+    and replaces repeated full speaker names with first names (listed in a
+    speaker key). The words of each turn are otherwise left untouched so
+    quotes stay verbatim.
+    """
+
+    def __init__(self, strip_fillers=None, intern_speakers=None):
+        self.strip_fillers = _env_flag('COMPACT_FILLERS', True) if strip_fillers is None else strip_fillers
+        self.intern_speakers = _env_flag('COMPACT_SPEAKERS', True) if intern_speakers is None else intern_speakers
+
+    def compact(self, body: str) -> Tuple[str, Dict]:
+        """
+        Compact transcript text.
+
+        Returns:
+            Tuple of (compacted text, stats dict with 'original_tokens',
+            'compacted_tokens' and 'ratio' = compacted / original)
+        """
+        original_tokens = estimate_tokens(body)
+
+        text = BOILERPLATE_LINES.sub('', body)
+        text = TIMESTAMP_LINE.sub('', text)
+        text = LEADING_TIMESTAMP.sub('', text)
+
+        turns = split_speaker_turns(text)
+        aliases = _speaker_aliases(t['speaker'] for t in turns) if self.intern_speakers else {}
+
+        merged = []
+        for turn in turns:
+            speaker = turn['speaker']
+            # Turn text without its "Name:" label
+            spoken = turn['text'][turn['text'].index(':') + 1:] if speaker else turn['text']
+            if speaker:
+                spoken = _SPACES.sub(' ', ' '.join(spoken.split('\n'))).strip()
+                if self.strip_fillers:
+                    spoken = _remove_fillers(spoken)
+            else:
+                # Text outside speaker turns (e.g. a notes doc) keeps its line structure
+                spoken = '\n'.join(_SPACES.sub(' ', line).strip() for line in spoken.split('\n')).strip()
+            if not spoken:
+                continue
+
+            if merged and speaker and merged[-1]['speaker'] == speaker:
+                merged[-1]['spoken'] += ' ' + spoken
+            else:
+                merged.append({'speaker': speaker, 'spoken': spoken})
+
+        lines = []
+        if aliases:
+            key = ', '.join(f"{alias} = {name}" for name, alias in aliases.items())
+            lines.append(f"[Speakers: {key}]")
+        for turn in merged:
+            if turn['speaker']:
+                lines.append(f"{aliases.get(turn['speaker'], turn['speaker'])}: {turn['spoken']}")
+            else:
+                lines.append(turn['spoken'])
+
+        compacted = _BLANK_LINES.sub('\n\n', '\n'.join(lines)).strip()
+        compacted_tokens = estimate_tokens(compacted)
+
+        # Never make a transcript bigger (e.g. unusual formats with no speaker turns)
+        if compacted_tokens >= original_tokens:
+            compacted, compacted_tokens = body, original_tokens
+
+        return compacted, {
+            'original_tokens': original_tokens,
+            'compacted_tokens': compacted_tokens,
+            'ratio': compacted_tokens / original_tokens if original_tokens else 1.0
+        }
+
+
+def compact_transcript(body: str) -> Tuple[str, Dict]:
+    """Compact transcript text with settings from the environment"""
+    return TranscriptCompactor().compact(body)
@@ -0,0 +1,88 @@
+import re
+import hashlib
+from typing import Dict, List
+
+# Bump when the digest format or extraction prompt changes, so old digests aren't reused
+DIGEST_VERSION = 1
+
+# Map-step extract sections and the digest fields they feed
+SECTIONS = {'insights': 'claims', 'quotes': 'quotes', 'evidence': 'data', 'stories': 'stories'}
+
+_SECTION = re.compile(r"^#{2,4}\s*(\w+)")
+_BULLET = re.compile(r"^\s*(?:[•*\-]|\d+[.)])\s+(.+)$")
+_QUOTE = re.compile(r"^\s*>\s*\*\*\[?(.+?)\]?:\*\*\s*(.+?)\s*$")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def content_hash(body: str) -> str:
+    """Stable hash of transcript text, the key digests are reused by"""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def _normalized(text: str) -> str:
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def parse_extract(text: str) -> Dict[str, List]:
+    """
+    Parse one map-step extract (### Insights / Quotes / Evidence / Stories)
+
+    Returns:
+        Dict with 'claims', 'data' and 'stories' (lists of strings) and
+        'quotes' (list of [speaker, quote] pairs)
+    """
+    parsed = {field: [] for field in SECTIONS.values()}
+    field = None
+    for line in text.splitlines():
+        header = _SECTION.match(line)
+        if header:
+            field = SECTIONS.get(header.group(1).lower())
+            continue
+        if field == 'quotes':
+            quote = _QUOTE.match(line)
+            if quote:
+                parsed['quotes'].append([quote.group(1).strip(), quote.group(2).strip().strip('"“”').strip()])
+        elif field:
+            bullet = _BULLET.match(line)
+            if bullet:
+                parsed[field].append(bullet.group(1).strip())
+    return parsed
+
+
+def build_digest(extracts: List[str], body: str) -> Dict:
+    """
+    Merge the map-step extracts of a transcript into one digest.
+
+    Duplicate items are dropped, and so are quotes that don't appear in
+    the transcript text (ignoring case and punctuation) - a digest only
+    carries real quotes.
+    """
+    digest = {'version': DIGEST_VERSION, 'claims': [], 'quotes': [], 'data': [], 'stories': [],
+              'parts': len(extracts), 'dropped_quotes': 0}
+    seen = set()
+    transcript_text = _normalized(body)
+
+    for extract in extracts:
+        for field, items in parse_extract(extract).items():
+            for item in items:
+                text = item[1] if field == 'quotes' else item
+                key = (field, _normalized(text))
+                if not key[1] or key in seen:
+                    continue
+                seen.add(key)
+                if field == 'quotes' and key[1] not in transcript_text:
+                    digest['dropped_quotes'] += 1
+                    continue
+                digest[field].append(item)
+    return digest
+
+
+def render_digest(digest: Dict) -> str:
+    """Digest as the compact markdown notes given to the analysis prompt"""
+    sections = [
+        ('Key Claims', [f"• {claim}" for claim in digest['claims']]),
+        ('Verbatim Quotes', [f"> **{speaker}:** \"{quote}\"" for speaker, quote in digest['quotes']]),
+        ('Data Points', [f"• {item}" for item in digest['data']]),
+        ('Stories', [f"• {story}" for story in digest['stories']]),
+    ]
+    return '\n\n'.join(f"### {title}\n" + '\n'.join(lines) for title, lines in sections if lines)
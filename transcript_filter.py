@@ -0,0 +1,42 @@
+import os
+from typing import Dict, Iterable, List, Optional
+from phrase_matcher import PhraseMatcher
+
+
+def _parse_csv_env(env_var: str) -> List[str]:
+    """Parse comma-separated environment variable into list"""
+    value = os.getenv(env_var, '').strip()
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class ExclusionFilter:
+    """
+    EXCLUDE_SUBJECTS / EXCLUDE_PEOPLE transcript filter.
+
+    Subject keywords match anywhere in the subject line, case-insensitively
+    ("standup" also excludes "Weekly standups"). People match as whole words
+    in the transcript body ("Ann" doesn't exclude a meeting about "Annual"
+    plans), all names in a single pass with a PhraseMatcher.
+    """
+
+    def __init__(self, people: Optional[Iterable[str]] = None, subjects: Optional[Iterable[str]] = None):
+        self.people = list(people) if people is not None else _parse_csv_env('EXCLUDE_PEOPLE')
+        self.subjects = list(subjects) if subjects is not None else _parse_csv_env('EXCLUDE_SUBJECTS')
+        self._subject_keywords = [keyword.lower() for keyword in self.subjects]
+        self._people_matcher = PhraseMatcher(self.people)
+
+    def __bool__(self):
+        return bool(self.subjects or self.people)
+
+    def excludes(self, transcript: Dict) -> bool:
+        """True if the transcript's subject or body matches a filter"""
+        subject = transcript.get('subject', '').lower()
+        if any(keyword in subject for keyword in self._subject_keywords):
+            return True
+        return bool(self._people_matcher and self._people_matcher.search(transcript.get('body', '')))
+
+    def apply(self, transcripts: List[Dict]) -> List[Dict]:
+        """Transcripts that no filter excludes, in their original order"""
+        if not self:
+            return transcripts
+        return [transcript for transcript in transcripts if not self.excludes(transcript)]
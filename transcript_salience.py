@@ -0,0 +1,214 @@
+import os
+import re
+from typing import Dict, List, Tuple
+import numpy as np
+from phrase_matcher import tokenize
+from token_estimator import estimate_tokens
+from transcript_chunker import split_speaker_turns
+from transcript_triage import STOPWORDS, STEM_LENGTH
+
+# Turns longer than this are scored as runs of whole sentences, so one long
+# monologue doesn't have to be kept or dropped as a block
+SEGMENT_TOKENS = 250
+
+# TextRank damping factor and iterations
+DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+
+# Segments shorter than this many words ("Yeah.", "Right, okay.") are scored down
+MIN_SEGMENT_WORDS = 15
+
+# Weights of the focus match, TextRank centrality and concrete figures in a segment's score
+FOCUS_WEIGHT = 0.5
+CENTRALITY_WEIGHT = 0.35
+FIGURES_WEIGHT = 0.15
+
+# Marks where segments were left out of the selection
+GAP_MARKER = '[...]'
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_FIGURE = re.compile(r"\d+(?:[.,]\d+)?\s*(?:%|percent|x\b|k\b|million|billion)?", re.IGNORECASE)
+
+
+def _terms(text: str) -> List[str]:
+    return [w[:STEM_LENGTH] for w in tokenize(text) if len(w) > 2 and w not in STOPWORDS]
+
+
+def _segments(body: str) -> Tuple[str, List[str]]:
+    """
+    Split transcript text into (header, segments).
+
+    The header is any text before the first speaker turn (e.g. the
+    compactor's speaker key). Segments are whole speaker turns, or runs of
+    whole sentences of a long turn prefixed with the speaker's label.
+    """
+    header, segments = '', []
+    for turn in split_speaker_turns(body):
+        text = turn['text'].strip()
+        if not turn['speaker']:
+            if segments:
+                segments.append(text)
+            else:
+                header = text
+            continue
+        if estimate_tokens(text) <= SEGMENT_TOKENS:
+            segments.append(text)
+            continue
+
+        label = f"{turn['speaker']}:"
+        spoken = text[len(label):].strip() if text.startswith(label) else text
+        current = ''
+        for sentence in _SENTENCE_END.split(spoken):
+            candidate = f"{current} {sentence}" if current else sentence
+            if current and estimate_tokens(candidate) > SEGMENT_TOKENS:
+                segments.append(f"{label} {current}")
+                current = sentence
+            else:
+                current = candidate
+        if current:
+            segments.append(f"{label} {current}")
+    return header, segments
+
+
+def _textrank(vectors: np.ndarray) -> np.ndarray:
+    """PageRank over the cosine-similarity graph of L2-normalized segment vectors"""
+    n = len(vectors)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    totals = similarity.sum(axis=1, keepdims=True)
+    # Segments with no shared terms link to every segment equally
+    transition = np.where(totals > 0, similarity / np.where(totals > 0, totals, 1.0), 1.0 / n)
+
+    ranks = np.full(n, 1.0 / n)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ ranks)
+        if np.abs(updated - ranks).sum() < 1e-6:
+            return updated
+        ranks = updated
+    return ranks
+
+
+def _normalized(values: np.ndarray) -> np.ndarray:
+    peak = values.max() if len(values) else 0.0
+    return values / peak if peak > 0 else np.zeros_like(values)
+
+
+def _assemble(header: str, segments: List[str], kept) -> str:
+    """Kept segments in transcript order, with a gap marker wherever segments were left out"""
+    lines = [header] if header else []
+    previous = -1
+    for index in sorted(kept):
+        if index != previous + 1:
+            lines.append(GAP_MARKER)
+        lines.append(segments[index])
+        previous = index
+    if previous != len(segments) - 1:
+        lines.append(GAP_MARKER)
+    return '\n'.join(lines)
+
+
+class SalienceSelector:
+    """
+    Extractive pre-selection of the parts of a long transcript worth analyzing.
+
+    Speaker turns (long turns split into sentence runs) are scored with
+    TF-IDF cosine similarity to the content focus, TextRank centrality and
+    the presence of concrete figures. The best segments are kept, in their
+    original order, up to a token budget, with a marker where text was left
+    out. Kept segments are whole sentences copied verbatim, so quotes taken
+    from the selection are real quotes.
+    """
+
+    def __init__(self, content_focus: str, budget_tokens=None):
+        self.budget_tokens = budget_tokens or int(os.getenv('SALIENCE_BUDGET', '8000'))
+        self.focus_terms = set(_terms(content_focus))
+
+    def score(self, segments: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score segments
+
+        Returns:
+            Tuple of (salience score per segment, focus-term occurrences per segment)
+        """
+        terms = [_terms(segment) for segment in segments]
+        vocabulary = {term: index for index, term in enumerate(sorted({t for ts in terms for t in ts}))}
+        counts = np.zeros((len(segments), max(1, len(vocabulary))))
+        for row, segment_terms in enumerate(terms):
+            for term in segment_terms:
+                counts[row, vocabulary[term]] += 1
+
+        idf = np.log((1 + len(segments)) / (1 + (counts > 0).sum(axis=0))) + 1
+        vectors = np.log1p(counts) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+        focus_columns = [vocabulary[term] for term in self.focus_terms if term in vocabulary]
+        focus_hits = counts[:, focus_columns].sum(axis=1) if focus_columns else np.zeros(len(segments))
+        if focus_columns:
+            query = np.zeros(counts.shape[1])
+            query[focus_columns] = idf[focus_columns]
+            focus = vectors @ (query / np.linalg.norm(query))
+        else:
+            focus = np.zeros(len(segments))
+
+        figures = np.array([min(1.0, len(_FIGURE.findall(segment)) / 2) for segment in segments])
+        lengths = np.array([min(1.0, len(segment.split()) / MIN_SEGMENT_WORDS) for segment in segments])
+
+        scores = (
+            FOCUS_WEIGHT * _normalized(focus)
+            + CENTRALITY_WEIGHT * _normalized(_textrank(vectors))
+            + FIGURES_WEIGHT * figures
+        ) * lengths
+        return scores, focus_hits
+
+    def select(self, body: str) -> Tuple[str, Dict]:
+        """
+        Keep the most salient segments of a transcript within the token budget.
+
+        Returns:
+            Tuple of (selected text, stats dict with 'original_tokens',
+            'selected_tokens', 'segments', 'kept_segments' and the quality
+            proxies 'focus_recall' (share of focus-term mentions kept) and
+            'salience_kept' (share of the total salience score kept))
+        """
+        original_tokens = estimate_tokens(body)
+        header, segments = _segments(body)
+        unchanged = {
+            'original_tokens': original_tokens, 'selected_tokens': original_tokens,
+            'segments': len(segments), 'kept_segments': len(segments),
+            'focus_recall': 1.0, 'salience_kept': 1.0
+        }
+        if original_tokens <= self.budget_tokens or len(segments) < 2:
+            return body, unchanged
+
+        scores, focus_hits = self.score(segments)
+        sizes = [estimate_tokens(segment) for segment in segments]
+        budget = self.budget_tokens - estimate_tokens(header)
+
+        kept, used = set(), 0
+        for index in np.argsort(-scores, kind='stable'):
+            if used + sizes[index] <= budget:
+                kept.add(int(index))
+                used += sizes[index]
+
+        selected = _assemble(header, segments, kept)
+        # Gap markers and line breaks can tip the text over budget; drop the weakest segments until it fits
+        while estimate_tokens(selected) > self.budget_tokens and len(kept) > 1:
+            kept.remove(min(kept, key=lambda index: scores[index]))
+            selected = _assemble(header, segments, kept)
+
+        kept_indices = sorted(kept)
+        total_hits, total_score = focus_hits.sum(), scores.sum()
+        return selected, {
+            'original_tokens': original_tokens,
+            'selected_tokens': estimate_tokens(selected),
+            'segments': len(segments),
+            'kept_segments': len(kept),
+            'focus_recall': float(focus_hits[kept_indices].sum() / total_hits) if total_hits else 1.0,
+            'salience_kept': float(scores[kept_indices].sum() / total_score) if total_score else 1.0
+        }
+
+
+def select_salient(body: str, content_focus: str) -> Tuple[str, Dict]:
+    """Select the salient part of transcript text with the budget from the environment"""
+    return SalienceSelector(content_focus).select(body)
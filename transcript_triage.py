@@ -0,0 +1,66 @@
+import re
+from typing import Dict
+from phrase_matcher import tokenize
+
+# Words in a content focus that say nothing about the subject
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'for', 'of', 'to', 'in', 'on', 'with', 'about', 'from', 'by',
+    'best', 'practices', 'leaders', 'leader', 'business', 'content', 'focused', 'audience',
+    'how', 'what', 'why', 'who', 'their', 'your', 'our', 'is', 'are'
+}
+
+# Compare words on a short prefix so "strategy"/"strategic", "innovate"/"innovation" match
+STEM_LENGTH = 5
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?\s*(?:%|percent|x\b|k\b|m\b|million|billion)?", re.IGNORECASE)
+_SPEAKER = re.compile(r"^\s*([A-Z][\w.'\-]*(?:\s+[A-Z][\w.'\-]*){0,3}):\s", re.MULTILINE)
+
+
+def _stem(word: str) -> str:
+    return word[:STEM_LENGTH]
+
+
+class TriageScorer:
+    """
+    Cheap local relevance/richness score for routing transcripts between models.
+
+    relevance: how often the transcript uses words from the content focus
+    richness: length, number of speakers, concrete figures and vocabulary
+    range - a proxy for how much article material a meeting holds
+
+    Both are 0..1; score = 0.6 * relevance + 0.4 * richness.
+    """
+
+    def __init__(self, content_focus: str):
+        words = [w for w in tokenize(content_focus) if w not in STOPWORDS and len(w) > 1]
+        self.focus_stems = {_stem(w) for w in words}
+
+    def score(self, transcript: Dict) -> Dict[str, float]:
+        body = transcript.get('body', '')
+        words = tokenize(body)
+        word_count = len(words)
+        if not word_count:
+            return {'relevance': 0.0, 'richness': 0.0, 'score': 0.0, 'words': 0}
+
+        per_thousand = 1000 / word_count
+
+        # Focus terms per 1,000 words; 8+ counts as fully on-topic
+        if self.focus_stems:
+            hits = sum(1 for w in words if _stem(w) in self.focus_stems)
+            hits += sum(1 for w in tokenize(transcript.get('subject', '')) if _stem(w) in self.focus_stems) * 5
+            relevance = min(1.0, hits * per_thousand / 8)
+        else:
+            relevance = 1.0
+
+        length = min(1.0, word_count / 3000)
+        speakers = min(1.0, (len(set(_SPEAKER.findall(body))) - 1) / 3) if _SPEAKER.search(body) else 0.5
+        figures = min(1.0, len(_NUMBER.findall(body)) * per_thousand / 5)
+        diversity = min(1.0, len(set(words)) / word_count / 0.4)
+        richness = 0.4 * length + 0.2 * max(0.0, speakers) + 0.2 * figures + 0.2 * diversity
+
+        return {
+            'relevance': round(relevance, 3),
+            'richness': round(richness, 3),
+            'score': round(0.6 * relevance + 0.4 * richness, 3),
+            'words': word_count
+        }